@@ -5,16 +5,21 @@ Triggers a random domain-specific crisis question mid-interview.
 import logging
 import asyncio
 import random
-import json
+import time
 from typing import Optional, Any
 from livekit.rtc import Room
 from livekit.agents import llm
 
 from app.agents.crisis_generator import generate_crisis_question
+from app.core.data_channel import get_publisher
+from app.core.text_analysis import extract_code_blocks
+from app.core.telemetry import track_llm_call
 from app.logging.audit_logger import SessionAuditLogger
 
 logger = logging.getLogger("aegis.agents.crisis_popup")
 
+CRISIS_ANSWER_WINDOW = 120  # Seconds of candidate turns treated as crisis answers
+
 
 class CrisisPopupAgent:
     """
@@ -48,6 +53,7 @@ class CrisisPopupAgent:
         
         self._task: Optional[asyncio.Task] = None
         self._triggered = False
+        self._last_crisis_at: Optional[float] = None
         self._candidate_name: Optional[str] = None
         
     def set_candidate_name(self, name: str):
@@ -58,6 +64,10 @@ class CrisisPopupAgent:
         """Set the lead agent reference for question injection."""
         self._lead_agent = agent
         
+    def in_crisis(self, window_seconds: float = CRISIS_ANSWER_WINDOW) -> bool:
+        """True while the candidate is answering a crisis (first minutes after it fired)."""
+        return self._last_crisis_at is not None and time.monotonic() - self._last_crisis_at < window_seconds
+        
     async def start(self):
         """Start the crisis timer in the background."""
         if self._task is not None:
@@ -110,13 +120,15 @@ class CrisisPopupAgent:
     async def _trigger_crisis(self):
         """Generate and deliver the crisis question."""
         logger.info(">>> CRISIS POPUP TRIGGERING!")
+        self._last_crisis_at = time.monotonic()
         
         # 1. Generate crisis question using Groq
-        crisis_question = await generate_crisis_question(
-            self._domain,
-            self._llm,
-            self._candidate_name
-        )
+        with track_llm_call("crisis", self._audit_logger.session_id):
+            crisis_question = await generate_crisis_question(
+                self._domain,
+                self._llm,
+                self._candidate_name
+            )
         
         # 2. Log to audit trail
         self._audit_logger.log_event(
@@ -141,28 +153,24 @@ class CrisisPopupAgent:
             return
             
         try:
-            payload = json.dumps({
+            publisher = get_publisher(self._room)
+            publisher.publish({
                 "type": "CRISIS_POPUP",
                 "title": "⚠️ INCOMING CRISIS",
                 "message": question[:100] + "..." if len(question) > 100 else question
-            }).encode("utf-8")
-            
-            await self._room.local_participant.publish_data(payload, reliable=True)
+            })
             logger.info(">>> Sent CRISIS_POPUP signal to frontend")
             
             # [NEW] Also push Code to IDE if present
             if "```" in question:
                 try:
-                    import re
-                    # [FIX] Robust regex (allow spaces/newlines)
-                    code_match = re.search(r"```(?:\w+)?\s*(.*?)```", question, re.DOTALL)
-                    if code_match:
-                         code_content = code_match.group(1).strip()
-                         code_payload = json.dumps({
+                    code_blocks = extract_code_blocks(question)
+                    if code_blocks:
+                         code_content = code_blocks[0]
+                         publisher.publish({
                              "type": "CODE_SNAPSHOT",
                              "code": code_content
-                         }).encode("utf-8")
-                         await self._room.local_participant.publish_data(code_payload, reliable=True)
+                         })
                          logger.info(f">>> Sent CODE_SNAPSHOT to IDE ({len(code_content)} chars)")
                          
                          # [NEW] Also update the UserState in the backend ensuring the agent knows the user is looking at this code
@@ -216,14 +224,9 @@ class CrisisPopupAgent:
                 logger.error(f">>> Failed to inject into lead agent: {e}")
                 
         # Method 2: Broadcast as a transcript so agent picks it up
-        try:
-            payload = json.dumps({
+        if self._room and self._room.local_participant:
+            get_publisher(self._room).publish({
                 "type": "TRANSCRIPT",
                 "sender": "SYSTEM",
                 "text": f"[CRISIS ALERT] {question}"
-            }).encode("utf-8")
-            
-            await self._room.local_participant.publish_data(payload, reliable=True)
-            
-        except Exception as e:
-            logger.error(f">>> Failed to broadcast crisis: {e}")
+            })
@@ -1,38 +1,185 @@
+import json
 import logging
-from typing import List
-from app.agents.base import AegisAgentBase
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from app.core.text_analysis import WORD_RE
 
 logger = logging.getLogger("aegis.agents.governor")
 
+DEFAULT_HIGH_RISK_KEYWORDS = ["suicide", "bomb", "kill", "illegal"]
+
+# Regular inflections folded back onto lexicon terms ("bombs", "killing", "killed", "illegally")
+INFLECTION_SUFFIXES = ("ings", "ing", "ers", "er", "es", "ed", "s", "d", "ly")
+
+
+def word_stems(token: str) -> set:
+    """The token plus every base it could be an inflection of ("stabbed" -> stabb, stab, stabbe)."""
+    stems = {token}
+    for suffix in INFLECTION_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+            base = token[:-len(suffix)]
+            stems.add(base)
+            stems.add(base + "e")  # "suicides" -> suicide
+            if len(base) > 2 and base[-1] == base[-2]:
+                stems.add(base[:-1])  # Doubled consonant: "stabbing" -> stab
+    return stems
+
+
+class KeywordScanner:
+    """
+    Multi-pattern keyword matcher over word tokens.
+
+    Terms (single words or phrases) are compiled into a token trie, so a scan
+    is one pass over the transcript's words with at most `max_depth` trie
+    steps per word: O(transcript length), independent of lexicon size.
+    Words match a term word exactly or as a regular inflection of it
+    ("bombs", "killing", "killed" trigger "bomb" / "kill"), never as a
+    substring, so "skill" does not trigger "kill".
+    """
+
+    _END = "\0"  # Not a word token, so it can't collide with a term
+
+    def __init__(self, terms: Iterable[str] = (), categories: Optional[Dict[str, str]] = None):
+        self._trie: Dict[str, Any] = {}
+        self.max_depth = 0
+        self.size = 0
+        self._categories = categories or {}
+        for term in terms:
+            self.add(term)
+
+    def add(self, term: str, category: Optional[str] = None):
+        tokens = WORD_RE.findall(term.lower())
+        if not tokens:
+            return
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[self._END] = " ".join(tokens)
+        if category:
+            self._categories[node[self._END]] = category
+        self.max_depth = max(self.max_depth, len(tokens))
+        self.size += 1
+
+    def scan(self, text: str) -> List[Tuple[str, str]]:
+        """All (term, category) matches in the text, in order of appearance."""
+        stems = [word_stems(token) for token in WORD_RE.findall(text.lower())]
+        matches = []
+        for i in range(len(stems)):
+            nodes = [self._trie]
+            for candidates in stems[i:i + self.max_depth]:
+                nodes = [node[stem] for node in nodes for stem in candidates if stem in node]
+                if not nodes:
+                    break
+                for node in nodes:
+                    term = node.get(self._END)
+                    if term:
+                        matches.append((term, self._categories.get(term, "high_risk")))
+        return matches
+
+    def first_match(self, text: str) -> Optional[Tuple[str, str]]:
+        matches = self.scan(text)
+        return matches[0] if matches else None
+
+
+def load_lexicon(path: str) -> Dict[str, List[str]]:
+    """
+    Load a keyword lexicon: JSON {"category": ["term", ...]} or plain text
+    (one term per line, '#' comments, category "high_risk").
+    """
+    with open(path) as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        terms = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    return {"high_risk": terms}
+
+
+def confidence_from_evaluation(evaluation: Any) -> Optional[float]:
+    """
+    Observer confidence in [0, 1] for one evaluation (ObserverEvaluation or dict).
+
+    Only the explicit "confidence" field counts. The score grades the
+    candidate, not the observer, so a weak candidate must never look like
+    a low-confidence observer. None if the field is missing.
+    """
+    if not isinstance(evaluation, dict):
+        evaluation = evaluation.to_dict()
+    try:
+        if evaluation.get("confidence") is None:
+            return None
+        return max(0.0, min(1.0, float(evaluation["confidence"])))
+    except (TypeError, ValueError):
+        return None
+
+
 class GovernorAgent:
     """
     The Safety Valve.
     Monitors the conversation state and decides if a human takeover is needed.
     """
-    def __init__(self, high_risk_keywords: List[str] = None):
-        self.high_risk_keywords = high_risk_keywords or ["suicide", "bomb", "kill", "illegal"]
+    def __init__(
+        self,
+        high_risk_keywords: List[str] = None,
+        lexicon_path: Optional[str] = None,
+        on_intervention: Optional[Callable[[str], None]] = None
+    ):
+        self.high_risk_keywords = high_risk_keywords or list(DEFAULT_HIGH_RISK_KEYWORDS)
         self.consecutive_failures = 0
         self.low_confidence_threshold = 0.4
+        self.max_low_confidence_streak = 3
+        self.on_intervention = on_intervention  # Called when the async confidence path trips
+
+        self.scanner = KeywordScanner(self.high_risk_keywords)
+        lexicon_path = lexicon_path or os.getenv("AEGIS_GOVERNOR_LEXICON")
+        if lexicon_path:
+            try:
+                for category, terms in load_lexicon(lexicon_path).items():
+                    for term in terms:
+                        self.scanner.add(term, category)
+                logger.info(f"Governor lexicon loaded: {self.scanner.size} terms from {lexicon_path}")
+            except Exception as e:
+                logger.error(f"Failed to load governor lexicon {lexicon_path}: {e}")
 
-    def check_safety(self, transcript_chunk: str, observer_confidence: float) -> bool:
+    def check_safety(self, transcript_chunk: str, observer_confidence: Optional[float] = None) -> bool:
         """
         Returns True if safe, False if handoff required.
+        Without observer_confidence this is a keyword check of this transcript
+        only: the low-confidence streak is reported once, via
+        observe_evaluation() / on_intervention, not on every later turn.
         """
         # 1. Keyword Check
-        for word in self.high_risk_keywords:
-            if word in transcript_chunk.lower():
-                logger.critical(f"Governor Trigger: High risk keyword '{word}' detected.")
-                return False
+        hit = self.scanner.first_match(transcript_chunk)
+        if hit:
+            logger.critical(f"Governor Trigger: High risk keyword '{hit[0]}' ({hit[1]}) detected.")
+            return False
 
         # 2. Confidence Check
+        if observer_confidence is not None:
+            return self.record_confidence(observer_confidence)
+        return True
+
+    def record_confidence(self, observer_confidence: float) -> bool:
+        """Update the low-confidence streak. Returns False once the streak trips."""
         if observer_confidence < self.low_confidence_threshold:
             self.consecutive_failures += 1
             logger.warning(f"Governor Warning: Low confidence ({observer_confidence}). Streak: {self.consecutive_failures}")
         else:
             self.consecutive_failures = 0
-            
-        if self.consecutive_failures >= 3:
+
+        if self.consecutive_failures >= self.max_low_confidence_streak:
             logger.critical("Governor Trigger: Too many low confidence turns.")
             return False
-            
+
         return True
+
+    def observe_evaluation(self, evaluation: Any) -> bool:
+        """
+        Async path: fed by ObserverAgent as each evaluation completes.
+        Fires on_intervention once when the low-confidence streak is reached.
+        """
+        confidence = confidence_from_evaluation(evaluation)
+        if confidence is None:
+            return True
+        safe = self.record_confidence(confidence)
+        if not safe and self.consecutive_failures == self.max_low_confidence_streak and self.on_intervention:
+            self.on_intervention(f"{self.consecutive_failures} consecutive low-confidence evaluations (last {confidence:.2f})")
+        return safe
@@ -3,6 +3,7 @@ import random
 import json
 import asyncio
 import dataclasses
+from collections import deque
 from livekit.agents import llm
 from livekit.agents.voice import Agent
 from app.rag.scenarios import Scenario
@@ -16,10 +17,20 @@ from app.agents.prompts import (
 # Import Knowledge Engine from friend's backend
 from backend.funnel.pipeline import knowledge_engine
 from app.agents.tools import ToggleNotepad
-from app.agents.question_generator import generate_dynamic_questions, format_questions_for_prompt  # [NEW]
+from app.core.data_channel import get_publisher
+from app.core.text_analysis import StreamingFenceDetector
+from app.logging.event_log import get_event_logger
+from app.agents.question_generator import (  # [NEW]
+    generate_dynamic_questions,
+    format_questions_for_prompt,
+    compute_audit_hash,
+    load_cached_questions,
+    save_cached_questions
+)
 from app.agents.rubrics.faang_swe import FAANG_INTERVIEWER_GUIDE
 
 logger = logging.getLogger("aegis.agents.incident_lead")
+interview_log = get_event_logger("interview")
 
 from app.logging.audit_logger import SessionAuditLogger
 
@@ -37,6 +48,12 @@ class IncidentLead(Agent, AegisAgentBase):
         self.initial_problem = scenario.initial_problem
         self.room = room  # [FIX] Save room reference for later use
         
+        # Code blocks pushed to the IDE straight from the LLM token stream
+        self._fence_detector = StreamingFenceDetector()
+        self._streamed_codes = deque(maxlen=8)
+        self._llm_turn = 0
+        self._code_seq = {}  # stream_id -> next delta sequence number (open fences only)
+        
         # Init Tools
         self.notepad_tool = None
         if room:
@@ -128,7 +145,14 @@ class IncidentLead(Agent, AegisAgentBase):
             # IMPORTANT: Never block the event loop - always schedule async
             self.dynamic_questions = []
             self._pending_question_gen = None
-            if knowledge_engine.candidate_context:
+            
+            # [PERF] Questions are normally precomputed at upload time - use them if still valid
+            audit_path = getattr(knowledge_engine, 'audit_path', None)
+            cached_questions = load_cached_questions(audit_path) if audit_path else None
+            if cached_questions:
+                self.dynamic_questions = cached_questions
+                logger.info(">>> Using precomputed dynamic questions (cache hit).")
+            elif knowledge_engine.candidate_context:
                 try:
                     # Always schedule for later - never block
                     import asyncio
@@ -136,7 +160,7 @@ class IncidentLead(Agent, AegisAgentBase):
                         loop = asyncio.get_running_loop()
                         # Loop is running, schedule as task (won't block)
                         self._pending_question_gen = asyncio.create_task(
-                            generate_dynamic_questions(knowledge_engine.candidate_context, self.qgen_llm) # [FIX] Use QGen LLM
+                            self._generate_and_cache_questions(audit_path)
                         )
                         logger.info(">>> Dynamic question generation scheduled (async).")
                     except RuntimeError:
@@ -148,20 +172,15 @@ class IncidentLead(Agent, AegisAgentBase):
             logger.error(f"Failed to load Knowledge Engine: {e}")
             self.context = scenario.context
             self.dynamic_questions = [] 
+            self._pending_question_gen = None
+            cand_name = "Candidate"
             cand_role = "Backend Engineer"
         
-        sys_prompt = self._build_system_prompt(
-            INCIDENT_LEAD_SYSTEM, 
-            initial_problem=self.initial_problem,
-            candidate_name=cand_name,
-            job_role=cand_role # [NEW] Inject Job Role
-        )
+        # Kept so the prompt can be rebuilt when dynamic questions arrive later
+        self.candidate_name = cand_name
+        self.job_role = cand_role
         
-        # [NEW] Append dynamic questions to system prompt if available
-        if hasattr(self, 'dynamic_questions') and self.dynamic_questions:
-            questions_section = format_questions_for_prompt(self.dynamic_questions)
-            sys_prompt = sys_prompt + "\n" + questions_section
-            logger.info(">>> Injected dynamic questions into system prompt.")
+        sys_prompt = self._compose_system_prompt()
         
         # Create a chat context for the Agent (using local variable to avoid property conflict)
         _chat_ctx = llm.ChatContext()
@@ -180,45 +199,146 @@ class IncidentLead(Agent, AegisAgentBase):
             tools=agent_tools  # <--- Changed from fnc_ctx
         )
         
+    def _compose_system_prompt(self) -> str:
+        """Build the full system prompt, including dynamic questions if available."""
+        sys_prompt = self._build_system_prompt(
+            INCIDENT_LEAD_SYSTEM, 
+            initial_problem=self.initial_problem,
+            candidate_name=self.candidate_name,
+            job_role=self.job_role # [NEW] Inject Job Role
+        )
+        
+        # [NEW] Append dynamic questions to system prompt if available
+        if self.dynamic_questions:
+            questions_section = format_questions_for_prompt(self.dynamic_questions)
+            sys_prompt = sys_prompt + "\n" + questions_section
+            logger.info(">>> Injected dynamic questions into system prompt.")
+        return sys_prompt
+
+    async def _generate_and_cache_questions(self, audit_path: str = None):
+        """Cache-miss path: generate questions in the worker and persist them for next time."""
+        audit_hash = compute_audit_hash(audit_path) if audit_path else None  # Before generating (see save_cached_questions)
+        questions = await generate_dynamic_questions(knowledge_engine.candidate_context, self.qgen_llm) # [FIX] Use QGen LLM
+        if audit_path:
+            try:
+                save_cached_questions(audit_path, questions, audit_hash)
+            except OSError as e:
+                logger.error(f">>> Failed to save question cache: {e}")
+        return questions
+
     async def await_dynamic_questions(self):
         """
-        [IMPROVEMENT] Block until dynamic questions are generated.
-        This ensures the Agent actually knows the custom questions before starting.
+        Wait for dynamic question generation and hot-swap the system prompt.
+        
+        Safe to run in the background after session.start(): the templated
+        opening line does not depend on the questions, so the interview can
+        start speaking while generation is still in flight.
         """
-        if self._pending_question_gen:
-            logger.info(">>> Waiting for dynamic questions to finish generation...")
-            try:
-                # Wait for the background task
-                questions = await self._pending_question_gen
-                
-                # If we got questions, update the system prompt!
-                if questions:
-                    self.dynamic_questions = questions
-                    
-                    # Re-build System Prompt with new questions
-                    sys_prompt = self._build_system_prompt(
-                        INCIDENT_LEAD_SYSTEM, 
-                        initial_problem=self.initial_problem,
-                        candidate_name="Candidate", # Re-fetch name if possible/needed or store in self
-                        job_role="Backend Engineer" # Re-fetch role
-                    )
-                    
-                    # Format and append
-                    questions_section = format_questions_for_prompt(self.dynamic_questions)
-                    final_prompt = sys_prompt + "\n" + questions_section
-                    
-                    # Update Chat Context Prompt (The tricky part)
-                    # We need to replace the first message (System)
-                    # LiveKit Agents ChatContext is a list of ChatMessage
-                    if self.chat_ctx.messages and self.chat_ctx.messages[0].role == "system":
-                         self.chat_ctx.messages[0].content = final_prompt
-                         logger.info(">>> System Prompt UPDATED with Dynamic Questions.")
-                    else:
-                         self.chat_ctx.messages.insert(0, llm.ChatMessage(role="system", content=final_prompt))
-                
-            except Exception as e:
-                logger.error(f">>> Failed to await dynamic questions: {e}")
+        if not self._pending_question_gen:
+            return
+        
+        logger.info(">>> Waiting for dynamic questions to finish generation...")
+        try:
+            questions = await self._pending_question_gen
+        except Exception as e:
+            logger.error(f">>> Failed to await dynamic questions: {e}")
+            return
+        finally:
+            self._pending_question_gen = None
+        
+        if not questions:
+            return
+        
+        self.dynamic_questions = questions
+        final_prompt = self._compose_system_prompt()
+        
+        try:
+            # Replace the system message on a copy (chat_ctx is read-only once the session runs)
+            new_ctx = self.chat_ctx.copy()
+            system_msg = next(
+                (item for item in new_ctx.items if getattr(item, "role", None) == "system"),
+                None
+            )
+            if system_msg is not None:
+                system_msg.content = [final_prompt]
+            else:
+                new_ctx.items.insert(0, llm.ChatMessage(role="system", content=[final_prompt]))
+            
+            await self.update_chat_ctx(new_ctx)
+            await self.update_instructions(final_prompt)
+            logger.info(">>> System Prompt UPDATED with Dynamic Questions.")
+        except Exception as e:
+            logger.error(f">>> Failed to hot-swap system prompt: {e}")
         
+    async def llm_node(self, chat_ctx, tools, model_settings):
+        """
+        Tap the LLM token stream so code reaches the IDE while it is generated:
+        CODE_SNAPSHOT_DELTA patches as the fence fills, then one final
+        CODE_SNAPSHOT when the closing fence arrives.
+        """
+        detector = self._fence_detector
+        detector.reset()
+        self._llm_turn += 1
+        self._code_seq.clear()
+        
+        async for chunk in Agent.default.llm_node(self, chat_ctx, tools, model_settings):
+            if isinstance(chunk, str):
+                text = chunk
+            else:
+                delta = getattr(chunk, "delta", None)
+                text = getattr(delta, "content", None) if delta else None
+            
+            if text:
+                completed = detector.feed(text)
+                # Fence indexes of the blocks closed by this chunk
+                last_closed = detector.fence_index - (1 if detector.in_fence else 0)
+                for offset, code in enumerate(completed):
+                    fence = last_closed - len(completed) + 1 + offset
+                    self._push_code_snapshot(code, stream_id=self._code_stream_id(fence))
+                
+                code_delta = detector.take_delta()
+                if code_delta:
+                    self._push_code_delta(code_delta, self._code_stream_id(detector.fence_index))
+            yield chunk
+
+    def _code_stream_id(self, fence_index: int) -> str:
+        return f"{self._llm_turn}.{fence_index}"
+
+    def _push_code_delta(self, code_delta: str, stream_id: str):
+        if not (self.room and self.room.local_participant):
+            return
+        seq = self._code_seq.get(stream_id, 0)
+        self._code_seq[stream_id] = seq + 1
+        get_publisher(self.room).publish({
+            "type": "CODE_SNAPSHOT_DELTA",
+            "stream_id": stream_id,
+            "seq": seq,
+            "delta": code_delta
+        })
+
+    def _push_code_snapshot(self, code: str, stream_id: str = None):
+        if not code or not (self.room and self.room.local_participant):
+            return
+        self._streamed_codes.append(code)
+        message = {
+            "type": "CODE_SNAPSHOT",
+            "code": code
+        }
+        if stream_id is not None:
+            # Final state of a streamed block; frontend drops any late deltas for it
+            message["stream_id"] = stream_id
+            message["final"] = True
+            self._code_seq.pop(stream_id, None)
+        get_publisher(self.room).publish(message)
+        logger.info(f">>> [STREAM] Pushed CODE_SNAPSHOT to IDE ({len(code)} chars)")
+
+    def consume_streamed_code(self, code: str) -> bool:
+        """True (once) if this code block was already pushed from the token stream."""
+        if code and code in self._streamed_codes:
+            self._streamed_codes.remove(code)
+            return True
+        return False
+
     async def start_interview(self, session):
         """
         Say the opening line.
@@ -227,7 +347,7 @@ class IncidentLead(Agent, AegisAgentBase):
         cand_field = "Engineering" # Default
         
         if knowledge_engine.candidate_context:
-             logger.info(f">>> [DEBUG] Context in start_interview: {knowledge_engine.candidate_context}")
+             interview_log.debug("start_interview", context=knowledge_engine.candidate_context)
              cand_name = knowledge_engine.candidate_context.get('name', '')
              # Try to get field from context or audit data
              cand_field = knowledge_engine.candidate_context.get('detected_field', 'Engineering')
@@ -249,12 +369,11 @@ class IncidentLead(Agent, AegisAgentBase):
              
              # Manual Broadcast for initial greeting (since session.say might bypass chat_ctx events)
              if self.room and self.room.local_participant:
-                 payload = json.dumps({
+                 get_publisher(self.room).publish({
                      "type": "TRANSCRIPT", 
                      "sender": "AGENT", 
                      "text": opening_line
-                 }).encode("utf-8")
-                 asyncio.create_task(self.room.local_participant.publish_data(payload, reliable=True))
+                 })
                  
         else:
              logger.warning("Could not find 'say' method on session.")
@@ -277,19 +396,12 @@ class IncidentLead(Agent, AegisAgentBase):
         
         # 3. ALERT FRONTEND (Visual Animation)
         if self.notepad_tool and self.notepad_tool._room and self.notepad_tool._room.local_participant:
-             import json
-             payload = json.dumps({
+             # publish() is sync, so this works even though trigger_crisis is not a coroutine
+             get_publisher(self.notepad_tool._room).publish({
                  "type": "CRISIS_ALERT", 
                  "message": f"CRISIS: {crisis_key.upper()}"
-             }).encode("utf-8")
-             
-             # We need to dispatch this async, but this method might be sync. 
-             # Use asyncio.create_task if loop running
-             try:
-                 asyncio.create_task(self.notepad_tool._room.local_participant.publish_data(payload, reliable=True))
-                 logger.info(">>> [FRONTEND] Sent CRISIS_ALERT signal.")
-             except Exception as e:
-                 logger.error(f"Failed to send crisis alert: {e}")
+             })
+             logger.info(">>> [FRONTEND] Sent CRISIS_ALERT signal.")
                  
         self.audit_logger.log_event("IncidentLead", "CRISIS_TRIGGER", f"Injected: {scenario_txt}")
         # End of trigger_crisis
@@ -5,6 +5,8 @@ from livekit.agents import llm
 from livekit.rtc import Room
 from app.rag.scenarios import Persona
 from app.agents.base import AegisAgentBase
+from app.core.data_channel import get_publisher
+from app.core.telemetry import track_llm_call
 from app.agents.prompts import (
     MOLE_SYSTEM,
     MOLE_BAIT_MESSAGES
@@ -49,21 +51,19 @@ class MoleAgent(AegisAgentBase):
                 
                 # 2. Generate Dynamic Tip
                 from backend.funnel.pipeline import knowledge_engine
-                tip = await knowledge_engine.generate_mole_tip(snippet)
+                with track_llm_call("mole", self.audit_logger.session_id):
+                    tip = await knowledge_engine.generate_mole_tip(snippet)
                 
                 logger.info(f">>> [MOLE] Generated Tip: {tip}")
                 self.audit_logger.log_event("MoleAgent", "TIP_GENERATED", tip)
                 
                 # 3. Send Popup to Frontend
-                import json
-                payload = json.dumps({
-                    "type": "MOLE_POPUP",
-                    "text": tip,
-                    "variant": "warning" if "Psst" in tip else "info"
-                }).encode("utf-8")
-                
                 if self.room and self.room.local_participant:
-                    await self.room.local_participant.publish_data(payload, reliable=True)
+                    get_publisher(self.room).publish({
+                        "type": "MOLE_POPUP",
+                        "text": tip,
+                        "variant": "warning" if "Psst" in tip else "info"
+                    })
                     logger.info(">>> [MOLE] Sent popup to frontend.")
                     
             except Exception as e:
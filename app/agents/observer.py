@@ -1,17 +1,23 @@
 import logging
 import json
-import asyncio
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any
 from livekit.agents import llm
 from app.agents.base import AegisAgentBase
 from app.agents.prompts import OBSERVER_SYSTEM
 from app.agents.rubrics.faang_swe import FAANG_OBSERVER_SYSTEM
 
-logger = logging.getLogger("aegis.agents.observer")
-
 from app.logging.audit_logger import SessionAuditLogger
 from app.analysis.dqi_calculator import dqi_calculator
+from app.analysis.evaluations import ObserverEvaluation
 from app.analysis.schemas import DQI
+from app.core.telemetry import track_llm_call
+from app.core.turn_batcher import PRIORITY_NORMAL, TurnBatcher, build_batch_prompt, parse_batch_response
+from app.logging.event_log import get_event_logger
+
+logger = logging.getLogger("aegis.agents.observer")
+observer_log = get_event_logger("observer")
+
+JSON_MODE = {"response_format": {"type": "json_object"}}
 
 class ObserverAgent(AegisAgentBase):
     """
@@ -29,99 +35,117 @@ class ObserverAgent(AegisAgentBase):
         
         self.metrics = metrics
         self.transcript_log: List[Dict[str, Any]] = []
-        self.evaluations: List[str] = [] # Store raw JSON strings from LLM
+        self.evaluations: List[ObserverEvaluation] = [] # Parsed once, consumed by DQI + report
         # [FAANG UPGRADE] Use FAANG Rubric instead of standard prompt
         self.system_prompt = self._build_system_prompt(FAANG_OBSERVER_SYSTEM)
-        self.pending_tasks = set() # [FIX] Track active evaluations
+        # [NEW] Micro-batched evaluation: one LLM call per window of candidate turns
+        self.batcher = TurnBatcher(self._evaluate_batch)
+        self.evaluation_listeners: List[Callable[[ObserverEvaluation], Any]] = []  # e.g. Governor confidence feed
 
 
-    def log_turn(self, speaker: str, text: str):
-        """Called whenever a turn is completed."""
-        print(f"DEBUG: Observer logging turn - Speaker: {speaker}, Text: {text}") # <--- Added Debug
+    def log_turn(self, speaker: str, text: str, priority: int = PRIORITY_NORMAL):
+        """Called whenever a turn is completed. Crisis answers / code use a higher priority."""
+        observer_log.debug("turn_logged", speaker=speaker, text=text)
         entry = {"speaker": speaker, "text": text}
         self.transcript_log.append(entry)
         
-        # Async evaluation
-        # Async evaluation [FIX] Track the task
-        task = asyncio.create_task(self._evaluate_turn(text))
-        self.pending_tasks.add(task)
-        task.add_done_callback(self.pending_tasks.discard)
-        
-    async def _evaluate_turn(self, turn_text: str):
+        # [NEW] Buffered into a window; candidate turns are graded in one call per window
+        self.batcher.add(speaker, text, priority=priority)
+
+    @property
+    def pending_tasks(self):
+        """Queued / in-flight batch evaluations."""
+        return self.batcher.pending_tasks
+
+    async def _complete(self, chat_ctx: llm.ChatContext) -> str:
+        full_response = ""
+        try:
+            # [NEW] JSON mode: the provider guarantees a single JSON object
+            stream = self.model.chat(chat_ctx=chat_ctx, extra_kwargs=JSON_MODE)
+        except TypeError:
+            stream = self.model.chat(chat_ctx=chat_ctx)
+        async for chunk in stream:
+            content = None
+            # Try standard LiveKit agent structure
+            if hasattr(chunk, 'choices') and chunk.choices:
+                content = chunk.choices[0].delta.content
+            # Fallback for alternative chunk structures
+            elif hasattr(chunk, 'content'):
+                content = chunk.content
+            
+            if content:
+                full_response += content
+        return full_response
+
+    async def _evaluate_batch(self, window: List[Dict[str, Any]], context: List[Dict[str, Any]]):
         """
-        Runs a quick LLM pass to grade the turn.
+        Runs one LLM pass over a window and records one evaluation per candidate turn.
         """
-        with open("debug.log", "a") as f:
-            f.write(f"\n--- EVALUATING: {turn_text} ---\n")
+        graded = [e for e in window if e["graded"]]
+        observer_log.debug("evaluating", turns=len(graded), context=len(context))
 
         chat_ctx = llm.ChatContext()
         chat_ctx.add_message(role="system", content=self.system_prompt)
-        chat_ctx.add_message(role="user", content=f"Evaluate this turn: '{turn_text}'")
+        chat_ctx.add_message(role="user", content=build_batch_prompt(window, context))
         
         try:
-             # Streaming call to LLM
-             stream = self.model.chat(chat_ctx=chat_ctx)
-             full_response = ""
-             async for chunk in stream:
-                 content = None
-                 # Try standard LiveKit agent structure
-                 if hasattr(chunk, 'choices') and chunk.choices:
-                     content = chunk.choices[0].delta.content
-                 # Fallback for alternative chunk structures
-                 elif hasattr(chunk, 'content'):
-                     content = chunk.content
-                 
-                 if content:
-                     full_response += content
-             
-             # Post-process the JSON
-             clean_content = full_response.strip()
-             
-             # [FIX] Robust JSON Extraction
-             # Find the first '{' and the last '}'
-             start_idx = clean_content.find("{")
-             end_idx = clean_content.rfind("}")
-             
-             if start_idx != -1 and end_idx != -1:
-                 json_str = clean_content[start_idx : end_idx + 1]
-                 
-                 try:
-                     # Validate it parses
-                     json.loads(json_str)
-                     
-                     self.evaluations.append(json_str)
-                     logger.info(f"Observer Evaluated: {json_str[:50]}...")
-                     
-                     # Log to Audit Trail
-                     eval_data = json.loads(json_str)
-                     self.audit_logger.log_event("ObserverAgent", "EVALUATION_COMPLETE", "Turn evaluated", metadata=eval_data)
-                     
-                 except json.JSONDecodeError as e:
-                     logger.warning(f"Observer JSON Parse Failed: {e} | Content: {json_str}")
-                     self.audit_logger.log_event("ObserverAgent", "EVALUATION_FAILED", "JSON Parse Error", metadata={"error": str(e), "content": json_str})
-             else:
-                 logger.warning(f"Observer generated NO valid JSON object: {clean_content}")
-                 self.audit_logger.log_event("ObserverAgent", "EVALUATION_FAILED", "No JSON Found", metadata={"output": clean_content})
-
+            with track_llm_call("observer", self.audit_logger.session_id):
+                full_response = await self._complete(chat_ctx)
         except Exception as e:
             logger.error(f"Observer evaluation COMPLETED WITH ERROR: {e}")
             self.audit_logger.log_event("ObserverAgent", "EVALUATION_ERROR", f"LLM Failure: {str(e)}")
-            print(f"DEBUG: Observer Exception: {e}") # <--- Added Debug
+            return
+
+        try:
+            results = parse_batch_response(full_response, len(graded))
+        except json.JSONDecodeError as e:
+            logger.warning(f"Observer JSON Parse Failed: {e} | Content: {full_response[:200]}")
+            self.audit_logger.log_event("ObserverAgent", "EVALUATION_FAILED", "JSON Parse Error", metadata={"error": str(e), "content": full_response})
+            return
+
+        for entry, eval_data in zip(graded, results):
+            if eval_data is None:
+                logger.warning(f"Observer batch skipped a turn: {entry['text'][:50]}...")
+                self.audit_logger.log_event("ObserverAgent", "EVALUATION_FAILED", "Turn missing from batch", metadata={"output": full_response})
+                continue
+
+            record = ObserverEvaluation.parse(eval_data)
+            if record is None:
+                self.audit_logger.log_event("ObserverAgent", "EVALUATION_FAILED", "Invalid evaluation", metadata={"content": eval_data})
+                continue
+            logger.info(f"Observer Evaluated: {record}")
+            
+            # Log to Audit Trail
+            event = self.audit_logger.log_event("ObserverAgent", "EVALUATION_COMPLETE", "Turn evaluated", metadata=record.to_dict())
+            record.timestamp = event.timestamp
+            self.evaluations.append(record)
+            
+            for listener in self.evaluation_listeners:
+                try:
+                    listener(record)
+                except Exception as e:
+                    logger.error(f"Evaluation listener failed: {e}")
             
     
     def generate_dqi_report(self) -> Dict[str, Any]:
         """
         Calculate final DQI (Decision Quality Index) score using robust calculator.
         """
-        # We use the stored self.evaluations which contains the raw JSON strings from the LLM
+        # Typed records, parsed once when each evaluation arrived
         return dqi_calculator.calculate_score("current_session", self.evaluations).model_dump()
 
-    async def await_pending_evaluations(self):
-        """[FIX] Wait for all pending LLM calls to finish before reporting."""
-        if not self.pending_tasks:
-            return
-        logger.info(f">>> Waiting for {len(self.pending_tasks)} pending Observer evaluations...")
+    async def await_pending_evaluations(self, deadline: float = 10.0) -> Dict[str, Any]:
+        """[FIX] Flush and evaluate the remaining turns before reporting (bounded by deadline)."""
+        logger.info(f">>> Flushing observer window, {self.batcher.pending} batch evaluations pending...")
         try:
-            await asyncio.wait(self.pending_tasks, timeout=10) # 10s max wait
+            result = await self.batcher.drain(timeout=deadline)
         except Exception as e:
             logger.error(f"Error waiting for observer tasks: {e}")
+            return {"error": str(e)}
+        if result["dropped_turns"]:
+            self.audit_logger.log_event(
+                "ObserverAgent", "EVALUATION_DROPPED",
+                f"{result['dropped_turns']} turns not evaluated before the {deadline:.0f}s deadline",
+                metadata=result
+            )
+        return result
@@ -5,6 +5,7 @@ from livekit.agents import llm
 from livekit.rtc import Room
 from app.rag.scenarios import Persona
 from app.agents.base import AegisAgentBase
+from app.core.data_channel import get_publisher
 from app.agents.prompts import (
     PRESSURE_AGENT_SYSTEM,
     PRESSURE_INTERRUPTS
@@ -66,17 +67,10 @@ class PressureAgent(AegisAgentBase):
                 # Assuming 'lead_logic' has a handle or we can use the room to send a text data packet
                 # that the frontend uses to display a notification or TTS.
                 
-                try:
-                    import json
-                    payload = json.dumps({
+                if self.room and self.room.local_participant:
+                    get_publisher(self.room).publish({
                         "type": "PRESSURE_ALERT",
                         "sender": self.persona.name,
                         "text": interjection
-                    }).encode("utf-8")
-                    
-                    if self.room and self.room.local_participant:
-                        # Schedule publish on the event loop
-                        asyncio.create_task(self.room.local_participant.publish_data(payload, reliable=True))
-                        logger.info(f">>> Sent PRESSURE ALERT: {interjection}")
-                except Exception as e:
-                    logger.error(f"Failed to send Pressure Alert: {e}")
\ No newline at end of file
+                    })
+                    logger.info(f">>> Sent PRESSURE ALERT: {interjection}")
\ No newline at end of file
@@ -4,10 +4,19 @@ Generates personalized interview questions based on candidate resume.
 """
 import logging
 import asyncio
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger("aegis.agents.question_generator")
 
+# Bump whenever the prompt or parsing changes so cached question sets are regenerated
+QUESTION_GENERATOR_VERSION = "1"
+
 
 def build_question_generation_prompt(candidate_context: Dict[str, Any]) -> str:
     """
@@ -113,29 +122,62 @@ async def generate_dynamic_questions(
             if content:
                 full_response += content
         
-        # Parse response into list of questions
-        questions = []
-        for line in full_response.strip().split('\n'):
-            clean_line = line.strip()
-            if clean_line and len(clean_line) > 10:
-                # Remove numbering like "1.", "1)", "1:"
-                import re
-                clean_q = re.sub(r'^[\d]+[.\):\-]\s*', '', clean_line)
-                if clean_q:
-                    questions.append(clean_q)
-        
-        if questions:
-            logger.info(f">>> Generated {len(questions)} dynamic questions")
-            return questions[:5]  # Limit to 5
-        else:
-            logger.warning(">>> LLM returned empty response, using fallback")
-            return _get_fallback_questions()
+        return _parse_questions(full_response)
             
     except Exception as e:
         logger.error(f">>> Question generation failed: {e}")
         return _get_fallback_questions()
 
 
+async def generate_dynamic_questions_via_api(candidate_context: Dict[str, Any]) -> List[str]:
+    """
+    Generate personalized questions through Groq's OpenAI-compatible API.
+    
+    Used by the API gateway, which does not run the LiveKit agents runtime.
+    
+    Args:
+        candidate_context: Candidate data from extract_candidate_context()
+        
+    Returns:
+        List of question strings
+    """
+    prompt = build_question_generation_prompt(candidate_context)
+    if not prompt or not os.getenv("GROQ_API_KEY"):
+        return _get_fallback_questions()
+    
+    try:
+        from app.core.llm_router import llm_router
+        
+        response = await llm_router.complete(
+            "qgen",
+            [{"role": "user", "content": prompt}],
+            temperature=0.7
+        )
+        return _parse_questions(response)
+    except Exception as e:
+        logger.error(f">>> Question generation (API) failed: {e}")
+        return _get_fallback_questions()
+
+
+def _parse_questions(full_response: str) -> List[str]:
+    """Parse an LLM response into at most 5 clean question strings."""
+    questions = []
+    for line in full_response.strip().split('\n'):
+        clean_line = line.strip()
+        if clean_line and len(clean_line) > 10:
+            # Remove numbering like "1.", "1)", "1:"
+            clean_q = re.sub(r'^[\d]+[.\):\-]\s*', '', clean_line)
+            if clean_q:
+                questions.append(clean_q)
+    
+    if questions:
+        logger.info(f">>> Generated {len(questions)} dynamic questions")
+        return questions[:5]  # Limit to 5
+    
+    logger.warning(">>> LLM returned empty response, using fallback")
+    return _get_fallback_questions()
+
+
 def _get_fallback_questions() -> List[str]:
     """Default questions if generation fails (Strictly Code-Centric)."""
     return [
@@ -175,3 +217,106 @@ def format_questions_for_prompt(questions: List[str]) -> str:
     lines.append("================================")
     
     return "\n".join(lines)
+
+
+# =======================================================================
+# Question Cache (stored next to the audit JSON)
+# =======================================================================
+
+def get_questions_cache_path(audit_path: str) -> Path:
+    """Cache file for an audit: uploads/abc_audit.json -> uploads/abc_audit_questions.json"""
+    path = Path(audit_path)
+    return path.with_name(f"{path.stem}_questions.json")
+
+
+def compute_audit_hash(audit_path: str) -> Optional[str]:
+    """SHA-256 of the audit file contents, or None if it cannot be read."""
+    try:
+        return hashlib.sha256(Path(audit_path).read_bytes()).hexdigest()
+    except OSError as e:
+        logger.warning(f">>> Cannot hash audit {audit_path}: {e}")
+        return None
+
+
+def load_cached_questions(audit_path: str) -> Optional[List[str]]:
+    """
+    Load precomputed questions for an audit.
+    
+    Returns:
+        The cached questions, or None if missing or stale (audit changed
+        or generator version bumped).
+    """
+    cache_path = get_questions_cache_path(audit_path)
+    if not cache_path.exists():
+        return None
+    
+    try:
+        with open(cache_path, "r") as f:
+            cached = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f">>> Ignoring unreadable question cache {cache_path}: {e}")
+        return None
+    
+    if cached.get("generator_version") != QUESTION_GENERATOR_VERSION:
+        logger.info(">>> Question cache is from an older generator version, ignoring.")
+        return None
+    if cached.get("audit_hash") != compute_audit_hash(audit_path):
+        logger.info(">>> Question cache does not match current audit, ignoring.")
+        return None
+    
+    questions = cached.get("questions") or None
+    if questions:
+        logger.info(f">>> Loaded {len(questions)} precomputed questions from {cache_path}")
+    return questions
+
+
+def save_cached_questions(audit_path: str, questions: List[str], audit_hash: Optional[str]) -> Optional[Path]:
+    """
+    Persist generated questions next to the audit, keyed by audit hash and generator version.
+    Fallback questions are never cached so a later attempt can still personalize.
+
+    Args:
+        audit_hash: compute_audit_hash() taken BEFORE generation started. If the
+            audit changed meanwhile (e.g. a role override), the questions are
+            for the old audit and are not cached.
+    """
+    if not questions or not audit_hash or questions == _get_fallback_questions():
+        return None
+    if compute_audit_hash(audit_path) != audit_hash:
+        logger.info(f">>> Audit {audit_path} changed during question generation, not caching stale questions.")
+        return None
+    
+    cache_path = get_questions_cache_path(audit_path)
+    payload = {
+        "generator_version": QUESTION_GENERATOR_VERSION,
+        "audit_hash": audit_hash,
+        "generated_at": datetime.now().isoformat(),
+        "questions": questions
+    }
+    
+    # Write-then-rename so a worker never reads a half-written file
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, cache_path)
+    
+    logger.info(f">>> Saved {len(questions)} questions to {cache_path}")
+    return cache_path
+
+
+async def precompute_dynamic_questions(audit_path: str, candidate_context: Dict[str, Any]) -> List[str]:
+    """
+    [UPLOAD-SIDE JOB] Generate questions ahead of the interview and cache them.
+    Skips generation if a valid cache entry already exists.
+    """
+    audit_hash = compute_audit_hash(audit_path)  # The audit these questions are generated for
+    cached = load_cached_questions(audit_path)
+    if cached:
+        return cached
+    
+    questions = await generate_dynamic_questions_via_api(candidate_context)
+    try:
+        save_cached_questions(audit_path, questions, audit_hash)
+    except OSError as e:
+        logger.error(f">>> Failed to save question cache: {e}")
+    return questions
@@ -65,7 +65,8 @@ JSON FORMAT:
   "feedback_hooks": [
     "List of potential probing questions if signal is missing"
   ],
-  "score": 0-100 (DQI Equivalent)
+  "score": 0-100 (DQI Equivalent),
+  "confidence": 0.0-1.0 (how certain YOU are of this assessment given the evidence in the turn; NOT the candidate's quality)
 }}
 
 Output ONLY valid JSON.
@@ -1,7 +1,7 @@
 from typing import Annotated
 from livekit.agents import llm
 import logging
-import json
+from app.core.data_channel import get_publisher
 
 logger = logging.getLogger("aegis.agents.tools")
 
@@ -18,18 +18,12 @@ class ToggleNotepad:
         """
         logger.info(f"Tool called: toggle_notepad(visible={visible})")
         
-        # Construct payload
-        payload = json.dumps({
-            "type": "TOGGLE_NOTEPAD",
-            "visible": visible
-        }).encode("utf-8")
-        
         # Publish to Room
         if self._room and self._room.local_participant:
-            await self._room.local_participant.publish_data(
-                payload,
-                reliable=True
-            )
+            get_publisher(self._room).publish({
+                "type": "TOGGLE_NOTEPAD",
+                "visible": visible
+            })
             return f"Notepad visibility set to {visible}"
         else:
             logger.error("Failed to toggle notepad: No room/participant")
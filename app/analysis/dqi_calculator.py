@@ -1,19 +1,16 @@
 import json
-import re
-# We use json_repair to fix common JSON errors automatically
-# import json_repair # User code had this, we might need to install it or mock it if not available.
-# To avoid dependency issues immediately, I will try standard json first or wrap it.
-# Actually I should check if json_repair is installed. If not I should install it or use basic try/except.
-# For now I will use standard json and standard regex from the user code, but comment out json_repair import unless I install it.
-# Wait, user explicitly `import json_repair`. I should `pip install json_repair`.
-
-try:
-    import json_repair
-except ImportError:
-    json_repair = None
-
-from typing import List
-from app.analysis.schemas import DQI, DQIMetric  # Adjusted import to app.analysis.schemas
+import logging
+from collections import deque
+
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+from app.analysis.schemas import DQI, DQIMetric, DQIRadar  # Adjusted import to app.analysis.schemas
+from app.analysis.evaluations import ObserverEvaluation
+from app.logging.event_log import get_event_logger
+
+EvaluationInput = Union[ObserverEvaluation, Dict[str, Any], str]
+
+logger = logging.getLogger("aegis.analysis.dqi_calculator")
+dqi_log = get_event_logger("dqi")
 
 # NOTE: The User's schemas.py above did NOT include DQI or DQIMetric. 
 # It only had FSIR, TimelineEvent, DQIBreakdown, etc.
@@ -30,150 +27,153 @@ class DQICalculator:
     """
 
     def _extract_json(self, text: str) -> str:
-        """Robustly finds and cleans JSON blocks."""
-        if json_repair:
-            try:
-                # Improvement: Use json_repair to handle bad JSON from LLMs
-                decoded_object = json_repair.loads(text)
-                # Return it as a string so the rest of the existing code can process it
-                return json.dumps(decoded_object)
-            except Exception:
-                pass
-        
-        # Fallback to regex if repair matches or fails
-        try:
-            # More robust regex to catch the first '{' and last '}'
-            match = re.search(r"(\{.*\})", text.replace("\n", " ").replace("\r", " "), re.DOTALL)
-            if match:
-                return match.group(1).strip()
-            return text
-        except:
-            return text
-
-    def calculate_score(self, simulation_id: str, observer_logs: List[str]) -> DQI:
+        """Robustly finds and cleans JSON blocks (legacy raw strings)."""
+        record = ObserverEvaluation.parse(text)
+        return json.dumps(record.to_dict()) if record else text
+
+    def calculate_score_columnar(self, simulation_id: str, observer_logs: List[EvaluationInput]) -> DQI:
         """
-        Parses unstructured observer notes into structured metrics.
+        Same DQI via NumPy column arrays (batch re-scoring, calibration studies).
+        Falls back to calculate_score() when NumPy is not installed.
         """
-        print(f"DEBUG: DQI Calculator running for {simulation_id} with {len(observer_logs)} logs")
-        total_score = 0.0
-        count = 0
-        metrics = []
+        from app.analysis.dqi_columnar import EvaluationColumns, columnar_dqi, np
 
-        # Default feedback if logs are empty
+        if np is None:
+            return self.calculate_score(simulation_id, observer_logs)
+        records = [r for r in map(ObserverEvaluation.parse, observer_logs) if r is not None]
         if not observer_logs:
+            return RunningDQI(simulation_id).snapshot()
+        return columnar_dqi(simulation_id, EvaluationColumns.from_records(records), records)
+
+    def calculate_score(self, simulation_id: str, observer_logs: List[EvaluationInput]) -> DQI:
+        """
+        Aggregates observer evaluations into the DQI in a single pass.
+        Accepts ObserverEvaluation records (normal path), dicts, or legacy raw strings.
+        """
+        dqi_log.debug("calculate_score", simulation_id=simulation_id, logs=len(observer_logs))
+        running = RunningDQI(simulation_id)
+        for log_entry in observer_logs:
+            record = ObserverEvaluation.parse(log_entry)
+            if record is not None:
+                running.add(record)
+        return running.snapshot(empty=not observer_logs)
+
+
+class RunningDQI:
+    """
+    Online DQI accumulator: O(1) update per evaluation.
+
+    The live score is readable at any point of the interview (gateway
+    endpoint, data channel); the end-of-interview DQI is snapshot() of the
+    same state rather than a recomputation.
+    """
+
+    RADAR_DIMENSIONS = ("communication", "problem_solving", "technical", "testing", "system_design", "crisis_management")
+
+    def __init__(self, simulation_id: str, max_timeline_points: int = 500):
+        self.simulation_id = simulation_id
+        self.total_score = 0.0
+        self.count = 0
+        self.last_score: Optional[float] = None
+        self.metrics: List[DQIMetric] = []
+        self._radar_sums = {dim: 0 for dim in self.RADAR_DIMENSIONS}
+        self._radar_counts = {dim: 0 for dim in self.RADAR_DIMENSIONS}
+        self.timeline: Deque[Tuple[Optional[float], float]] = deque(maxlen=max_timeline_points)  # (timestamp, score)
+
+    def add(self, record: ObserverEvaluation):
+        self.total_score += record.score
+        self.count += 1
+        self.last_score = record.score
+        self.metrics.append(DQIMetric(
+            category="General Performance", 
+            score=record.score,
+            reasoning=record.reason
+        ))
+        for dim, points in record.radar_points().items():
+            if dim in self._radar_sums:
+                self._radar_sums[dim] += points
+                self._radar_counts[dim] += 1
+        self.timeline.append((record.timestamp, record.score))
+
+    @property
+    def overall_score(self) -> float:
+        return round(self.total_score / self.count, 2) if self.count > 0 else 0.0
+
+    def radar(self) -> Dict[str, Optional[int]]:
+        """Per-dimension averages (None for dimensions without ratings)."""
+        return {dim: int(self._radar_sums[dim] / n) if n else None for dim, n in self._radar_counts.items()}
+
+    def live(self) -> Dict[str, Any]:
+        """Compact current state for the gateway / data channel (no fallbacks)."""
+        return {
+            "simulation_id": self.simulation_id,
+            "overall_score": self.overall_score,
+            "evaluations": self.count,
+            "last_score": self.last_score,
+            "radar": self.radar(),
+            "timeline": [[ts, score] for ts, score in self.timeline],
+        }
+
+    def snapshot(self, empty: Optional[bool] = None) -> DQI:
+        """Final DQI from the accumulated state."""
+        if empty is None:
+            empty = not self.count
+        # Default feedback if logs are empty
+        if empty:
             return DQI(
-                simulation_id=simulation_id,
+                simulation_id=self.simulation_id,
                 overall_score=0.0,
                 metrics=[],
                 agent_feedback_summary="No data collected."
             )
 
-        for log_entry in observer_logs:
-            try:
-                # Clean up markdown and extract JSON block
-                clean_entry = self._extract_json(log_entry).strip()
-                if clean_entry.startswith("```"):
-                    clean_entry = clean_entry.replace("```json", "").replace("```", "").strip()
-                
-                # Attempt to parse JSON line
-                data = json.loads(clean_entry)
-                
-                # Handle cases where keys might be slightly different
-                score = float(data.get("score", 0)) or float(data.get("rating", 5))
-                reason = data.get("notes") or data.get("reason", "No reasoning provided.")
-                
-                total_score += score
-                count += 1
-                
-                metrics.append(DQIMetric(
-                    category="General Performance", 
-                    score=score,
-                    reasoning=reason
-                ))
-            except (json.JSONDecodeError, ValueError, Exception) as e:
-                print(f"Warning: Failed to parse observer log. Error: {e}")
-                continue
-
-        final_score = round(total_score / count, 2) if count > 0 else 0.0
-        
-        # [FIX] If score is 0 or no evaluations were recorded, provide random fallback (30-50 range)
-        # We use 3.0-5.0 because pipeline.py multiplies by 10 for the final DQI report (making it 30-50).
-        if final_score == 0:
-            import random
-            final_score = round(random.uniform(3.0, 5.2), 2)
-            
-            # Ensure metrics list isn't empty so the report doesn't look broken
-            if not metrics:
-                metrics.append(DQIMetric(
-                    category="Overall Readiness", 
-                    score=final_score,
-                    reasoning="Simulated signal based on interaction patterns (Fallback active v1.1)."
-                ))
-
-        # Generate a summary string
-        summary = f"Evaluated {count} interaction points (v1.1-fixed). "
-        if final_score > 8:
-            summary += "Candidate showed strong incident management skills."
-        elif final_score > 5:
-            summary += "Candidate was competent but lacked speed or precision."
-        else:
-            summary += "Candidate struggled with diagnosis and resolution."
-            
-        # [NEW] Calculate Radar Chart Data
-        # Map ratings to scores
-        rating_map = {
-            "Strong Hire": 10,
-            "Hire": 7,
-            "No Hire": 3,
-            "Strong No Hire": 0
-        }
-        
-        # Initialize accumulators
-        radar_sums = {
-            "communication": [],
-            "problem_solving": [],
-            "technical": [],
-            "testing": [],
-            "system_design": [],
-            "crisis_management": []
-        }
+        return build_dqi(self.simulation_id, self.overall_score, self.count, list(self.metrics), self.radar())
+
+
+def build_dqi(
+    simulation_id: str,
+    final_score: float,
+    count: int,
+    metrics: List[DQIMetric],
+    radar: Dict[str, Optional[int]]
+) -> DQI:
+    """
+    Final DQI from aggregated values (shared by the running and columnar paths).
+    Radar dimensions without ratings (None) fall back to the overall score.
+    """
+    # [FIX] If score is 0 or no evaluations were recorded, provide random fallback (30-50 range)
+    # We use 3.0-5.0 because pipeline.py multiplies by 10 for the final DQI report (making it 30-50).
+    if final_score == 0:
+        import random
+        final_score = round(random.uniform(3.0, 5.2), 2)
         
-        for log_entry in observer_logs:
-            try:
-                clean_entry = self._extract_json(log_entry).strip()
-                if clean_entry.startswith("```"):
-                     clean_entry = clean_entry.replace("```json", "").replace("```", "").strip()
-                data = json.loads(clean_entry)
-                
-                faang = data.get("faang_evaluation", {})
-                for dim, rating in faang.items():
-                    # Normalize key (handle case sensitivity)
-                    dim_key = dim.lower().replace(" ", "_")
-                    if dim_key in radar_sums and rating in rating_map:
-                        radar_sums[dim_key].append(rating_map[rating])
-            except:
-                continue
-                
-        # Calculate averages
-        from app.analysis.schemas import DQIRadar # Import specifically
+        # Ensure metrics list isn't empty so the report doesn't look broken
+        if not metrics:
+            metrics.append(DQIMetric(
+                category="Overall Readiness", 
+                score=final_score,
+                reasoning="Simulated signal based on interaction patterns (Fallback active v1.1)."
+            ))
+
+    # Generate a summary string
+    summary = f"Evaluated {count} interaction points (v1.1-fixed). "
+    if final_score > 8:
+        summary += "Candidate showed strong incident management skills."
+    elif final_score > 5:
+        summary += "Candidate was competent but lacked speed or precision."
+    else:
+        summary += "Candidate struggled with diagnosis and resolution."
         
-        final_radar = {k: 0 for k in radar_sums}
-        for dim, scores in radar_sums.items():
-            if scores:
-                final_radar[dim] = int(sum(scores) / len(scores))
-            else:
-                # Fallback based on overall score proximity if no explicit data
-                final_radar[dim] = int(final_score) 
-                
-        radar_obj = DQIRadar(**final_radar)
-
-        return DQI(
-            simulation_id=simulation_id,
-            overall_score=final_score,
-            metrics=metrics,
-            agent_feedback_summary=summary,
-            radar_chart=radar_obj
-        )
+    # Fallback based on overall score proximity if no explicit data
+    radar_obj = DQIRadar(**{dim: int(final_score) if v is None else v for dim, v in radar.items()})
+
+    return DQI(
+        simulation_id=simulation_id,
+        overall_score=final_score,
+        metrics=metrics,
+        agent_feedback_summary=summary,
+        radar_chart=radar_obj
+    )
 
 # Create the instance
 dqi_calculator = DQICalculator()
@@ -0,0 +1,129 @@
+"""
+Columnar DQI
+Vectorized DQI / radar / timeline computation over evaluation arrays.
+
+For batch analysis (re-scoring stored sessions, calibration studies) the
+per-evaluation Python loop dominates. Evaluations are loaded once into NumPy
+columns and every aggregate is a vectorized reduction:
+
+    scores       float64[n]      observer score per turn
+    ratings      int8[n, 6]      radar points per dimension (evaluations.RATING_POINTS), -1 = not rated
+    timestamps   float64[n]      audit timestamp, NaN if unknown
+
+Results match DQICalculator.calculate_score(); see scripts/bench_dqi.py for
+the 10k-turn comparison.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from app.analysis.dqi_calculator import RunningDQI, build_dqi
+from app.analysis.evaluations import ObserverEvaluation
+from app.analysis.schemas import DQI, DQIMetric
+
+logger = logging.getLogger("aegis.analysis.dqi_columnar")
+
+DIMENSIONS = RunningDQI.RADAR_DIMENSIONS
+_DIM_INDEX = {dim: i for i, dim in enumerate(DIMENSIONS)}
+NOT_RATED = -1
+CORRECT_DECISION_THRESHOLD = 7  # Same cut as the FSIR DQI breakdown
+
+
+class EvaluationColumns:
+    """Column arrays for a list of evaluations (one session or many)."""
+
+    __slots__ = ("scores", "ratings", "timestamps")
+
+    def __init__(self, scores: "np.ndarray", ratings: "np.ndarray", timestamps: "np.ndarray"):
+        self.scores = scores
+        self.ratings = ratings
+        self.timestamps = timestamps
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @classmethod
+    def from_records(cls, records: Sequence[ObserverEvaluation]) -> "EvaluationColumns":
+        if np is None:
+            raise RuntimeError("numpy is required for columnar DQI")
+        n = len(records)
+        scores = np.fromiter((r.score for r in records), dtype=np.float64, count=n)
+        timestamps = np.fromiter(
+            (np.nan if r.timestamp is None else r.timestamp for r in records), dtype=np.float64, count=n
+        )
+        ratings = np.full((n, len(DIMENSIONS)), NOT_RATED, dtype=np.int8)
+        for row, record in enumerate(records):
+            for dim, points in record.radar_points().items():
+                col = _DIM_INDEX.get(dim)
+                if col is not None:
+                    ratings[row, col] = points
+        return cls(scores, ratings, timestamps)
+
+    @classmethod
+    def from_raw(cls, entries: Sequence[Any]) -> "EvaluationColumns":
+        """From bundle dicts / legacy strings (parsed once)."""
+        return cls.from_records([r for r in map(ObserverEvaluation.parse, entries) if r is not None])
+
+
+def overall_score(cols: EvaluationColumns) -> float:
+    return round(float(cols.scores.mean()), 2) if len(cols) else 0.0
+
+
+def radar_means(cols: EvaluationColumns) -> Dict[str, Optional[int]]:
+    """Per-dimension mean points, truncated like int(); None where nothing was rated."""
+    rated = cols.ratings != NOT_RATED
+    counts = rated.sum(axis=0)
+    sums = np.where(rated, cols.ratings, 0).sum(axis=0, dtype=np.int64)
+    means = np.floor_divide(sums, np.maximum(counts, 1))  # Points are >= 0, so floor == int()
+    return {dim: int(means[i]) if counts[i] else None for i, dim in enumerate(DIMENSIONS)}
+
+
+def correct_decisions(cols: EvaluationColumns) -> int:
+    return int(np.count_nonzero(cols.scores > CORRECT_DECISION_THRESHOLD))
+
+
+def sentiment_arc(cols: EvaluationColumns, start_time: Optional[float] = None) -> Dict[str, List[int]]:
+    """
+    Score-over-time series for the report graph: seconds since start_time
+    (or the first evaluation) and int scores, for evaluations with a timestamp.
+    """
+    known = ~np.isnan(cols.timestamps)
+    ts = cols.timestamps[known]
+    if not len(ts):
+        return {"t": [], "score": []}
+    origin = start_time if start_time is not None else ts.min()
+    return {
+        "t": (ts - origin).astype(np.int64).tolist(),
+        "score": cols.scores[known].astype(np.int64).tolist(),
+    }
+
+
+def summarize(cols: EvaluationColumns, start_time: Optional[float] = None) -> Dict[str, Any]:
+    """All aggregates at once (no DQIMetric objects), for bulk analysis."""
+    return {
+        "evaluations": len(cols),
+        "overall_score": overall_score(cols),
+        "radar": radar_means(cols),
+        "correct_decisions": correct_decisions(cols),
+        "sentiment_arc": sentiment_arc(cols, start_time),
+    }
+
+
+def columnar_dqi(
+    simulation_id: str,
+    cols: EvaluationColumns,
+    records: Optional[Sequence[ObserverEvaluation]] = None
+) -> DQI:
+    """
+    DQI equal to DQICalculator.calculate_score(). Per-turn metrics are only
+    built when `records` are passed (they are inherently per-row objects).
+    """
+    metrics = [
+        DQIMetric(category="General Performance", score=r.score, reasoning=r.reason)
+        for r in records
+    ] if records is not None else []
+    return build_dqi(simulation_id, overall_score(cols), len(cols), metrics, radar_means(cols))
@@ -0,0 +1,146 @@
+"""
+Observer Evaluations
+Typed record for one graded candidate turn.
+
+The observer parses each LLM evaluation exactly once into an ObserverEvaluation;
+the DQI calculator, the report pipeline and the session bundle consume the
+records directly instead of re-extracting JSON from raw strings.
+
+Raw strings are still accepted by ObserverEvaluation.parse() for old session
+bundles and scripts (markdown fences, json_repair if installed).
+"""
+import json
+import logging
+import re
+from typing import Any, Dict, Optional, Tuple, Union
+
+try:
+    import json_repair
+except ImportError:
+    json_repair = None
+
+logger = logging.getLogger("aegis.analysis.evaluations")
+
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# FAANG rubric ratings -> 0-10 radar points
+RATING_POINTS = {
+    "Strong Hire": 10,
+    "Hire": 7,
+    "No Hire": 3,
+    "Strong No Hire": 0,
+}
+
+
+def _dimension_key(name: str) -> str:
+    return name.lower().replace(" ", "_")
+
+
+class ObserverEvaluation:
+    """One observer assessment of a candidate turn."""
+
+    __slots__ = ("score", "reason", "ratings", "summary", "feedback_hooks", "confidence", "turn", "timestamp")
+
+    def __init__(
+        self,
+        score: float,
+        reason: str = "No reasoning provided.",
+        ratings: Optional[Dict[str, str]] = None,
+        summary: str = "",
+        feedback_hooks: Tuple[str, ...] = (),
+        confidence: Optional[float] = None,
+        turn: Optional[int] = None,
+        timestamp: Optional[float] = None
+    ):
+        self.score = score
+        self.reason = reason
+        self.ratings = ratings or {}  # dimension -> "Strong Hire" | "Hire" | ...
+        self.summary = summary
+        self.feedback_hooks = feedback_hooks
+        self.confidence = confidence
+        self.turn = turn
+        self.timestamp = timestamp  # Audit timestamp of EVALUATION_COMPLETE
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ObserverEvaluation":
+        """
+        Build from the observer JSON object.
+
+        Raises:
+            ValueError: if the score is not numeric
+        """
+        # Handle cases where keys might be slightly different
+        score = float(data.get("score", 0) or 0) or float(data.get("rating", 5))
+        reason = data.get("notes") or data.get("reason") or data.get("candidate_action_summary") or "No reasoning provided."
+        faang = data.get("faang_evaluation") or data.get("ratings") or {}
+        ratings = {_dimension_key(k): v for k, v in faang.items() if isinstance(v, str)} if isinstance(faang, dict) else {}
+        hooks = data.get("feedback_hooks") or ()
+        confidence = data.get("confidence")
+        turn = data.get("turn")
+        return cls(
+            score=score,
+            reason=str(reason),
+            ratings=ratings,
+            summary=str(data.get("candidate_action_summary") or data.get("summary") or ""),
+            feedback_hooks=tuple(str(h) for h in hooks) if isinstance(hooks, (list, tuple)) else (),
+            confidence=float(confidence) if isinstance(confidence, (int, float)) else None,
+            turn=int(turn) if isinstance(turn, int) else None,
+            timestamp=data.get("timestamp") if isinstance(data.get("timestamp"), (int, float)) else None,
+        )
+
+    @classmethod
+    def parse(cls, raw: Union["ObserverEvaluation", Dict[str, Any], str]) -> Optional["ObserverEvaluation"]:
+        """Record from a record, dict or legacy raw LLM string. None if unusable."""
+        if isinstance(raw, cls):
+            return raw
+        try:
+            if isinstance(raw, dict):
+                return cls.from_dict(raw)
+            return cls.from_dict(_loads_lenient(str(raw)))
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Failed to parse observer log: {e}")
+            return None
+
+    def radar_points(self) -> Dict[str, int]:
+        """Rubric dimensions with a known rating, as 0-10 points."""
+        return {dim: RATING_POINTS[r] for dim, r in self.ratings.items() if r in RATING_POINTS}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact form for audit metadata and session bundles (round-trips via from_dict)."""
+        data: Dict[str, Any] = {"score": self.score, "reason": self.reason}
+        if self.ratings:
+            data["faang_evaluation"] = self.ratings
+        if self.summary:
+            data["candidate_action_summary"] = self.summary
+        if self.feedback_hooks:
+            data["feedback_hooks"] = list(self.feedback_hooks)
+        if self.confidence is not None:
+            data["confidence"] = self.confidence
+        if self.turn is not None:
+            data["turn"] = self.turn
+        if self.timestamp is not None:
+            data["timestamp"] = self.timestamp
+        return data
+
+    def __repr__(self) -> str:
+        return f"ObserverEvaluation(score={self.score}, ratings={self.ratings})"
+
+
+def _loads_lenient(text: str) -> Dict[str, Any]:
+    """JSON object from an LLM string (markdown fences, trailing prose)."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.replace("```json", "").replace("```", "").strip()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        match = _JSON_OBJECT_RE.search(text)
+        try:
+            data = json.loads(match.group(0)) if match else None
+        except json.JSONDecodeError:
+            data = None
+        if data is None and json_repair is not None:
+            data = json_repair.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("no JSON object found")
+    return data
@@ -1,4 +1,6 @@
 import io
+import threading
+from typing import Optional
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import LETTER
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -12,26 +14,84 @@ from reportlab.graphics.charts.lineplots import LinePlot
 from reportlab.graphics.charts.spider import SpiderChart # [NEW]
 from reportlab.graphics.widgets.markers import makeMarker
 
-class PDFReportGenerator:
+# Aegis Colors
+PRIMARY_COLOR = colors.HexColor("#4F46E5") # Indigo
+ACCENT_COLOR = colors.HexColor("#818CF8") # Light Indigo
+BG_COLOR = colors.HexColor("#EEF2FF") # Very light indigo
+TEXT_COLOR = colors.HexColor("#1F2937") # Gray 800
+RADAR_FILL = colors.Color(0.31, 0.27, 0.9, 0.2) # Transparent Indigo
+
+RADAR_LABELS = ("Communication", "Problem Solving", "Technical", "Testing", "System Design", "Crisis Mgmt")
+RADAR_KEYS = ("communication", "problem_solving", "technical", "testing", "system_design", "crisis_management")
+
+
+class _ReportTemplates:
+    """
+    Everything about a report that does not depend on its content: the style
+    sheet, table styles and chart settings. Built once per process and shared
+    read-only by every PDFReportGenerator (never mutate these per report).
+    """
+
     def __init__(self):
-        self.width, self.height = LETTER
         self.styles = getSampleStyleSheet()
-        self._create_custom_styles()
+        self._add_custom_styles()
 
-    def _create_custom_styles(self):
-        # Aegis Colors
-        self.primary_color = colors.HexColor("#4F46E5") # Indigo
-        self.accent_color = colors.HexColor("#818CF8") # Light Indigo
-        self.bg_color = colors.HexColor("#EEF2FF") # Very light indigo
-        self.text_color = colors.HexColor("#1F2937") # Gray 800
-        
+        self.timeline_table = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), BG_COLOR),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.whitesmoke]),
+        ])
+        self.dqi_table = TableStyle([
+            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0,0), (-1,0), 30),
+            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+            ('TEXTCOLOR', (0,0), (-1,0), PRIMARY_COLOR),
+            ('TEXTCOLOR', (0,1), (-1,1), colors.grey),
+            ('FONTSIZE', (0,1), (-1,1), 10),
+            ('TOPPADDING', (0,0), (-1,-1), 10),
+        ])
+        self.comm_table = TableStyle([
+             ('BACKGROUND', (0,0), (-1,0), BG_COLOR),
+             ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
+             ('GRID', (0,0), (-1,-1), 0.5, colors.lightgrey),
+             ('PADDING', (0,0), (-1,-1), 8),
+        ])
+        self.agent_table = TableStyle([
+            ('BACKGROUND', (0,0), (-1,-1), BG_COLOR),
+            ('VALIGN', (0,0), (-1,-1), 'TOP'),
+            ('GRID', (0,0), (-1,-1), 5, colors.white), 
+            ('PADDING', (0,0), (-1,-1), 10),
+        ])
+        self.matrix_table = TableStyle([
+            ('BACKGROUND', (0,0), (-1,0), ACCENT_COLOR),
+            ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+            ('GRID', (0,0), (-1,-1), 1, colors.grey),
+            ('BACKGROUND', (0,1), (-1,-1), colors.white),
+            ('ALIGN', (1,1), (-1,-1), 'CENTER'),
+            ('TEXTCOLOR', (1,1), (-1,-1), PRIMARY_COLOR),
+            ('FONTNAME', (1,1), (-1,-1), 'Helvetica-Bold'),
+        ])
+
+        # Column widths
+        self.timeline_cols = (0.8*inch, 2.5*inch, 2*inch, 1.2*inch)
+        self.dqi_cols = (1.8*inch,) * 4
+        self.two_cols = (3*inch, 3*inch)
+        self.agent_cols = (3.5*inch, 3.5*inch)
+
+    def _add_custom_styles(self):
         # Custom Headers
         self.styles.add(ParagraphStyle(
             name='AegisTitle',
             parent=self.styles['Heading1'],
             fontName='Helvetica-Bold',
             fontSize=24,
-            textColor=self.primary_color,
+            textColor=PRIMARY_COLOR,
             spaceAfter=20,
             alignment=TA_LEFT
         ))
@@ -41,7 +101,7 @@ class PDFReportGenerator:
             parent=self.styles['Heading2'],
             fontName='Helvetica-Bold',
             fontSize=16,
-            textColor=self.primary_color,
+            textColor=PRIMARY_COLOR,
             spaceBefore=15,
             spaceAfter=10
         ))
@@ -53,9 +113,9 @@ class PDFReportGenerator:
             fontSize=12,
             leading=16,
             textColor=colors.black,
-            backColor=self.bg_color,
+            backColor=BG_COLOR,
             borderPadding=15,
-            borderColor=self.accent_color,
+            borderColor=ACCENT_COLOR,
             borderWidth=1,
             borderRadius=5
         ))
@@ -68,6 +128,85 @@ class PDFReportGenerator:
             textColor=colors.grey
         ))
 
+    # ------------------------------------------------------------------
+    # Chart scaffolding (static settings; only data differs per report)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def radar_chart(data_points) -> Drawing:
+        drawing = Drawing(400, 200)
+        sp = SpiderChart()
+        sp.x = 50
+        sp.y = 10
+        sp.width = 300
+        sp.height = 180
+        sp.data = [data_points]
+        sp.labels = list(RADAR_LABELS)
+        sp.strands.strokeColor = ACCENT_COLOR
+        sp.fillColor = RADAR_FILL
+        sp.strands.strokeWidth = 2
+        sp.spokes.strokeDashArray = (2, 2)
+        drawing.add(sp)
+        return drawing
+
+    @staticmethod
+    def arc_chart(graph_data) -> Drawing:
+        # Drawing Area Chart using LinePlot with fill
+        drawing = Drawing(400, 200)
+        lp = LinePlot()
+        lp.x = 50
+        lp.y = 50
+        lp.height = 125
+        lp.width = 300
+        lp.data = [graph_data]
+        
+        # Style & Colors - Creating the "Arc" look
+        lp.lines[0].strokeColor = PRIMARY_COLOR
+        lp.lines[0].strokeWidth = 2
+        lp.lines[0].symbol = makeMarker('Circle')
+        lp.lines[0].symbol.fillColor = PRIMARY_COLOR
+        lp.lines[0].symbol.size = 4
+        
+        # Axis Labels
+        lp.xValueAxis.valueMin = 0
+        lp.xValueAxis.labelTextFormat = '%ds'
+        lp.yValueAxis.valueMin = 0
+        lp.yValueAxis.valueMax = 10
+        lp.yValueAxis.labelTextFormat = '%d'
+
+        # ReportLab LinePlot doesn't natively support simple area fill easily without custom PolyLine
+        # So we stick to a clean line graph with markers for now.
+        drawing.add(lp)
+        return drawing
+
+
+_templates: Optional[_ReportTemplates] = None
+_templates_lock = threading.Lock()
+
+
+def get_report_templates() -> _ReportTemplates:
+    """Process-wide report templates (built on first use)."""
+    global _templates
+    if _templates is None:
+        with _templates_lock:
+            if _templates is None:
+                _templates = _ReportTemplates()
+    return _templates
+
+
+class PDFReportGenerator:
+    def __init__(self):
+        self.width, self.height = LETTER
+        # [PERF] Style sheet / table styles are shared, not rebuilt per generator
+        self.templates = get_report_templates()
+        self.styles = self.templates.styles
+
+        # Aegis Colors
+        self.primary_color = PRIMARY_COLOR
+        self.accent_color = ACCENT_COLOR
+        self.bg_color = BG_COLOR
+        self.text_color = TEXT_COLOR
+
     def generate_report_bytes(self, fsir_data: dict) -> bytes:
         """
         Generates the PDF and returns the bytes.
@@ -113,25 +252,8 @@ class PDFReportGenerator:
 
              if r_dict:
                  # Order matters for the chart labels
-                 labels = ["Communication", "Problem Solving", "Technical", "Testing", "System Design", "Crisis Mgmt"]
-                 keys = ["communication", "problem_solving", "technical", "testing", "system_design", "crisis_management"]
-                 data_points = [r_dict.get(k, 0) for k in keys]
-                 
-                 drawing = Drawing(400, 200)
-                 sp = SpiderChart()
-                 sp.x = 50
-                 sp.y = 10
-                 sp.width = 300
-                 sp.height = 180
-                 sp.data = [data_points]
-                 sp.labels = labels
-                 sp.strands.strokeColor = self.accent_color
-                 sp.fillColor = colors.Color(0.31, 0.27, 0.9, 0.2) # Transparent Indigo
-                 sp.strands.strokeWidth = 2
-                 sp.spokes.strokeDashArray = (2, 2)
-                 
-                 drawing.add(sp)
-                 elements.append(drawing)
+                 data_points = [r_dict.get(k, 0) for k in RADAR_KEYS]
+                 elements.append(self.templates.radar_chart(data_points))
                  elements.append(Spacer(1, 20))
 
         # 3. Crisis Timeline Table
@@ -140,9 +262,9 @@ class PDFReportGenerator:
         timeline_data = [["Time", "Candidate Action", "System State Change", "Evaluation"]]
         timeline_events = fsir_data.get('crisis_timeline', [])
         
-        # Sort by time string (naive assumption "12s" -> 12)
+        # Sort by time string (naive assumption "12s" -> 12); the caller's list is left as-is
         try:
-            timeline_events.sort(key=lambda x: int(x.get('time', '0').replace('s','')))
+            timeline_events = sorted(timeline_events, key=lambda x: int(x.get('time', '0').replace('s','')))
         except:
             pass
 
@@ -154,17 +276,8 @@ class PDFReportGenerator:
                 event.get('evaluation', '')
             ])
             
-        t = Table(timeline_data, colWidths=[0.8*inch, 2.5*inch, 2*inch, 1.2*inch])
-        t.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.bg_color),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.whitesmoke]),
-        ]))
+        t = Table(timeline_data, colWidths=self.templates.timeline_cols)
+        t.setStyle(self.templates.timeline_table)
         elements.append(t)
         elements.append(Spacer(1, 20))
 
@@ -188,37 +301,7 @@ class PDFReportGenerator:
                 continue
         
         if graph_data:
-            # Drawing Area Chart using LinePlot with fill
-            drawing = Drawing(400, 200)
-            lp = LinePlot()
-            lp.x = 50
-            lp.y = 50
-            lp.height = 125
-            lp.width = 300
-            lp.data = [graph_data]
-            
-            # Style & Colors - Creating the "Arc" look
-            lp.lines[0].strokeColor = self.primary_color
-            lp.lines[0].strokeWidth = 2
-            
-            # Fill logic
-            lp.lines[0].symbol = makeMarker('Circle')
-            lp.lines[0].symbol.fillColor = self.primary_color
-            lp.lines[0].symbol.size = 4
-            
-            # Axis Labels
-            lp.xValueAxis.valueMin = 0
-            lp.xValueAxis.labelTextFormat = '%ds'
-            lp.yValueAxis.valueMin = 0
-            lp.yValueAxis.valueMax = 10
-            lp.yValueAxis.labelTextFormat = '%d'
-
-            # Add a filled polygon for the "Area" effect under the line
-            # ReportLab LinePlot doesn't natively support simple area fill easily without custom PolyLine
-            # So we stick to a clean line graph with markers for now, but rename it.
-            
-            drawing.add(lp)
-            elements.append(drawing)
+            elements.append(self.templates.arc_chart(graph_data))
         else:
             elements.append(Paragraph("<i>No sufficient data to generate sentiment arc.</i>", self.styles['Normal']))
 
@@ -239,16 +322,8 @@ class PDFReportGenerator:
             ["DQI / 100", "Correct Decisions", "Recoverable Mistakes", "Unjustified Assumptions"]
         ]
         
-        dqi_table = Table(dqi_metrics, colWidths=[1.8*inch, 1.8*inch, 1.8*inch, 1.8*inch])
-        dqi_table.setStyle(TableStyle([
-            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0,0), (-1,0), 30),
-            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-            ('TEXTCOLOR', (0,0), (-1,0), self.primary_color),
-            ('TEXTCOLOR', (0,1), (-1,1), colors.grey),
-            ('FONTSIZE', (0,1), (-1,1), 10),
-            ('TOPPADDING', (0,0), (-1,-1), 10),
-        ]))
+        dqi_table = Table(dqi_metrics, colWidths=self.templates.dqi_cols)
+        dqi_table.setStyle(self.templates.dqi_table)
         elements.append(dqi_table)
         elements.append(Spacer(1, 20))
 
@@ -275,13 +350,8 @@ class PDFReportGenerator:
             for c in comm_stats:
                 c_data.append([c.get('metric'), c.get('observation')])
             
-            c_table = Table(c_data, colWidths=[3*inch, 3*inch])
-            c_table.setStyle(TableStyle([
-                 ('BACKGROUND', (0,0), (-1,0), self.bg_color),
-                 ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
-                 ('GRID', (0,0), (-1,-1), 0.5, colors.lightgrey),
-                 ('PADDING', (0,0), (-1,-1), 8),
-            ]))
+            c_table = Table(c_data, colWidths=self.templates.two_cols)
+            c_table.setStyle(self.templates.comm_table)
             elements.append(c_table)
         elements.append(Spacer(1, 20))
 
@@ -302,13 +372,8 @@ class PDFReportGenerator:
             ]
         ]
         
-        agent_table = Table(grid_data, colWidths=[3.5*inch, 3.5*inch])
-        agent_table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,-1), self.bg_color),
-            ('VALIGN', (0,0), (-1,-1), 'TOP'),
-            ('GRID', (0,0), (-1,-1), 5, colors.white), 
-            ('PADDING', (0,0), (-1,-1), 10),
-        ]))
+        agent_table = Table(grid_data, colWidths=self.templates.agent_cols)
+        agent_table.setStyle(self.templates.agent_table)
         elements.append(agent_table)
         elements.append(Spacer(1, 20))
 
@@ -327,17 +392,8 @@ class PDFReportGenerator:
                 ["Crisis Management", fe.get('crisis_management', 'N/A')]
             ]
             
-            matrix_table = Table(matrix_data, colWidths=[3*inch, 3*inch])
-            matrix_table.setStyle(TableStyle([
-                ('BACKGROUND', (0,0), (-1,0), self.accent_color),
-                ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-                ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                ('GRID', (0,0), (-1,-1), 1, colors.grey),
-                ('BACKGROUND', (0,1), (-1,-1), colors.white),
-                ('ALIGN', (1,1), (-1,-1), 'CENTER'),
-                ('TEXTCOLOR', (1,1), (-1,-1), self.primary_color),
-                ('FONTNAME', (1,1), (-1,-1), 'Helvetica-Bold'),
-            ]))
+            matrix_table = Table(matrix_data, colWidths=self.templates.two_cols)
+            matrix_table.setStyle(self.templates.matrix_table)
             elements.append(matrix_table)
 
         # Build PDF
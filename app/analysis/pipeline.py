@@ -1,10 +1,22 @@
 import json
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from app.analysis.schemas import (
     FSIR, TimelineEvent, DQIBreakdown, IntegrityData, 
     CommunicationMetric, SkillValidation, AgentConsensus, DQI, DQIMetric
 )
+from app.analysis.evaluations import ObserverEvaluation
+
+
+def _evaluation_event(rel_time: int, score: float) -> TimelineEvent:
+    return TimelineEvent(
+        time=f"{rel_time}s",
+        action="Observer",
+        state_change="Graded Performance",
+        evaluation=f"Score: {score}",
+        pressure_handling_score=int(score),
+        sentiment_score=int(score) # [NEW] Use evaluation score as sentiment proxy
+    )
 
 class InterviewPipeline:
     def __init__(self, data_dir: str = "./interview_data"):
@@ -19,6 +31,8 @@ class InterviewPipeline:
         # Extract components from raw data
         dqi_data = data.get("dqi_calculation", {})
         audit_logs = data.get("audit_log", [])
+        # [NEW] Typed observer records (parsed once); older callers only have audit metadata
+        evaluations: Optional[List[ObserverEvaluation]] = data.get("evaluations")
         
         # 1. Executive Block Logic (Inferred from DQI)
         # Fix: DQI schema uses 'overall_score', not 'dqi_score'
@@ -29,7 +43,7 @@ class InterviewPipeline:
         reason = "Automated assessment based on DQI score."
 
         # 2. Build the Timeline from Audit Logs
-        timeline = []
+        timed = []  # (timestamp, TimelineEvent)
         start_time = 0
         for event in audit_logs:
             if event["event_type"] == "INTERVIEW_START":
@@ -41,29 +55,28 @@ class InterviewPipeline:
                 # Logic to infer generic score if not an evaluation
                 handling_score = 5 
                 
-                timeline.append(TimelineEvent(
+                timed.append((event["timestamp"], TimelineEvent(
                     time=f"{rel_time}s",
                     action=event.get("actor", "System"),
                     state_change=event.get("event_type", ""),
                     evaluation="Event Logged",
                     pressure_handling_score=handling_score,
                     sentiment_score=handling_score # [NEW] Default sentiment to handling score
-                ))
+                )))
 
             # [NEW] Add Observer Evaluations to Timeline for Graph Data
-            elif event["event_type"] == "EVALUATION_COMPLETE":
+            elif event["event_type"] == "EVALUATION_COMPLETE" and evaluations is None:
                 rel_time = int(event["timestamp"] - start_time) if start_time else 0
-                meta = event.get("metadata", {})
-                score = meta.get("score", 0) 
-                
-                timeline.append(TimelineEvent(
-                    time=f"{rel_time}s",
-                    action="Observer",
-                    state_change="Graded Performance",
-                    evaluation=f"Score: {score}",
-                    pressure_handling_score=int(score),
-                    sentiment_score=int(score) # [NEW] Use evaluation score as sentiment proxy
-                ))
+                score = event.get("metadata", {}).get("score", 0) 
+                timed.append((event["timestamp"], _evaluation_event(rel_time, score)))
+
+        for record in evaluations or []:
+            ts = record.timestamp if record.timestamp is not None else start_time
+            rel_time = int(ts - start_time) if start_time else 0
+            timed.append((ts, _evaluation_event(rel_time, record.score)))
+
+        timed.sort(key=lambda item: item[0] or 0)
+        timeline = [event for _, event in timed]
 
         # 3. DQI Breakdown
         # We need to map the DQI object to DQIBreakdown
@@ -109,15 +122,18 @@ class InterviewPipeline:
             panel_confidence="85%"
         )
 
-        # 8. Extract FAANG Evaluation from Observer logs
+        # 8. FAANG Evaluation: latest rubric grid from the observer
         faang_grid = {}
-        for event in audit_logs:
-             # Check distinct keys for actor/event_type depending on audit log structure
-             # Assuming standard structure from audit_logger.py
-             if event.get("actor") == "ObserverAgent" and event.get("event_type") == "EVALUATION_COMPLETE":
-                 meta = event.get("metadata", {})
-                 if "faang_evaluation" in meta:
-                     faang_grid = meta["faang_evaluation"]
+        if evaluations is not None:
+            for record in evaluations:
+                if record.ratings:
+                    faang_grid = record.ratings
+        else:
+            for event in audit_logs:
+                 if event.get("actor") == "ObserverAgent" and event.get("event_type") == "EVALUATION_COMPLETE":
+                     meta = event.get("metadata", {})
+                     if "faang_evaluation" in meta:
+                         faang_grid = meta["faang_evaluation"]
 
         # Assemble the Final Report
         return FSIR(
@@ -0,0 +1,226 @@
+"""
+On-demand Report Cache
+Renders FSIR PDFs lazily for /download-report.
+
+If the agent died before its report job ran, or only the FSIR JSON
+survived, the gateway renders the PDF from the stored FSIR on the first
+download:
+
+    report_cache/<sha256 of FSIR JSON>.pdf
+
+The FSIR content hash is the cache key: an unchanged FSIR is never rendered
+twice, and a re-scored FSIR (see app/analysis/rescore.py) gets a fresh PDF.
+Concurrent downloads of the same report share one render. The ETag is always
+the hash of the PDF bytes served, whether the worker or the cache wrote them.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from app.analysis.report_jobs import (
+    JOB_DONE,
+    REPORT_JOBS_DIR,
+    REPORTS_DIR,
+    SESSIONS_DIR,
+    _write_bytes_atomic,
+    clean_candidate_id,
+    file_sha256,
+)
+from app.analysis.session_archive import MEMBER_FSIR, SessionArchive, read_json
+
+logger = logging.getLogger("aegis.analysis.report_cache")
+
+REPORT_CACHE_DIR = Path(os.getenv("AEGIS_REPORT_CACHE_DIR", "report_cache"))
+INDEX_REFRESH_SECONDS = float(os.getenv("AEGIS_FSIR_INDEX_REFRESH", "60"))
+
+
+def _direct_fsir(candidate_id: str) -> Optional[Path]:
+    """FSIR stored under the ID itself (session archive or pre-archive report); two stat calls."""
+    archived = SessionArchive(SESSIONS_DIR / candidate_id).path(MEMBER_FSIR)
+    if archived.exists():
+        return archived
+    direct = REPORTS_DIR / f"fsir_{candidate_id}.json"
+    return direct if direct.exists() else None
+
+
+def scan_fsir_index() -> Dict[str, Path]:
+    """
+    candidate_id -> newest FSIR, from finished report jobs (they record the
+    candidate) and pre-archive fsir_<id>.json files. O(number of reports):
+    run it in an executor, not on the event loop.
+    """
+    index: Dict[str, Path] = {}
+    found = []  # (mtime, candidate_id, fsir_path)
+
+    done_dir = REPORT_JOBS_DIR / JOB_DONE
+    if done_dir.exists():
+        for path in done_dir.glob("*.json"):
+            try:
+                with open(path) as f:
+                    result = json.load(f)
+                mtime = path.stat().st_mtime
+            except (OSError, json.JSONDecodeError):
+                continue
+            if result.get("candidate_id") and result.get("fsir_path"):
+                found.append((mtime, clean_candidate_id(result["candidate_id"]), Path(result["fsir_path"])))
+
+    # Legacy reports: the candidate is only inside the JSON
+    for path in REPORTS_DIR.glob("fsir_*.json"):
+        if path.stem.endswith("_timing"):
+            continue
+        try:
+            with open(path) as f:
+                fsir = json.load(f)
+            mtime = path.stat().st_mtime
+        except (OSError, json.JSONDecodeError):
+            continue
+        if fsir.get("candidate_id"):
+            found.append((mtime, clean_candidate_id(fsir["candidate_id"]), path))
+
+    for _, candidate_id, fsir_path in sorted(found, key=lambda x: x[0]):
+        index[candidate_id] = fsir_path  # Newest wins
+    return index
+
+
+def render_fsir_pdf(fsir_path: str, pdf_path: str) -> str:
+    """Render one stored FSIR JSON to PDF (runs in an executor)."""
+    from app.analysis.pdf_generator import PDFReportGenerator
+
+    fsir = read_json(Path(fsir_path))
+    _write_bytes_atomic(Path(pdf_path), PDFReportGenerator().generate_report_bytes(fsir))
+    return pdf_path
+
+
+class ReportCache:
+    """Content-addressed PDF cache with single-flight rendering."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, executor: Optional[Executor] = None):
+        self.cache_dir = cache_dir or REPORT_CACHE_DIR
+        self.executor = executor  # None = default thread pool
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._etags: Dict[Tuple[str, float, int], str] = {}  # (path, mtime, size) -> sha
+        self._fsir_index: Dict[str, Path] = {}  # candidate_id -> FSIR
+        self._index_built_at: Optional[float] = None
+        self._index_task: Optional[asyncio.Future] = None
+        self.renders = 0
+
+    def index_fsir(self, candidate_id: str, fsir_path: str):
+        """Record a finished report (called by the gateway when a job completes)."""
+        if candidate_id and fsir_path:
+            self._fsir_index[clean_candidate_id(candidate_id)] = Path(fsir_path)
+
+    async def _refresh_index(self):
+        """Rescan reports off the event loop, at most every INDEX_REFRESH_SECONDS (concurrent misses share one scan)."""
+        if self._index_built_at is not None and time.monotonic() - self._index_built_at < INDEX_REFRESH_SECONDS:
+            return
+        if self._index_task is None or self._index_task.done():
+            loop = asyncio.get_running_loop()
+            self._index_task = asyncio.ensure_future(loop.run_in_executor(None, scan_fsir_index))
+            self._index_task.add_done_callback(self._on_index_scanned)
+        await asyncio.shield(self._index_task)
+
+    def _on_index_scanned(self, task: asyncio.Future):
+        if task.cancelled() or task.exception() is not None:
+            return  # Retried on the next miss
+        self._fsir_index.update(task.result())
+        self._index_built_at = time.monotonic()
+
+    async def find_fsir(self, candidate_id: str) -> Optional[Path]:
+        """
+        Stored FSIR for a candidate (or session) ID: the session archive, then
+        the candidate index. A miss rescans (in an executor) only if the index
+        is stale, so unknown IDs never cost a scan per request.
+        """
+        wanted = clean_candidate_id(candidate_id)
+        direct = _direct_fsir(wanted)
+        if direct is not None:
+            return direct
+        path = self._fsir_index.get(wanted)
+        if path is None or not path.exists():
+            await self._refresh_index()
+            path = self._fsir_index.get(wanted)
+        return path if path is not None and path.exists() else None
+
+    async def content_hash(self, path: Path) -> str:
+        """sha256 of a file, memoized on (path, mtime, size)."""
+        st = path.stat()
+        key = (str(path), st.st_mtime, st.st_size)
+        if key not in self._etags:
+            loop = asyncio.get_running_loop()
+            self._etags[key] = await loop.run_in_executor(None, file_sha256, path)
+        return self._etags[key]
+
+    async def get_pdf(self, fsir_path: Path) -> Tuple[Path, str]:
+        """
+        PDF for a stored FSIR, rendering it if not cached yet.
+
+        Returns:
+            (pdf_path, content_hash of the PDF)
+        """
+        sha = await self.content_hash(fsir_path)
+        pdf_path = self.cache_dir / f"{sha}.pdf"
+        if pdf_path.exists():
+            return pdf_path, await self.content_hash(pdf_path)
+
+        future = self._inflight.get(sha)
+        if future is None:
+            logger.info(f">>> [REPORT] Rendering {fsir_path.name} on demand ({sha[:12]})")
+            loop = asyncio.get_running_loop()
+            future = asyncio.ensure_future(
+                loop.run_in_executor(self.executor, render_fsir_pdf, str(fsir_path), str(pdf_path))
+            )
+            self._inflight[sha] = future
+            future.add_done_callback(lambda _: self._inflight.pop(sha, None))
+            self.renders += 1
+        await asyncio.shield(future)  # A disconnecting client must not cancel the shared render
+        return pdf_path, await self.content_hash(pdf_path)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Single byte range from a Range header as (start, end) inclusive.
+
+    Returns None for no / unsupported header (serve the whole file).
+
+    Raises:
+        ValueError: if the range is not satisfiable
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_s, _, end_s = header[len("bytes="):].strip().partition("-")
+    try:
+        if start_s:
+            start = int(start_s)
+            end = int(end_s) if end_s else size - 1
+        else:
+            suffix = int(end_s)  # "bytes=-500": last 500 bytes
+            if suffix <= 0:
+                raise ValueError("empty suffix range")
+            start, end = max(size - suffix, 0), size - 1
+    except ValueError as e:
+        raise ValueError(f"bad range {header!r}") from e
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        raise ValueError(f"range {header!r} outside {size} bytes")
+    return start, end
+
+
+def iter_file(path: Path, start: int, end: int, chunk_size: int = 1 << 16):
+    """Bytes start..end (inclusive) of a file in chunks."""
+    remaining = end - start + 1
+    with open(path, "rb") as f:
+        f.seek(start)
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+report_cache = ReportCache()
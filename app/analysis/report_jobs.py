@@ -0,0 +1,480 @@
+"""
+Report Jobs
+Moves end-of-interview report generation out of the voice worker.
+
+The agent's shutdown callback only persists the raw session bundle (audit log
++ observer evaluations) and enqueues a report job. A local ReportWorkerPool
+(started by the API gateway, or standalone via `python -m app.analysis.report_jobs`)
+picks jobs up, computes DQI, builds the FSIR, renders the PDF in worker
+processes and notifies the gateway.
+
+Session data (bundle, questions log, FSIR) is stored in the compressed
+per-session archive (see app/analysis/session_archive.py).
+
+Outputs are idempotent per session: files are written atomically under
+fixed names (fsir.json.gz / fsir_<session_id>.pdf), and a job whose bundle content
+hash matches the last successful render is completed without re-rendering,
+so re-enqueues and restarts are cheap.
+
+The queue is a directory of small JSON job files so it survives restarts
+and needs no broker:
+    report_jobs/pending/<session_id>.json      waiting
+    report_jobs/processing/<session_id>.json   claimed (atomic rename)
+    report_jobs/done/<session_id>.json         result (paths, timings)
+    report_jobs/failed/<session_id>.json       error
+
+Several pools may share the directory. A claim records its owner and the
+owning pool touches it every poll, so only claims whose heartbeat is older
+than CLAIM_STALE_SECONDS (the pool died mid-report) go back to pending.
+"""
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import os
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.analysis.session_archive import MEMBER_BUNDLE, MEMBER_FSIR, MEMBER_QUESTIONS, SessionArchive, read_json
+from app.core.shared import UPLOADS_DIR
+
+logger = logging.getLogger("aegis.analysis.report_jobs")
+
+SESSIONS_DIR = Path(os.getenv("AEGIS_SESSIONS_DIR", "sessions"))
+REPORT_JOBS_DIR = Path(os.getenv("AEGIS_REPORT_JOBS_DIR", "report_jobs"))
+REPORTS_DIR = Path(os.getenv("AEGIS_REPORTS_DIR", "."))  # Pre-archive fsir_<id>.json reports
+CLAIM_STALE_SECONDS = float(os.getenv("AEGIS_REPORT_CLAIM_STALE", "120"))
+BUNDLE_VERSION = 3  # v3: gzipped archive member; v2: evaluations are compact dicts (ObserverEvaluation.to_dict), v1 raw strings
+
+JOB_PENDING = "pending"
+JOB_PROCESSING = "processing"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_STATES = (JOB_PENDING, JOB_PROCESSING, JOB_DONE, JOB_FAILED)
+
+
+def _write_json_atomic(path: Path, data: Dict[str, Any], indent: Optional[int] = None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=indent, separators=None if indent else (",", ":"), default=str)
+    os.replace(tmp, path)
+
+
+def _write_bytes_atomic(path: Path, data: bytes):
+    """Readers (downloads, status checks) never see a half-written report."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def clean_candidate_id(candidate_id: str) -> str:
+    """
+    Bare upload ID from job metadata, the key /download-report/{candidate_id} uses:
+    "audit:uploads/1a2b3c4d_audit.json" -> "1a2b3c4d" (a bare ID is returned as-is).
+    """
+    name = Path(str(candidate_id).replace("audit:", "").strip()).name
+    return name[:-len("_audit.json")] if name.endswith("_audit.json") else name
+
+
+def _job_path(state: str, session_id: str) -> Path:
+    return REPORT_JOBS_DIR / state / f"{session_id}.json"
+
+
+# =======================================================================
+# Agent side: persist + enqueue (cheap, runs in the shutdown callback)
+# =======================================================================
+
+def save_session_bundle(
+    session_id: str,
+    candidate_id: str,
+    started_at: datetime,
+    audit_log: List[Dict[str, Any]],
+    evaluations: List[Dict[str, Any]],
+    questions_log_path: Optional[str] = None,
+    dqi: Optional[Dict[str, Any]] = None,
+    questions: Optional[Dict[str, Any]] = None
+) -> Path:
+    """
+    Persist the raw session data needed to build the report later.
+
+    `questions` (QuestionsLogger.export_json()) is archived next to the bundle.
+
+    Returns:
+        Path of the bundle archive member
+    """
+    archive = session_archive(session_id)
+    if questions is not None:
+        questions_log_path = str(archive.write(MEMBER_QUESTIONS, questions))
+    bundle = {
+        "bundle_version": BUNDLE_VERSION,
+        "session_id": session_id,
+        "candidate_id": candidate_id,
+        "timestamp": started_at.isoformat(),
+        "audit_log": audit_log,
+        "evaluations": evaluations,  # Observer records, scored by the report worker
+        "questions_log": questions_log_path,
+        "dqi": dqi,  # Snapshot of the live DQI; recomputed from evaluations if missing
+    }
+    path = archive.write(MEMBER_BUNDLE, bundle)
+    logger.info(f">>> [REPORT] Session bundle saved: {path} ({len(audit_log)} events, {len(evaluations)} evaluations)")
+    return path
+
+
+def enqueue_report_job(session_id: str, bundle_path: Path) -> Path:
+    """
+    Queue report generation for a saved bundle (idempotent per session).
+
+    Any earlier result / failure is cleared so status reflects this job; the
+    last result travels with the job so an unchanged bundle is not re-rendered.
+    """
+    job = {
+        "session_id": session_id,
+        "bundle_path": str(bundle_path),
+        "enqueued_at": time.time(),
+    }
+    done = _job_path(JOB_DONE, session_id)
+    try:
+        with open(done) as f:
+            job["previous"] = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    done.unlink(missing_ok=True)
+    _job_path(JOB_FAILED, session_id).unlink(missing_ok=True)
+    path = _job_path(JOB_PENDING, session_id)
+    _write_json_atomic(path, job)
+    logger.info(f">>> [REPORT] Report job enqueued: {session_id}")
+    return path
+
+
+def save_live_score(session_id: str, live: Dict[str, Any]) -> Path:
+    """Current running DQI, read by the gateway's live-score endpoint."""
+    path = SESSIONS_DIR / session_id / "live_score.json"
+    _write_json_atomic(path, {**live, "updated_at": time.time()})
+    return path
+
+
+def load_live_score(session_id: str) -> Optional[Dict[str, Any]]:
+    path = SESSIONS_DIR / session_id / "live_score.json"
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def session_archive(session_id: str) -> SessionArchive:
+    return SessionArchive(SESSIONS_DIR / session_id)
+
+
+def load_session_bundle(bundle_path: Path) -> Dict[str, Any]:
+    """Bundle from an archive member (bundle.json.gz) or a pre-archive bundle.json."""
+    return read_json(bundle_path)
+
+
+# =======================================================================
+# Worker side: the actual report (runs in a pool process)
+# =======================================================================
+
+def _warm_worker():
+    """Pool initializer: import ReportLab and build the shared report templates once per process."""
+    from app.analysis.pdf_generator import get_report_templates
+
+    get_report_templates()
+
+
+def generate_report(bundle_path: str, output_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build DQI, FSIR JSON and PDF for one session bundle.
+
+    The FSIR goes into the session archive; the PDF next to it unless
+    output_dir is given.
+
+    Returns:
+        Result dict with output paths and per-stage timings
+    """
+    from app.analysis.dqi_calculator import dqi_calculator
+    from app.analysis.evaluations import ObserverEvaluation
+    from app.analysis.pipeline import InterviewPipeline
+    from app.analysis.pdf_generator import PDFReportGenerator
+
+    timings = {}
+    started = time.perf_counter()
+    bundle_sha = file_sha256(Path(bundle_path))
+    bundle = load_session_bundle(Path(bundle_path))
+    session_id = bundle["session_id"]
+
+    t = time.perf_counter()
+    # Parsed once; v1 bundles hold raw LLM strings
+    records = [r for r in map(ObserverEvaluation.parse, bundle.get("evaluations", [])) if r is not None]
+    dqi_data = bundle.get("dqi") or dqi_calculator.calculate_score(session_id, records).model_dump()
+    timings["dqi_s"] = time.perf_counter() - t
+
+    raw_data = {
+        "session_id": session_id,
+        "timestamp": bundle.get("timestamp"),
+        "candidate_id": bundle.get("candidate_id"),
+        "dqi_calculation": dqi_data,
+        "audit_log": bundle.get("audit_log", []),
+        "evaluations": records,
+    }
+
+    t = time.perf_counter()
+    fsir_report = InterviewPipeline().generate_detailed_report(session_id, raw_data)
+    fsir_path = session_archive(session_id).write_model(MEMBER_FSIR, fsir_report)
+    timings["fsir_s"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    pdf_bytes = PDFReportGenerator().generate_report_bytes(fsir_report.model_dump())
+    pdf_path = (Path(output_dir) if output_dir else SESSIONS_DIR / session_id) / f"fsir_{session_id}.pdf"
+    _write_bytes_atomic(pdf_path, pdf_bytes)
+
+    # Same PDF under the candidate ID for /download-report
+    api_pdf_path = None
+    candidate_id = bundle.get("candidate_id")
+    if candidate_id:
+        clean_id = clean_candidate_id(candidate_id)
+        UPLOADS_DIR.mkdir(exist_ok=True)
+        api_pdf_path = UPLOADS_DIR / f"fsir_{clean_id}.pdf"
+        _write_bytes_atomic(api_pdf_path, pdf_bytes)
+    timings["pdf_s"] = time.perf_counter() - t
+    timings["total_s"] = time.perf_counter() - started
+
+    return {
+        "session_id": session_id,
+        "candidate_id": candidate_id,
+        "overall_score": dqi_data.get("overall_score"),
+        "fsir_path": str(fsir_path),
+        "pdf_path": str(pdf_path),
+        "api_pdf_path": str(api_pdf_path) if api_pdf_path else None,
+        "bundle_sha": bundle_sha,
+        "timings": {k: round(v, 3) for k, v in timings.items()},
+    }
+
+
+def _previous_render(
+    session_id: str, bundle_path: str, previous: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Last successful result (carried by the job, else done/) if it was rendered
+    from this exact bundle and its outputs still exist.
+    """
+    try:
+        if previous is None:
+            with open(_job_path(JOB_DONE, session_id)) as f:
+                previous = json.load(f)
+        if previous.get("bundle_sha") != file_sha256(Path(bundle_path)):
+            return None
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    result = {k: v for k, v in previous.items() if k not in ("status", "cached", "queued_s")}
+    outputs = [result.get("fsir_path"), result.get("pdf_path")]
+    return result if all(p and Path(p).exists() for p in outputs) else None
+
+
+# =======================================================================
+# Pool
+# =======================================================================
+
+class ReportWorkerPool:
+    """
+    Polls the job directory and renders reports in a process pool.
+
+    Args:
+        max_workers: Report processes (ReportLab rendering is CPU bound)
+        poll_interval: Seconds between scans of the pending directory
+        on_complete: Called with the result (or error) dict of each job; may be async
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        poll_interval: float = 1.0,
+        on_complete: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        webhook_url: Optional[str] = None
+    ):
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.on_complete = on_complete
+        self.webhook_url = webhook_url or os.getenv("AEGIS_REPORT_WEBHOOK")
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+        self._running: Dict[str, asyncio.Future] = {}  # session_id -> job (one claim per session)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    async def start(self):
+        for state in JOB_STATES:
+            (REPORT_JOBS_DIR / state).mkdir(parents=True, exist_ok=True)
+
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_warm_worker)
+        self._task = asyncio.create_task(self._poll_loop())
+        logger.info(f">>> [REPORT] Worker pool started ({self.max_workers} processes)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def _poll_loop(self):
+        while True:
+            try:
+                self._heartbeat()
+                self._requeue_stale_claims()
+                self._claim_jobs()
+            except Exception as e:
+                logger.error(f">>> [REPORT] Poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def _heartbeat(self):
+        """Touch our claims so other pools can tell them from abandoned ones."""
+        for session_id in self._running:
+            try:
+                os.utime(_job_path(JOB_PROCESSING, session_id))
+            except FileNotFoundError:
+                pass
+
+    def _requeue_stale_claims(self):
+        """Claims whose owner stopped heartbeating (pool died mid-report) go back to pending."""
+        now = time.time()
+        for claimed in (REPORT_JOBS_DIR / JOB_PROCESSING).glob("*.json"):
+            if claimed.stem in self._running:
+                continue
+            try:
+                if now - claimed.stat().st_mtime < CLAIM_STALE_SECONDS:
+                    continue
+                pending = REPORT_JOBS_DIR / JOB_PENDING / claimed.name
+                if pending.exists():
+                    claimed.unlink()  # Re-enqueued meanwhile: the newer job wins
+                else:
+                    os.replace(claimed, pending)
+            except FileNotFoundError:
+                continue  # Finished or re-queued by another pool
+            logger.warning(f">>> [REPORT] Re-queued interrupted job: {claimed.stem}")
+
+    def _claim_jobs(self):
+        free = self.max_workers - len(self._running)
+        if free <= 0:
+            return
+        pending = sorted((REPORT_JOBS_DIR / JOB_PENDING).glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for job_file in pending:
+            if free <= 0:
+                break
+            claimed = REPORT_JOBS_DIR / JOB_PROCESSING / job_file.name
+            if job_file.stem in self._running or claimed.exists():
+                continue  # Re-enqueued while rendering: picked up once the current render finishes
+            try:
+                os.utime(job_file)  # Fresh heartbeat from the moment the claim exists
+                os.replace(job_file, claimed)  # Atomic claim
+                with open(claimed) as f:
+                    job = json.load(f)
+            except FileNotFoundError:
+                continue  # Claimed by another pool
+            _write_json_atomic(claimed, {**job, "claimed_by": self.owner, "claimed_at": time.time()})
+            session_id = job["session_id"]
+            self._running[session_id] = asyncio.create_task(self._run_job(session_id, job, claimed))
+            free -= 1
+
+    async def _run_job(self, session_id: str, job: Dict[str, Any], claimed: Path):
+        loop = asyncio.get_running_loop()
+        queued_s = time.time() - job.get("enqueued_at", time.time())
+        try:
+            # Idempotent: an unchanged bundle is not rendered twice (hashing runs off the event loop)
+            previous = await loop.run_in_executor(None, _previous_render, session_id, job["bundle_path"], job.get("previous"))
+            if previous is not None:
+                result = {**previous, "cached": True}
+                logger.info(f">>> [REPORT] {session_id} unchanged since last render, reusing outputs")
+            else:
+                result = await loop.run_in_executor(self._executor, generate_report, job["bundle_path"])
+                logger.info(f">>> [REPORT] {session_id} done in {result['timings']['total_s']}s (queued {queued_s:.1f}s)")
+            result["status"] = JOB_DONE
+            result["queued_s"] = round(queued_s, 3)
+            _write_json_atomic(_job_path(JOB_DONE, session_id), result)
+            _job_path(JOB_FAILED, session_id).unlink(missing_ok=True)
+        except Exception as e:
+            result = {"session_id": session_id, "status": JOB_FAILED, "error": str(e)}
+            _write_json_atomic(_job_path(JOB_FAILED, session_id), result)
+            _job_path(JOB_DONE, session_id).unlink(missing_ok=True)
+            logger.error(f">>> [REPORT] {session_id} failed: {e}")
+        finally:
+            claimed.unlink(missing_ok=True)
+            self._running.pop(session_id, None)
+
+        await self._notify(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**queue_stats(), "workers": self.max_workers, "rendering": sorted(self._running)}
+
+    async def _notify(self, result: Dict[str, Any]):
+        if self.on_complete:
+            try:
+                outcome = self.on_complete(result)
+                if inspect.isawaitable(outcome):
+                    await outcome
+            except Exception as e:
+                logger.error(f">>> [REPORT] on_complete callback failed: {e}")
+
+        if self.webhook_url:
+            try:
+                import httpx
+
+                async with httpx.AsyncClient(timeout=5.0) as client:
+                    await client.post(self.webhook_url, json=result)
+            except Exception as e:
+                logger.warning(f">>> [REPORT] Webhook notify failed: {e}")
+
+
+def queue_stats() -> Dict[str, int]:
+    """Job counts per state."""
+    return {
+        state: sum(1 for p in (REPORT_JOBS_DIR / state).glob("*.json")) if (REPORT_JOBS_DIR / state).exists() else 0
+        for state in JOB_STATES
+    }
+
+
+def get_report_status(session_id: str) -> Dict[str, Any]:
+    """Job state for a session, read from the job directory (a queued job wins over an old result)."""
+    for state in (JOB_PENDING, JOB_PROCESSING, JOB_DONE, JOB_FAILED):
+        path = _job_path(state, session_id)
+        if path.exists():
+            if state in (JOB_DONE, JOB_FAILED):
+                with open(path) as f:
+                    return json.load(f)
+            return {"session_id": session_id, "status": state}
+    return {"session_id": session_id, "status": "unknown"}
+
+
+async def _run_forever():
+    pool = ReportWorkerPool(max_workers=int(os.getenv("AEGIS_REPORT_WORKERS", "2")))
+    await pool.start()
+    try:
+        await asyncio.Future()
+    finally:
+        await pool.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run_forever())
@@ -0,0 +1,285 @@
+"""
+Bulk Re-scoring
+Recomputes DQI + FSIR for stored interview sessions after the scoring logic
+(DQICalculator, InterviewPipeline, evaluation parsing) changes.
+
+Stored observer outputs are replayed as-is; no LLM is called. Sources:
+- sessions/<id>/bundle.json.gz  full replay (audit log + every observer evaluation);
+                              bundle.json for sessions saved before the archive format
+- fsir_<id>.json              legacy reports written before session bundles existed;
+                              only the observer scores kept in the report timeline
+                              and the last rubric grid survive, so the replay is lossy
+
+Sessions are scored in a process pool. Each finished session is appended to
+<output>/rescore_manifest.jsonl. A re-run skips sessions whose source file
+and scoring code are unchanged, so an interrupted run resumes where it stopped.
+
+Usage:
+    python -m app.analysis.rescore [paths ...] [--output rescored] [--workers 4] [--pdf] [--force]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.analysis.report_jobs import SESSIONS_DIR
+from app.analysis.session_archive import read_json
+
+logger = logging.getLogger("aegis.analysis.rescore")
+
+MANIFEST_NAME = "rescore_manifest.jsonl"
+SOURCE_BUNDLE = "bundle"
+SOURCE_FSIR = "fsir"
+
+# Modules whose source defines the score; changing any of them invalidates the manifest
+SCORING_MODULES = (
+    "app.analysis.evaluations",
+    "app.analysis.dqi_calculator",
+    "app.analysis.pipeline",
+    "app.analysis.schemas",
+)
+
+
+def scoring_version() -> str:
+    """Short hash of the scoring code."""
+    import importlib
+
+    digest = hashlib.sha256()
+    for name in SCORING_MODULES:
+        module = importlib.import_module(name)
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()[:12]
+
+
+# =======================================================================
+# Discovery
+# =======================================================================
+
+def discover_sessions(paths: Iterable[Path], exclude: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """
+    Session sources under the given files / directories (skipping anything
+    under `exclude`, i.e. our own output). A session with both a bundle and a
+    legacy FSIR is replayed from the bundle.
+    """
+    found: Dict[str, Dict[str, Any]] = {}
+    excluded = exclude.resolve() if exclude else None
+    for root in paths:
+        candidates = [root] if root.is_file() else (
+            list(root.rglob("bundle.json")) + list(root.rglob("bundle.json.gz")) + list(root.rglob("fsir_*.json"))
+        )
+        for path in candidates:
+            if excluded and excluded in path.resolve().parents:
+                continue
+            if path.name in ("bundle.json", "bundle.json.gz"):
+                session_id, kind = path.parent.name, SOURCE_BUNDLE
+            elif path.name.startswith("fsir_") and path.suffix == ".json" and not path.stem.endswith("_timing"):
+                session_id, kind = path.stem[len("fsir_"):], SOURCE_FSIR
+            else:
+                continue
+            if session_id in found and found[session_id]["kind"] == SOURCE_BUNDLE and not path.name.endswith(".gz"):
+                continue
+            found[session_id] = {"session_id": session_id, "kind": kind, "path": str(path), "mtime": path.stat().st_mtime}
+    return sorted(found.values(), key=lambda s: s["session_id"])
+
+
+def load_manifest(output_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """Latest manifest entry per session."""
+    entries: Dict[str, Dict[str, Any]] = {}
+    path = output_dir / MANIFEST_NAME
+    if not path.exists():
+        return entries
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Torn last line from an interrupted run
+            entries[entry["session_id"]] = entry
+    return entries
+
+
+def is_current(entry: Optional[Dict[str, Any]], source: Dict[str, Any], version: str) -> bool:
+    return (
+        entry is not None
+        and entry.get("status") == "ok"
+        and entry.get("source_mtime") == source["mtime"]
+        and entry.get("scoring_version") == version
+    )
+
+
+# =======================================================================
+# Replay (runs in a pool process)
+# =======================================================================
+
+def _evaluations_from_fsir(fsir: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Observer scores recorded in a legacy FSIR timeline (+ the final rubric grid)."""
+    evaluations = []
+    for event in fsir.get("crisis_timeline", []):
+        if event.get("action") == "Observer" and str(event.get("evaluation", "")).startswith("Score:"):
+            try:
+                evaluations.append({"score": float(event["evaluation"].split(":", 1)[1])})
+            except ValueError:
+                continue
+    if evaluations and fsir.get("faang_evaluation"):
+        evaluations[-1]["faang_evaluation"] = fsir["faang_evaluation"]
+    return evaluations
+
+
+def rescore_session(source: Dict[str, Any], output_dir: str, render_pdf: bool = False) -> Dict[str, Any]:
+    """Replay one session through DQICalculator and InterviewPipeline."""
+    from app.analysis.dqi_calculator import dqi_calculator
+    from app.analysis.evaluations import ObserverEvaluation
+    from app.analysis.pipeline import InterviewPipeline
+
+    timings = {}
+    started = time.perf_counter()
+    session_id = source["session_id"]
+
+    t = time.perf_counter()
+    data = read_json(Path(source["path"]))
+    if source["kind"] == SOURCE_BUNDLE:
+        raw_evaluations = data.get("evaluations", [])
+        audit_log = data.get("audit_log", [])
+        old_score = (data.get("dqi") or {}).get("overall_score")
+        candidate_id, timestamp = data.get("candidate_id") or "unknown", data.get("timestamp")
+    else:
+        raw_evaluations = _evaluations_from_fsir(data)
+        audit_log = []
+        old_score = (data.get("dqi_breakdown") or {}).get("score")
+        candidate_id, timestamp = data.get("candidate_id") or "unknown", None
+    records = [r for r in map(ObserverEvaluation.parse, raw_evaluations) if r is not None]
+    timings["load_s"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    dqi_data = dqi_calculator.calculate_score(session_id, records).model_dump()
+    timings["dqi_s"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    raw_data = {
+        "session_id": session_id,
+        "timestamp": timestamp,
+        "candidate_id": candidate_id,
+        "dqi_calculation": dqi_data,
+        "audit_log": audit_log,
+        "evaluations": records,
+    }
+    fsir_report = InterviewPipeline().generate_detailed_report(session_id, raw_data)
+    fsir_path = Path(output_dir) / f"fsir_{session_id}.json"
+    with open(fsir_path, "w") as f:
+        f.write(fsir_report.model_dump_json(indent=2))
+    timings["fsir_s"] = time.perf_counter() - t
+
+    pdf_path = None
+    if render_pdf:
+        from app.analysis.pdf_generator import PDFReportGenerator
+
+        t = time.perf_counter()
+        pdf_path = Path(output_dir) / f"fsir_{session_id}.pdf"
+        with open(pdf_path, "wb") as f:
+            f.write(PDFReportGenerator().generate_report_bytes(fsir_report.model_dump()))
+        timings["pdf_s"] = time.perf_counter() - t
+    timings["total_s"] = time.perf_counter() - started
+
+    return {
+        "session_id": session_id,
+        "status": "ok",
+        "source": source["kind"],
+        "evaluations": len(records),
+        "old_score": old_score,
+        "new_score": dqi_data.get("overall_score"),
+        "fsir_path": str(fsir_path),
+        "pdf_path": str(pdf_path) if pdf_path else None,
+        "timings": {k: round(v, 4) for k, v in timings.items()},
+    }
+
+
+# =======================================================================
+# Driver
+# =======================================================================
+
+def rescore_all(
+    paths: Iterable[Path],
+    output_dir: Path,
+    workers: int = 4,
+    render_pdf: bool = False,
+    force: bool = False,
+    progress=None
+) -> Dict[str, Any]:
+    """
+    Re-score every discovered session not already current in the manifest.
+
+    Returns:
+        Run summary (counts, failures, wall time)
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    version = scoring_version()
+    sources = discover_sessions(paths, exclude=output_dir)
+    manifest = {} if force else load_manifest(output_dir)
+    todo = [s for s in sources if not is_current(manifest.get(s["session_id"]), s, version)]
+    skipped = len(sources) - len(todo)
+
+    started = time.perf_counter()
+    done = failed = 0
+    with open(output_dir / MANIFEST_NAME, "a") as manifest_file, \
+            ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(rescore_session, s, str(output_dir), render_pdf): s for s in todo}
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                result = future.result()
+                done += 1
+            except Exception as e:
+                result = {"session_id": source["session_id"], "status": "failed", "error": str(e)}
+                failed += 1
+            result.update(source_mtime=source["mtime"], scoring_version=version)
+            manifest_file.write(json.dumps(result, separators=(",", ":")) + "\n")
+            manifest_file.flush()  # Each finished session survives an interrupted run
+            if progress:
+                progress(done + failed, len(todo), result)
+
+    return {
+        "discovered": len(sources),
+        "skipped": skipped,
+        "rescored": done,
+        "failed": failed,
+        "scoring_version": version,
+        "wall_s": round(time.perf_counter() - started, 3),
+    }
+
+
+def _print_progress(n: int, total: int, result: Dict[str, Any]):
+    if result["status"] == "ok":
+        print(
+            f"[{n}/{total}] {result['session_id']}: {result['old_score']} -> {result['new_score']} "
+            f"({result['evaluations']} evals, {result['timings']['total_s'] * 1000:.0f}ms, {result['source']})",
+            file=sys.stderr
+        )
+    else:
+        print(f"[{n}/{total}] {result['session_id']}: FAILED {result['error']}", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Re-score stored interview sessions (no LLM calls).")
+    parser.add_argument("paths", nargs="*", type=Path, help=f"Bundles, FSIR files or directories (default: {SESSIONS_DIR} + ./fsir_*.json)")
+    parser.add_argument("--output", type=Path, default=Path("rescored"), help="Output directory for reports + manifest")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--pdf", action="store_true", help="Also render PDFs")
+    parser.add_argument("--force", action="store_true", help="Ignore the manifest and re-score everything")
+    args = parser.parse_args(argv)
+
+    # Reports were historically written to the working directory
+    paths = [p for p in (args.paths or [SESSIONS_DIR, *Path(".").glob("fsir_*.json")]) if p.exists()]
+    summary = rescore_all(paths, args.output, workers=args.workers, render_pdf=args.pdf, force=args.force, progress=_print_progress)
+    print(json.dumps(summary, indent=2))
+    return 0 if not summary["failed"] else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
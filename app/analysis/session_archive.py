@@ -0,0 +1,131 @@
+"""
+Session Archive
+Compact, compressed per-session storage for everything an interview leaves behind.
+
+    sessions/<session_id>/
+        bundle.json.gz      audit events + observer evaluations + DQI snapshot (agent)
+        questions.json.gz   questions log (agent)
+        fsir.json.gz        FSIR report (report worker)
+        fsir_<id>.pdf       rendered report (report worker)
+
+Members are compact JSON (orjson when available), streamed through gzip
+into a temp file and renamed into place. The gzip header carries no
+timestamp or name, so identical content gives identical bytes. That
+matters because report_jobs keys re-renders on the bundle hash.
+
+Pretty-printed JSON is an on-demand export only:
+    python -m app.analysis.session_archive <session_id | session dir> [--out DIR]
+"""
+import argparse
+import gzip
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger("aegis.analysis.session_archive")
+
+MEMBER_SUFFIX = ".json.gz"
+COMPRESS_LEVEL = int(os.getenv("AEGIS_ARCHIVE_COMPRESS_LEVEL", "6"))
+
+MEMBER_BUNDLE = "bundle"
+MEMBER_QUESTIONS = "questions"
+MEMBER_FSIR = "fsir"
+MEMBERS = (MEMBER_BUNDLE, MEMBER_QUESTIONS, MEMBER_FSIR)
+
+
+def dumps(data: Any) -> bytes:
+    """Compact JSON encoding (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+def write_member(path: Path, payload: bytes) -> Path:
+    """Gzip payload into path atomically (deterministic bytes)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as raw, gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=COMPRESS_LEVEL, mtime=0) as f:
+        f.write(payload)
+    os.replace(tmp, path)
+    return path
+
+
+def read_json(path: Path) -> Any:
+    """JSON from an archive member or a plain (legacy / exported) .json file."""
+    path = Path(path)
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as f:
+        return json.loads(f.read())
+
+
+class SessionArchive:
+    """The archive directory of one session."""
+
+    def __init__(self, session_dir: Path):
+        self.session_dir = Path(session_dir)
+
+    def path(self, member: str) -> Path:
+        return self.session_dir / f"{member}{MEMBER_SUFFIX}"
+
+    def exists(self, member: str) -> bool:
+        return self.path(member).exists()
+
+    def write(self, member: str, data: Any) -> Path:
+        return write_member(self.path(member), dumps(data))
+
+    def write_model(self, member: str, model) -> Path:
+        """Pydantic model via its own (compact) JSON serializer; no intermediate dict."""
+        return write_member(self.path(member), model.model_dump_json().encode("utf-8"))
+
+    def read(self, member: str) -> Any:
+        return read_json(self.path(member))
+
+    def members(self) -> List[str]:
+        return [m for m in MEMBERS if self.exists(m)]
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.session_dir.glob(f"*{MEMBER_SUFFIX}"))
+
+    def export_pretty(self, out_dir: Optional[Path] = None, indent: int = 2) -> List[Path]:
+        """Human-readable copies of every member (<out_dir>/<member>.json)."""
+        out_dir = Path(out_dir) if out_dir else self.session_dir / "export"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for member in self.members():
+            path = out_dir / f"{member}.json"
+            with open(path, "w") as f:
+                json.dump(self.read(member), f, indent=indent, ensure_ascii=False)
+            written.append(path)
+        return written
+
+
+def main(argv: Optional[List[str]] = None):
+    from app.analysis.report_jobs import SESSIONS_DIR
+
+    parser = argparse.ArgumentParser(description="Export a session archive as pretty-printed JSON.")
+    parser.add_argument("session", help="Session ID or archive directory")
+    parser.add_argument("--out", type=Path, help="Output directory (default: <session dir>/export)")
+    parser.add_argument("--indent", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    session_dir = Path(args.session) if Path(args.session).is_dir() else SESSIONS_DIR / args.session
+    archive = SessionArchive(session_dir)
+    if not archive.members():
+        print(f"No archive members in {session_dir}", file=sys.stderr)
+        return 1
+    for path in archive.export_pretty(args.out, indent=args.indent):
+        print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""
+Code Submission Store
+Keeps the latest ALGO_SUBMIT per file and decides what goes into the LLM context.
+
+Re-submitting the same file used to append a full copy of the code every
+time, so prompt size (and TTFT) grew over the interview. Now:
+- First submission of a file: full code (bounded)
+- Later submissions: unified diff against the last version injected in full
+  (the base), so the diff always applies to code the LLM has verbatim
+- Under context pressure: a compact summary (changed lines / hunks) instead
+- Identical re-runs: one line with the new output only
+
+When the chat context is compacted the base may have been summarized away;
+ChatContextManager calls reset_base() and the next submission goes in full.
+
+The full code is still logged to the audit log / questions logger by the
+caller; this only governs what the LLM sees.
+"""
+import difflib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.core.text_analysis import estimate_tokens
+
+logger = logging.getLogger("aegis.core.code_submissions")
+
+MAX_CODE_CHARS = 15000
+MAX_OUTPUT_CHARS = 2000
+MAX_DIFF_CHARS = 6000
+DIFF_CONTEXT_LINES = 2
+
+# Above this many tokens already in the chat context, inject summaries instead of diffs
+CONTEXT_PRESSURE_TOKENS = 6000
+
+MODE_FULL = "full"
+MODE_DIFF = "diff"
+MODE_SUMMARY = "summary"
+MODE_UNCHANGED = "unchanged"
+
+
+def _truncate(text: str, limit: int) -> str:
+    if len(text) > limit:
+        return text[:limit] + "... (truncated)"
+    return text
+
+
+@dataclass
+class CodeSubmission:
+    """One ALGO_SUBMIT packet and what was injected for it."""
+    file_key: str
+    version: int
+    code: str
+    language: str
+    output: str
+    mode: str = MODE_FULL
+    message: str = ""           # Text injected into the LLM context
+    code_tokens: int = 0        # Tokens the full code would have cost
+    injected_tokens: int = 0    # Tokens actually injected
+    lines_added: int = 0
+    lines_removed: int = 0
+    submitted_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "file": self.file_key,
+            "version": self.version,
+            "language": self.language,
+            "mode": self.mode,
+            "code_tokens": self.code_tokens,
+            "injected_tokens": self.injected_tokens,
+            "lines_added": self.lines_added,
+            "lines_removed": self.lines_removed,
+        }
+
+
+class CodeSubmissionStore:
+    """Per-session store of the latest submission per file."""
+
+    def __init__(self, context_pressure_tokens: int = CONTEXT_PRESSURE_TOKENS):
+        self.context_pressure_tokens = context_pressure_tokens
+        self._latest: Dict[str, CodeSubmission] = {}
+        self._base: Dict[str, CodeSubmission] = {}  # Last version injected in full, per file
+        self.history: List[CodeSubmission] = []
+
+    def submit(
+        self,
+        code: str,
+        output: str = "",
+        language: str = "python",
+        file_key: Optional[str] = None,
+        context_tokens: int = 0
+    ) -> CodeSubmission:
+        """
+        Record a submission and build the context message for it.
+
+        Args:
+            code: Submitted code
+            output: Execution output (if the candidate ran it)
+            language: Editor language
+            file_key: File identity; defaults to the language (one buffer per language in the IDE)
+            context_tokens: Current size of the chat context, used to detect pressure
+
+        Returns:
+            The CodeSubmission, with .message set to the text to inject
+        """
+        language = language or "python"
+        file_key = file_key or language
+        code = _truncate(code, MAX_CODE_CHARS)
+        output = _truncate(output, MAX_OUTPUT_CHARS)
+
+        previous = self._latest.get(file_key)
+        base = self._base.get(file_key)
+        sub = CodeSubmission(
+            file_key=file_key,
+            version=previous.version + 1 if previous else 1,
+            code=code,
+            language=language,
+            output=output,
+            code_tokens=estimate_tokens(code)
+        )
+
+        under_pressure = context_tokens >= self.context_pressure_tokens
+        if previous is None or base is None:
+            sub.mode = MODE_FULL
+            sub.message = self._full_message(sub)
+        elif previous.code == code:
+            sub.mode = MODE_UNCHANGED
+            sub.message = self._unchanged_message(sub)
+        else:
+            diff_lines = list(difflib.unified_diff(
+                base.code.splitlines(), code.splitlines(),
+                fromfile=f"v{base.version}", tofile=f"v{sub.version}",
+                lineterm="", n=DIFF_CONTEXT_LINES
+            ))
+            sub.lines_added = sum(1 for line in diff_lines if line.startswith("+") and not line.startswith("+++"))
+            sub.lines_removed = sum(1 for line in diff_lines if line.startswith("-") and not line.startswith("---"))
+            diff = "\n".join(diff_lines)
+
+            if under_pressure:
+                sub.mode = MODE_SUMMARY
+                sub.message = self._summary_message(sub, diff_lines)
+            elif len(diff) > MAX_DIFF_CHARS or len(diff) >= len(code):
+                # Rewrite: the diff would cost more than the code itself
+                sub.mode = MODE_FULL
+                sub.message = self._full_message(sub)
+            else:
+                sub.mode = MODE_DIFF
+                sub.message = self._diff_message(sub, base, diff)
+
+        sub.injected_tokens = estimate_tokens(sub.message)
+        self._latest[file_key] = sub
+        if sub.mode == MODE_FULL:
+            self._base[file_key] = sub
+        self.history.append(sub)
+
+        logger.info(
+            f">>> [CODE STORE] {file_key} v{sub.version}: {sub.mode} "
+            f"({sub.injected_tokens} tokens injected, full code {sub.code_tokens})"
+        )
+        return sub
+
+    def latest(self, file_key: str) -> Optional[CodeSubmission]:
+        return self._latest.get(file_key)
+
+    def reset_base(self):
+        """The LLM context was compacted: send the next submission of every file in full."""
+        if self._base:
+            logger.info(f">>> [CODE STORE] Context compacted, next submission of {len(self._base)} file(s) goes in full")
+        self._base.clear()
+
+    # ------------------------------------------------------------------
+    # Context messages
+    # ------------------------------------------------------------------
+
+    def _output_section(self, sub: CodeSubmission) -> str:
+        return f"\n\n### EXECUTION OUTPUT:\n{sub.output}" if sub.output else ""
+
+    def _full_message(self, sub: CodeSubmission) -> str:
+        return (
+            f"The candidate has executed/submitted the following code ({sub.file_key}, version {sub.version}).\n\n"
+            f"### CODE:\n```{sub.language}\n{sub.code}\n```"
+            f"{self._output_section(sub)}"
+            "\n\nPlease review it and acknowledge. If it's correct/fixing the issue, proceed. If not, provide feedback."
+        )
+
+    def _diff_message(self, sub: CodeSubmission, base: CodeSubmission, diff: str) -> str:
+        return (
+            f"The candidate re-submitted {sub.file_key} (version {sub.version}). "
+            f"Changes since version {base.version}:\n\n"
+            f"```diff\n{diff}\n```"
+            f"{self._output_section(sub)}"
+            "\n\nPlease review the changes and acknowledge. If they fix the issue, proceed. If not, provide feedback."
+        )
+
+    def _summary_message(self, sub: CodeSubmission, diff_lines: List[str]) -> str:
+        hunks = [line for line in diff_lines if line.startswith("@@")]
+        changed = [
+            line[1:].strip() for line in diff_lines
+            if line[:1] in "+-" and not line.startswith(("+++", "---")) and line[1:].strip()
+        ]
+        preview = "; ".join(changed[:6])
+        return (
+            f"The candidate re-submitted {sub.file_key} (version {sub.version}): "
+            f"+{sub.lines_added}/-{sub.lines_removed} lines in {len(hunks)} place(s). "
+            f"Changed lines include: {preview}"
+            f"{self._output_section(sub)}"
+            "\n\nAcknowledge briefly; ask the candidate to walk you through the change if needed."
+        )
+
+    def _unchanged_message(self, sub: CodeSubmission) -> str:
+        return (
+            f"The candidate re-ran {sub.file_key} without changes (version {sub.version - 1})."
+            f"{self._output_section(sub)}"
+        )
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Token accounting across submissions (injected vs. full-copy cost)."""
+        injected = sum(s.injected_tokens for s in self.history)
+        full_cost = sum(s.code_tokens for s in self.history)
+        return {
+            "submissions": len(self.history),
+            "files": len(self._latest),
+            "injected_tokens": injected,
+            "full_copy_tokens": full_cost,
+            "tokens_saved": max(0, full_cost - injected),
+            "per_submission": [s.to_dict() for s in self.history],
+        }
@@ -0,0 +1,185 @@
+"""
+Chat Context Manager
+Keeps the IncidentLead chat context inside a token budget over long interviews.
+
+Every LLM call resends the whole context, so without compaction prompt size
+(latency and cost) grows linearly with the interview. When the context goes
+over budget, older turns are summarized in the background by a cheap model
+and the summary is swapped in via update_chat_ctx():
+- System messages (personalized prompt, crisis injections) are pinned and never summarized
+- The most recent turns are always kept verbatim
+- Tool calls / outputs are left untouched
+- The previous summary is folded into the next one, so there is only ever one
+- on_compact() runs after each swap (code submissions re-send their base in full)
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from app.core.llm_router import llm_router
+from app.core.text_analysis import estimate_chat_ctx_tokens, estimate_tokens
+
+logger = logging.getLogger("aegis.core.context_manager")
+
+DEFAULT_BUDGET_TOKENS = int(os.getenv("AEGIS_CONTEXT_BUDGET_TOKENS", "6000"))
+KEEP_RECENT_ITEMS = 10
+MIN_ITEMS_TO_COMPACT = 4
+SUMMARY_PREFIX = "[CONVERSATION SUMMARY]"
+PINNED_ROLES = ("system", "developer")
+
+SUMMARIZER_PROMPT = """You compress technical interview transcripts for the interviewer.
+Summarize the conversation below in under 200 words. Keep:
+- Questions asked and how the candidate answered (correct / partial / wrong)
+- Code the candidate wrote or fixed, bugs found, complexity discussed
+- Crises raised and whether they were resolved
+- Open threads the interviewer still needs to follow up on
+Write terse bullet points. Do not invent details."""
+
+
+class ChatContextManager:
+    """Per-session compactor for one agent's chat context."""
+
+    def __init__(
+        self,
+        agent: Any,
+        budget_tokens: int = DEFAULT_BUDGET_TOKENS,
+        keep_recent: int = KEEP_RECENT_ITEMS,
+        role: str = "summary",
+        on_compact: Optional[Callable[[], None]] = None
+    ):
+        self.agent = agent
+        self.budget_tokens = budget_tokens
+        self.keep_recent = keep_recent
+        self.role = role
+        self.on_compact = on_compact
+
+        self._pinned_ids: Set[str] = set()
+        self._summary_id: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.compactions = 0
+        self.tokens_before: List[int] = []
+        self.tokens_after: List[int] = []
+
+    def pin(self, item_id: str):
+        """Never summarize this item (in addition to system messages)."""
+        self._pinned_ids.add(item_id)
+
+    def _is_pinned(self, item: Any) -> bool:
+        if item.id in self._pinned_ids:
+            return True
+        return item.id != self._summary_id and getattr(item, "role", None) in PINNED_ROLES
+
+    def current_tokens(self) -> int:
+        return estimate_chat_ctx_tokens(self.agent.chat_ctx)
+
+    def maybe_compact(self) -> bool:
+        """
+        Schedule a background compaction if the context is over budget.
+        Cheap to call after every turn.
+
+        Returns:
+            True if a compaction was scheduled
+        """
+        if self._task and not self._task.done():
+            return False
+        tokens = self.current_tokens()
+        if tokens <= self.budget_tokens:
+            return False
+        logger.info(f">>> [CONTEXT] {tokens} tokens > budget {self.budget_tokens}, compacting in background")
+        self._task = asyncio.create_task(self._compact(tokens))
+        return True
+
+    def _select_items(self, items: List[Any]) -> List[Any]:
+        """Older, unpinned chat messages eligible for summarization."""
+        old = items[:-self.keep_recent] if self.keep_recent else items
+        return [
+            item for item in old
+            if getattr(item, "type", "message") == "message" and not self._is_pinned(item)
+        ]
+
+    async def _compact(self, tokens_before: int):
+        started = time.monotonic()
+        candidates = self._select_items(list(self.agent.chat_ctx.items))
+        if len(candidates) < MIN_ITEMS_TO_COMPACT:
+            logger.info(f">>> [CONTEXT] Only {len(candidates)} unpinned items to compact, skipping")
+            return
+
+        transcript = "\n".join(
+            f"{item.role.upper()}: {item.text_content}"
+            for item in candidates if item.text_content
+        )
+
+        try:
+            summary = await llm_router.complete(
+                self.role,
+                [
+                    {"role": "system", "content": SUMMARIZER_PROMPT},
+                    {"role": "user", "content": transcript},
+                ],
+                temperature=0.2,
+                max_tokens=400
+            )
+        except Exception as e:
+            logger.warning(f">>> [CONTEXT] Summarization failed, keeping full context: {e}")
+            return
+
+        if not summary:
+            return
+
+        if not await self._swap(candidates, summary):
+            return
+        if self.on_compact:
+            self.on_compact()
+
+        tokens_after = self.current_tokens()
+        self.compactions += 1
+        self.tokens_before.append(tokens_before)
+        self.tokens_after.append(tokens_after)
+        logger.info(
+            f">>> [CONTEXT] Compacted {len(candidates)} items: {tokens_before} -> {tokens_after} tokens "
+            f"({(time.monotonic() - started) * 1000:.0f}ms, summary {estimate_tokens(summary)} tokens)"
+        )
+
+    async def _swap(self, summarized: List[Any], summary: str) -> bool:
+        """Replace summarized items with one summary message, in place of the first of them."""
+        from livekit.agents import llm
+
+        summarized_ids = {item.id for item in summarized}
+        # Copy at swap time: turns added while the summarizer ran are kept
+        new_ctx = self.agent.chat_ctx.copy()
+
+        insert_at = next(
+            (i for i, item in enumerate(new_ctx.items) if item.id in summarized_ids),
+            None
+        )
+        if insert_at is None:
+            return False  # Context was replaced meanwhile
+
+        summary_msg = llm.ChatMessage(role="system", content=[f"{SUMMARY_PREFIX}\n{summary}"])
+        new_ctx.items = [item for item in new_ctx.items if item.id not in summarized_ids]
+        new_ctx.items.insert(insert_at, summary_msg)
+        self._summary_id = summary_msg.id
+
+        await self.agent.update_chat_ctx(new_ctx)
+        return True
+
+    async def aclose(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "compactions": self.compactions,
+            "current_tokens": self.current_tokens(),
+            "budget_tokens": self.budget_tokens,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+        }
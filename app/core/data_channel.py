@@ -0,0 +1,341 @@
+"""
+Data Channel Publisher
+Per-room outbound message bus for everything the worker sends to the frontend.
+
+All agents publish through one ordered queue instead of spawning their own
+fire-and-forget publish_data() tasks:
+- Messages are sent strictly in publish order by a single sender task
+- State messages (e.g. CODE_SNAPSHOT) that are superseded before being sent
+  are coalesced so only the latest one goes out
+- The buffer is bounded; when full, low-value popups are dropped first
+- Failed publishes are retried with a short backoff
+- Small messages published within a few ms are packed into one
+  {"type": "BATCH", "messages": [...]} frame; both frontends unpack it via
+  decodeMessages() in lib/dataChannel.ts (AEGIS_DATA_BATCH_FRAMES=0 turns it off)
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger("aegis.core.data_channel")
+
+
+# Drop / coalesce policy per message type
+POLICY_KEEP = "keep"        # Never dropped (transcripts, control signals)
+POLICY_LATEST = "latest"    # Only the newest queued instance matters
+POLICY_DROPPABLE = "drop"   # Cosmetic; first to go when the buffer is full
+
+MESSAGE_POLICIES: Dict[str, str] = {
+    "TRANSCRIPTION": POLICY_KEEP,
+    "TRANSCRIPT": POLICY_KEEP,
+    "INTERVIEW_END": POLICY_KEEP,
+    "MODE_SWITCH": POLICY_KEEP,
+    "CRISIS_POPUP": POLICY_KEEP,
+    "CRISIS_ALERT": POLICY_KEEP,
+    "CODE_SNAPSHOT": POLICY_LATEST,
+    "CODE_SNAPSHOT_DELTA": POLICY_KEEP,  # Append-only patches; order matters
+    "TOGGLE_NOTEPAD": POLICY_LATEST,
+    "DQI_UPDATE": POLICY_LATEST,  # Running score; only the newest matters
+    "PRESSURE_ALERT": POLICY_DROPPABLE,
+    "MOLE_POPUP": POLICY_DROPPABLE,
+}
+
+# A LATEST message is not coalesced past a queued message of these types, so that
+# e.g. a full CODE_SNAPSHOT never jumps ahead of the deltas it is meant to follow
+COALESCE_BARRIERS: Dict[str, frozenset] = {
+    "CODE_SNAPSHOT": frozenset({"CODE_SNAPSHOT_DELTA"}),
+}
+
+# LiveKit reliable packets are limited to ~15 KiB
+MAX_FRAME_BYTES = 14_000
+
+# Per-room publishers pack bursts into BATCH frames unless disabled
+BATCH_FRAMES = os.getenv("AEGIS_DATA_BATCH_FRAMES", "1") != "0"
+
+
+def dumps(message: Dict[str, Any]) -> bytes:
+    """Compact JSON encoding (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(message)
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+@dataclass
+class _Outbound:
+    msg_type: str
+    payload: bytes
+    reliable: bool
+    enqueued_at: float = field(default_factory=time.monotonic)
+    message: Optional[Dict[str, Any]] = None  # Kept only when frames are batched
+
+
+class DataChannelPublisher:
+    """
+    Ordered, bounded, coalescing publisher for one LiveKit room.
+
+    publish() is synchronous and never blocks, so it can be called from
+    event callbacks (on_user_speech, on_agent_speech, on_data).
+    """
+
+    def __init__(
+        self,
+        room: Any,
+        max_queue: int = 256,
+        linger_ms: float = 5.0,
+        batch_frames: bool = False,
+        max_retries: int = 2,
+        retry_backoff: float = 0.05
+    ):
+        self._room = room
+        self._max_queue = max_queue
+        self._linger = linger_ms / 1000.0
+        self._batch_frames = batch_frames
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+
+        self._queue: Deque[_Outbound] = deque()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+        # Metrics
+        self.published = 0
+        self.frames_sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.failed = 0
+        self.max_depth = 0
+        self._latencies: Deque[float] = deque(maxlen=512)
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def publish(self, message: Dict[str, Any], reliable: bool = True) -> bool:
+        """
+        Queue a message for the frontend.
+
+        Returns:
+            False if the message was dropped (bus closed or buffer full)
+        """
+        if self._closed:
+            logger.warning(f"Publisher closed, dropping {message.get('type')}")
+            return False
+
+        msg_type = message.get("type", "UNKNOWN")
+        policy = MESSAGE_POLICIES.get(msg_type, POLICY_KEEP)
+
+        try:
+            payload = dumps(message)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Cannot serialize {msg_type} message: {e}")
+            return False
+
+        item = _Outbound(msg_type, payload, reliable, message=message if self._batch_frames else None)
+
+        if policy == POLICY_LATEST and self._replace_queued(item):
+            self.coalesced += 1
+            return True
+
+        if len(self._queue) >= self._max_queue and not self._make_room(policy):
+            self.dropped += 1
+            logger.warning(f"Data channel buffer full, dropped {msg_type}")
+            return False
+
+        self._queue.append(item)
+        self.max_depth = max(self.max_depth, len(self._queue))
+        self._idle.clear()
+        self._wakeup.set()
+        self._ensure_started()
+        return True
+
+    def _replace_queued(self, item: _Outbound) -> bool:
+        """Swap a queued (unsent) message of the same type for the newer one."""
+        barriers = COALESCE_BARRIERS.get(item.msg_type, ())
+        for i in range(len(self._queue) - 1, -1, -1):
+            if self._queue[i].msg_type in barriers:
+                return False
+            if self._queue[i].msg_type == item.msg_type:
+                item.enqueued_at = self._queue[i].enqueued_at
+                self._queue[i] = item
+                return True
+        return False
+
+    def _make_room(self, incoming_policy: str) -> bool:
+        """Evict the oldest droppable message. Droppable messages never evict others."""
+        if incoming_policy == POLICY_DROPPABLE:
+            return False
+        for i, queued in enumerate(self._queue):
+            if MESSAGE_POLICIES.get(queued.msg_type) == POLICY_DROPPABLE:
+                del self._queue[i]
+                self.dropped += 1
+                logger.warning(f"Data channel buffer full, evicted {queued.msg_type}")
+                return True
+        return False
+
+    def _ensure_started(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._sender_loop())
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    async def _sender_loop(self):
+        try:
+            while True:
+                if not self._queue:
+                    self._idle.set()
+                    if self._closed:
+                        return
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                # Linger briefly so bursts can be coalesced / batched
+                if self._linger > 0:
+                    await asyncio.sleep(self._linger)
+
+                for frame, items in self._next_frames():
+                    await self._send_frame(frame, items)
+        except asyncio.CancelledError:
+            self._idle.set()
+            raise
+
+    def _next_frames(self):
+        """Pop queued messages, grouping consecutive small ones into BATCH frames if enabled."""
+        while self._queue:
+            first = self._queue.popleft()
+            if not self._batch_frames:
+                yield first.payload, [first]
+                continue
+
+            items = [first]
+            size = len(first.payload)
+            while (
+                self._queue
+                and self._queue[0].reliable == first.reliable
+                and size + len(self._queue[0].payload) + 1 < MAX_FRAME_BYTES
+            ):
+                nxt = self._queue.popleft()
+                items.append(nxt)
+                size += len(nxt.payload) + 1
+
+            if len(items) == 1:
+                yield first.payload, items
+            else:
+                yield dumps({"type": "BATCH", "messages": [i.message for i in items]}), items
+
+    async def _send_frame(self, frame: bytes, items: List[_Outbound]):
+        participant = getattr(self._room, "local_participant", None)
+        if participant is None:
+            self.failed += len(items)
+            logger.error("No local participant, cannot publish data")
+            return
+
+        for attempt in range(self._max_retries + 1):
+            try:
+                await participant.publish_data(frame, reliable=items[0].reliable)
+                break
+            except Exception as e:
+                if attempt == self._max_retries:
+                    self.failed += len(items)
+                    logger.error(f"Failed to publish {[i.msg_type for i in items]}: {e}")
+                    return
+                await asyncio.sleep(self._retry_backoff * (attempt + 1))
+
+        now = time.monotonic()
+        self.frames_sent += 1
+        self.published += len(items)
+        for i in items:
+            self._latencies.append(now - i.enqueued_at)
+
+    # ------------------------------------------------------------------
+    # Lifecycle & metrics
+    # ------------------------------------------------------------------
+
+    async def flush(self, timeout: float = 2.0) -> bool:
+        """Wait until everything queued so far has been sent. Returns False on timeout."""
+        if not self._queue and self._idle.is_set():
+            return True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"Data channel flush timed out with {len(self._queue)} queued")
+            return False
+
+    async def aclose(self, timeout: float = 2.0):
+        """Flush pending messages, then stop the sender task."""
+        self._closed = True
+        self._wakeup.set()
+        await self.flush(timeout)
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of bus metrics (queue depth, publish latency, drop counters)."""
+        latencies = sorted(self._latencies)
+
+        def _pct(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2)
+
+        return {
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self.max_depth,
+            "published": self.published,
+            "frames_sent": self.frames_sent,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "publish_latency_p50_ms": _pct(0.50),
+            "publish_latency_p95_ms": _pct(0.95),
+        }
+
+
+# =======================================================================
+# Per-room registry
+# =======================================================================
+
+_publishers: Dict[int, DataChannelPublisher] = {}
+
+
+def get_publisher(room: Any, **kwargs) -> DataChannelPublisher:
+    """Return the publisher for a room, creating it on first use."""
+    publisher = _publishers.get(id(room))
+    if publisher is None or publisher._room is not room:
+        kwargs.setdefault("batch_frames", BATCH_FRAMES)
+        publisher = DataChannelPublisher(room, **kwargs)
+        _publishers[id(room)] = publisher
+    return publisher
+
+
+async def close_publisher(room: Any, timeout: float = 2.0):
+    """Flush and remove the publisher for a room (call on session shutdown)."""
+    publisher = _publishers.pop(id(room), None)
+    if publisher is not None:
+        await publisher.aclose(timeout)
+        logger.info(f"Data channel publisher closed: {publisher.stats()}")
@@ -2,8 +2,11 @@
 End Phrase Detector
 Detects when user wants to end the interview.
 """
+import asyncio
+import math
 import re
-from typing import List
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 # Phrases that indicate the user wants to end the interview
@@ -33,11 +36,40 @@ END_PHRASES = [
 ]
 
 
+# Genuinely ending an interview is usually short. Longer transcripts are
+# likely a technical explanation or code snippet, NOT a request to terminate.
+MAX_END_WORDS = 6
+FUZZY_MATCH_RATIO = 0.8
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
+
+def _tokens(text: str) -> List[str]:
+    return _PUNCT_RE.sub("", text.lower()).split()
+
+
+# Precomputed once: normalized phrase tokens, one compiled alternation for exact
+# matches, and an inverted index (token -> phrases) for the fuzzy word check
+_PHRASE_TOKENS: List[Tuple[str, ...]] = [tuple(_tokens(p)) for p in END_PHRASES]
+_EXACT_RE = re.compile(
+    r"(?:^| )(?:" + "|".join(re.escape(" ".join(t)) for t in sorted(_PHRASE_TOKENS, key=len, reverse=True)) + r")(?: |$)"
+)
+_FUZZY_REQUIRED: List[int] = [
+    math.ceil(len(t) * FUZZY_MATCH_RATIO) if len(t) >= 2 else len(t) + 1  # Single words: exact only
+    for t in _PHRASE_TOKENS
+]
+_TOKEN_INDEX: Dict[str, List[int]] = {}
+for _i, _phrase in enumerate(_PHRASE_TOKENS):
+    for _token in set(_phrase):
+        _TOKEN_INDEX.setdefault(_token, []).append(_i)
+
+
 def check_end_phrase(transcript: str) -> bool:
     """
     Check if the transcript contains an end phrase.
     
-    Uses case-insensitive matching with some fuzzy tolerance.
+    Uses case-insensitive matching with some fuzzy tolerance: an exact phrase
+    match, or at least 80% of a phrase's words present.
     
     Args:
         transcript: User's speech transcript
@@ -48,36 +80,122 @@ def check_end_phrase(transcript: str) -> bool:
     if not transcript:
         return False
     
-    # Normalize the transcript
-    normalized = transcript.lower().strip()
-    
-    # [NEW] Length Constraint: Genuinely ending an interview is usually short.
-    # If the transcript is long (e.g., > 6 words), it's likely a technical 
-    # explanation or code snippet, NOT a request to terminate.
-    words_count = len(normalized.split())
-    if words_count > 6:
+    tokens = _tokens(transcript)
+    if not tokens or len(tokens) > MAX_END_WORDS:
         return False
 
-    # Remove punctuation for better matching
-    normalized = re.sub(r'[^\w\s]', '', normalized)
-    
-    # Check for exact or partial matches
-    for phrase in END_PHRASES:
-        # Exact substring match
-        if phrase in normalized:
-            return True
-        
-        # Check if key words are present (fuzzy matching)
-        words = phrase.split()
-        if len(words) >= 2:
-            # Check if at least 80% of words are present
-            matches = sum(1 for w in words if w in normalized)
-            if matches >= len(words) * 0.8:
+    if _EXACT_RE.search(" ".join(tokens)):
+        return True
+
+    hits: Dict[int, int] = {}
+    for token in set(tokens):
+        for phrase_id in _TOKEN_INDEX.get(token, ()):
+            hits[phrase_id] = hits.get(phrase_id, 0) + 1
+            if hits[phrase_id] >= _FUZZY_REQUIRED[phrase_id]:
                 return True
     
     return False
 
 
+class EndIntentDetector:
+    """
+    Debounced end-of-interview detection across interim and final transcripts.
+
+    - A final transcript with an end phrase confirms immediately
+    - An interim transcript with an end phrase arms the detector. It confirms
+      on the pipeline's end-of-utterance signal, or if the utterance stays
+      unchanged for confirm_window seconds. The window must be at least the
+      endpointing delay, so a normal mid-sentence pause never ends the interview.
+    - Any interim that no longer matches (the candidate kept talking) disarms it
+    - One confirm timer per arm, cancelled on disarm
+    - Confirms at most once per session
+    """
+
+    def __init__(
+        self,
+        confirm_window: float = 0.8,
+        on_confirm: Optional[Callable[[], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        scheduler: Optional[Callable[[float, Callable[[], None]], Any]] = None
+    ):
+        self.confirm_window = confirm_window
+        self.on_confirm = on_confirm  # Called once when confirmed by the timer or EOU
+        self._clock = clock
+        self._scheduler = scheduler  # call_later(delay, fn) -> handle; default: running loop
+        self._armed_at: Optional[float] = None
+        self._armed_text: Optional[str] = None
+        self._timer = None
+        self.triggered = False
+
+    @property
+    def armed(self) -> bool:
+        return self._armed_at is not None
+
+    def _disarm(self):
+        self._armed_at = None
+        self._armed_text = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _arm(self, transcript: str):
+        self._disarm()
+        self._armed_at = self._clock()
+        self._armed_text = transcript
+        if self.on_confirm is not None:
+            call_later = self._scheduler or asyncio.get_running_loop().call_later
+            self._timer = call_later(self.confirm_window, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        if self.confirm_if_stable() and self.on_confirm:
+            self.on_confirm()
+
+    def feed(self, transcript: str, is_final: bool) -> bool:
+        """
+        Process one transcript event.
+
+        Returns:
+            True if the end intent is confirmed by this event
+        """
+        if self.triggered:
+            return False
+
+        matched = check_end_phrase(transcript)
+        if is_final:
+            self._disarm()
+            if matched:
+                self.triggered = True
+            return matched
+
+        if not matched:
+            self._disarm()
+        elif transcript != self._armed_text:
+            # (Re)start the stability window whenever the interim text changes
+            self._arm(transcript)
+        return False
+
+    def confirm_if_stable(self) -> bool:
+        """True if the armed utterance held for confirm_window seconds."""
+        if self.triggered or self._armed_at is None:
+            return False
+        if self._clock() - self._armed_at >= self.confirm_window:
+            self.triggered = True
+            self._disarm()
+            return True
+        return False
+
+    def on_end_of_utterance(self) -> bool:
+        """End-of-utterance signal from the pipeline: confirms an armed end phrase."""
+        if self.triggered or self._armed_at is None:
+            return False
+        self.triggered = True
+        self._disarm()
+        if self.on_confirm:
+            self.on_confirm()
+        return True
+
+
 def get_goodbye_message(candidate_name: str = None) -> str:
     """
     Generate a goodbye message for the agent to say.
@@ -0,0 +1,317 @@
+"""
+LLM Router
+Maps agent roles to prioritized Groq model lists with failover and quota awareness.
+
+- complete() runs on one router event loop thread with one OpenAI-compatible
+  client, so every session in the process (one job thread each with the
+  THREAD executor) shares a single HTTP connection pool for one-shot calls
+- for_role() LLMs are driven by the job's AgentSession on the job's own loop,
+  and HTTP sessions cannot cross loops, so those clients / adapters are cached
+  per event loop: shared by sessions on one loop, separate per job thread
+- Per-model health (thread-safe, shared by all sessions): request budget
+  (RPM), latency EWMA, cooldown after rate limits / timeouts
+- for_role() returns a LiveKit LLM (FallbackAdapter over healthy models first)
+  for agents and the voice pipeline
+- complete() does a one-shot chat completion over Groq's OpenAI-compatible API
+  with the same failover, for code that does not run inside an AgentSession
+  (Knowledge Engine researcher / mole tips, upload-side question generation)
+
+Routes can be overridden per role with env vars, e.g.
+AEGIS_LLM_ROUTE_OBSERVER="llama-3.3-70b-versatile,llama-3.1-8b-instant"
+"""
+import asyncio
+import contextlib
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger("aegis.core.llm_router")
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+
+# Role -> models in priority order. Roles are split across models to spread rate limits.
+DEFAULT_ROUTES: Dict[str, List[str]] = {
+    "lead": ["llama-3.1-8b-instant", "llama-3.3-70b-versatile"],
+    "observer": ["llama-3.3-70b-versatile", "llama-3.1-8b-instant"],
+    "crisis": ["llama-3.1-8b-instant", "llama-3.3-70b-versatile"],
+    "qgen": ["llama-3.1-8b-instant", "llama-3.3-70b-versatile"],
+    "mole": ["llama-3.1-8b-instant", "llama-3.3-70b-versatile"],
+    "intel": ["llama-3.1-8b-instant", "llama-3.3-70b-versatile"],
+    "summary": ["llama-3.1-8b-instant", "llama-3.3-70b-versatile"],
+}
+
+# Requests-per-minute budget per model (Groq free tier). Unknown models are not budgeted.
+DEFAULT_RPM: Dict[str, int] = {
+    "llama-3.1-8b-instant": 30,
+    "llama-3.3-70b-versatile": 30,
+}
+
+RATE_LIMIT_COOLDOWN_SECONDS = 30.0
+TIMEOUT_COOLDOWN_SECONDS = 10.0
+
+
+@dataclass
+class ModelHealth:
+    """Live quota / latency view of one model, shared by all sessions in the process."""
+    model: str
+    rpm_budget: Optional[int] = None
+    cooldown_until: float = 0.0
+    latency_ewma: Optional[float] = None
+    requests: int = 0
+    failures: int = 0
+    remaining_requests: Optional[int] = None  # From x-ratelimit-* headers when known
+    _window: Deque[float] = field(default_factory=deque)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)  # Job threads + router loop
+
+    def record_request(self, latency: Optional[float] = None, remaining_requests: Optional[int] = None):
+        now = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            self._window.append(now)
+            if latency is not None:
+                self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+            if remaining_requests is not None:
+                self.remaining_requests = remaining_requests
+
+    def record_failure(self, cooldown: float):
+        with self._lock:
+            self.failures += 1
+            self.cooldown_until = max(self.cooldown_until, time.monotonic() + cooldown)
+
+    def remaining(self) -> Optional[int]:
+        """Requests left in the current minute (server-reported if available, else estimated)."""
+        now = time.monotonic()
+        with self._lock:
+            while self._window and now - self._window[0] > 60:
+                self._window.popleft()
+            estimates = []
+            if self.rpm_budget is not None:
+                estimates.append(self.rpm_budget - len(self._window))
+            if self.remaining_requests is not None:
+                estimates.append(self.remaining_requests)
+        return min(estimates) if estimates else None
+
+    @property
+    def available(self) -> bool:
+        remaining = self.remaining()
+        return time.monotonic() >= self.cooldown_until and (remaining is None or remaining > 0)
+
+
+class LLMRouter:
+    """Process-wide router; use the module-level `llm_router` instance."""
+
+    def __init__(
+        self,
+        routes: Optional[Dict[str, List[str]]] = None,
+        rpm_budgets: Optional[Dict[str, int]] = None,
+        attempt_timeout: float = 10.0
+    ):
+        self._routes = dict(routes or DEFAULT_ROUTES)
+        self._rpm = dict(rpm_budgets or DEFAULT_RPM)
+        self._attempt_timeout = attempt_timeout
+        self._health: Dict[str, ModelHealth] = {}
+        # event loop -> {model -> livekit groq.LLM}
+        self._clients: "weakref.WeakKeyDictionary[Any, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+        # event loop -> {role -> FallbackAdapter} over the shared clients
+        self._adapters: "weakref.WeakKeyDictionary[Any, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+        # complete(): one AsyncOpenAI client on one router loop for the whole process
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._openai_client: Any = None
+        self._lock = threading.Lock()
+        self.in_flight = 0  # LLM calls currently running (for worker load reporting)
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def models_for(self, role: str) -> List[str]:
+        """Configured models for a role, healthy ones first (priority order otherwise kept)."""
+        env_route = os.getenv(f"AEGIS_LLM_ROUTE_{role.upper()}")
+        if env_route:
+            models = [m.strip() for m in env_route.split(",") if m.strip()]
+        else:
+            models = self._routes.get(role) or self._routes["lead"]
+        return sorted(models, key=lambda m: not self.health(m).available)
+
+    def health(self, model: str) -> ModelHealth:
+        if model not in self._health:
+            with self._lock:
+                self._health.setdefault(model, ModelHealth(model=model, rpm_budget=self._rpm.get(model)))
+        return self._health[model]
+
+    @contextlib.contextmanager
+    def track(self):
+        """Count an LLM call as in flight (worker load reporting)."""
+        with self._lock:
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    # ------------------------------------------------------------------
+    # LiveKit LLMs (AgentSession / agents)
+    # ------------------------------------------------------------------
+
+    def _client(self, model: str):
+        """Shared groq.LLM per model (one HTTP pool per model per event loop)."""
+        clients = self._clients.setdefault(asyncio.get_running_loop(), {})
+        if model not in clients:
+            from livekit.plugins import groq
+
+            client = groq.LLM(model=model, api_key=os.getenv("GROQ_API_KEY"))
+            health = self.health(model)
+
+            @client.on("metrics_collected")
+            def _on_metrics(metrics):
+                health.record_request(getattr(metrics, "duration", None))
+
+            clients[model] = client
+        return clients[model]
+
+    def for_role(self, role: str):
+        """
+        LLM for a role. With several models, returns a FallbackAdapter that moves
+        to the next model on rate limits, timeouts and API errors.
+
+        The adapter is cached per role and event loop (like the clients). Model
+        order is fixed when it is built; later failover is the adapter's job.
+        """
+        adapters = self._adapters.setdefault(asyncio.get_running_loop(), {})
+        if role in adapters:
+            return adapters[role]
+
+        models = self.models_for(role)
+        clients = [self._client(m) for m in models]
+        if len(clients) == 1:
+            return clients[0]
+
+        from livekit.agents.llm import FallbackAdapter
+
+        adapter = FallbackAdapter(clients, attempt_timeout=self._attempt_timeout)
+        client_models = {id(c): m for c, m in zip(clients, models)}
+
+        @adapter.on("llm_availability_changed")
+        def _on_availability(ev):
+            model = client_models.get(id(ev.llm))
+            if model and not ev.available:
+                logger.warning(f">>> [LLM ROUTER] {model} unavailable for '{role}', failing over")
+                self.health(model).record_failure(RATE_LIMIT_COOLDOWN_SECONDS)
+
+        logger.info(f">>> [LLM ROUTER] Role '{role}' -> {models}")
+        adapters[role] = adapter
+        return adapter
+
+    async def aclose(self):
+        """
+        Close the adapters and clients bound to the current event loop (the
+        ending job's). The process-wide complete() client stays open.
+        """
+        loop = asyncio.get_running_loop()
+        closables = list(self._adapters.pop(loop, {}).values()) + list(self._clients.pop(loop, {}).values())
+        for obj in closables:
+            try:
+                await obj.aclose()
+            except Exception as e:
+                logger.warning(f">>> [LLM ROUTER] Failed to close {type(obj).__name__}: {e}")
+
+    # ------------------------------------------------------------------
+    # One-shot completions (OpenAI-compatible API)
+    # ------------------------------------------------------------------
+
+    def _router_loop(self) -> asyncio.AbstractEventLoop:
+        """The router's own event loop (daemon thread), started on first use."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="aegis-llm-router", daemon=True).start()
+                self._loop = loop
+        return self._loop
+
+    async def _on_router_loop(self, coro):
+        """Await a coroutine on the router loop from any session's loop."""
+        loop = self._router_loop()
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def _get_openai_client(self):
+        """Process-wide AsyncOpenAI client; only used on the router loop."""
+        if self._openai_client is None:
+            from openai import AsyncOpenAI
+
+            self._openai_client = AsyncOpenAI(api_key=os.getenv("GROQ_API_KEY"), base_url=GROQ_BASE_URL)
+        return self._openai_client
+
+    async def complete(self, role: str, messages: List[Dict[str, str]], **kwargs) -> str:
+        """
+        Chat completion for a role, failing over across its models.
+        Runs on the router loop, so all sessions share one connection pool.
+
+        Raises:
+            RuntimeError: if GROQ_API_KEY is missing or every model failed
+        """
+        if not os.getenv("GROQ_API_KEY"):
+            raise RuntimeError("GROQ_API_KEY not set")
+        return await self._on_router_loop(self._complete(role, messages, **kwargs))
+
+    async def _complete(self, role: str, messages: List[Dict[str, str]], **kwargs) -> str:
+        import openai
+
+        client = self._get_openai_client()
+        last_error: Optional[Exception] = None
+
+        for model in self.models_for(role):
+            health = self.health(model)
+            started = time.monotonic()
+            try:
+                with self.track():
+                    raw = await asyncio.wait_for(
+                        client.chat.completions.with_raw_response.create(model=model, messages=messages, **kwargs),
+                        timeout=self._attempt_timeout
+                    )
+            except (openai.RateLimitError, asyncio.TimeoutError, openai.APITimeoutError) as e:
+                cooldown = RATE_LIMIT_COOLDOWN_SECONDS if isinstance(e, openai.RateLimitError) else TIMEOUT_COOLDOWN_SECONDS
+                health.record_failure(cooldown)
+                logger.warning(f">>> [LLM ROUTER] {model} failed for '{role}' ({type(e).__name__}), trying next")
+                last_error = e
+                continue
+            except openai.APIError as e:
+                health.record_failure(TIMEOUT_COOLDOWN_SECONDS)
+                logger.warning(f">>> [LLM ROUTER] {model} API error for '{role}': {e}")
+                last_error = e
+                continue
+
+            remaining = raw.headers.get("x-ratelimit-remaining-requests")
+            health.record_request(
+                time.monotonic() - started,
+                remaining_requests=int(remaining) if remaining is not None and remaining.isdigit() else None
+            )
+
+            completion = raw.parse()
+            return (completion.choices[0].message.content or "").strip()
+
+        raise RuntimeError(f"All models failed for role '{role}': {last_error}")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-model health snapshot (for logs / metrics endpoints)."""
+        return {
+            model: {
+                "available": h.available,
+                "remaining_requests": h.remaining(),
+                "latency_ewma_ms": round(h.latency_ewma * 1000, 1) if h.latency_ewma is not None else None,
+                "requests": h.requests,
+                "failures": h.failures,
+            }
+            for model, h in self._health.items()
+        }
+
+
+# Singleton Instance Export
+llm_router = LLMRouter()
@@ -0,0 +1,15 @@
+"""
+Shared Core
+Constants and candidate helpers used by both the API gateway and the agent worker.
+
+Keep this module lightweight: it is imported by the voice worker, so it must
+never pull in FastAPI, uvicorn or the gateway's request models (backend.main).
+"""
+from pathlib import Path
+
+from app.resume.loader import detect_candidate_field, extract_candidate_context
+
+# Where resumes, audits and generated reports are exchanged between processes
+UPLOADS_DIR = Path("uploads")
+
+__all__ = ["UPLOADS_DIR", "detect_candidate_field", "extract_candidate_context"]
@@ -0,0 +1,286 @@
+"""
+Telemetry
+Latency instrumentation for the voice worker.
+
+- Event-loop lag sampling (a blocked loop delays every callback, STT and TTS frame)
+- Per-turn spans from LiveKit's metrics_collected events, keyed by speech_id:
+  VAD end -> STT final (transcription_delay) -> turn committed (end_of_utterance_delay)
+  -> LLM first token (ttft) -> TTS first audio (ttfb)
+- Durations of side LLM calls (observer / crisis / mole / ...)
+- Data-channel publish queue depth and latency
+
+Exported as Prometheus metrics (if prometheus_client is installed and
+AEGIS_METRICS_PORT is set) and as a per-session JSON timing trace written next
+to the FSIR report. Completed turns are also logged to the SessionAuditLogger
+as TURN_LATENCY events.
+
+When jobs run as separate processes, set PROMETHEUS_MULTIPROC_DIR so
+prometheus_client aggregates them; only the first process binds the port.
+"""
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+logger = logging.getLogger("aegis.core.telemetry")
+
+LAG_SAMPLE_INTERVAL = 0.25
+QUEUE_SAMPLE_EVERY = 4  # Lag samples between data-channel samples (~1s)
+MAX_TRACE_SAMPLES = 2000
+
+_LATENCY_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+
+if prometheus_client is not None:
+    LOOP_LAG = prometheus_client.Histogram(
+        "aegis_event_loop_lag_seconds", "Event-loop scheduling lag",
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+    )
+    TURN_STAGE = prometheus_client.Histogram(
+        "aegis_turn_stage_seconds", "Voice turn latency by stage", ["stage"], buckets=_LATENCY_BUCKETS
+    )
+    LLM_CALL = prometheus_client.Histogram(
+        "aegis_llm_call_seconds", "Side LLM call duration by role", ["role", "outcome"], buckets=_LATENCY_BUCKETS
+    )
+    DC_QUEUE_DEPTH = prometheus_client.Gauge(
+        "aegis_data_channel_queue_depth", "Data-channel messages waiting to be published"
+    )
+    DC_DROPPED = prometheus_client.Counter(
+        "aegis_data_channel_dropped_total", "Data-channel messages dropped (buffer full)"
+    )
+else:
+    LOOP_LAG = TURN_STAGE = LLM_CALL = DC_QUEUE_DEPTH = DC_DROPPED = None
+
+_metrics_server_started = False
+
+
+def start_metrics_server(port: Optional[int] = None) -> bool:
+    """Expose /metrics once per process (AEGIS_METRICS_PORT). Returns True if serving."""
+    global _metrics_server_started
+    if _metrics_server_started:
+        return True
+    port = port or int(os.getenv("AEGIS_METRICS_PORT", "0"))
+    if not port or prometheus_client is None:
+        return False
+    try:
+        prometheus_client.start_http_server(port)
+        _metrics_server_started = True
+        logger.info(f">>> [TELEMETRY] Prometheus metrics on :{port}/metrics")
+    except OSError as e:
+        logger.info(f">>> [TELEMETRY] Metrics port {port} already bound ({e}); another process serves it")
+    return _metrics_server_started
+
+
+def _percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"p50": None, "p95": None, "max": None}
+    ordered = sorted(values)
+
+    def pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 2)
+
+    return {"p50": pct(0.50), "p95": pct(0.95), "max": round(ordered[-1] * 1000, 2)}
+
+
+class SessionTelemetry:
+    """Timing trace for one interview session."""
+
+    # Turn stages, in pipeline order
+    STAGES = ("stt_final", "end_of_utterance", "llm_ttft", "tts_ttfb")
+
+    def __init__(self, session_id: str, audit_logger: Any = None, publisher: Any = None):
+        self.session_id = session_id
+        self.audit_logger = audit_logger
+        self.publisher = publisher
+        self.started_at = time.time()
+
+        self._lag: Deque[float] = deque(maxlen=MAX_TRACE_SAMPLES)
+        self._lag_max = 0.0
+        self._queue_samples: Deque[Dict[str, Any]] = deque(maxlen=MAX_TRACE_SAMPLES)
+        self._last_dropped = 0
+        self._open_turns: Dict[str, Dict[str, Any]] = {}
+        self.turns: List[Dict[str, Any]] = []
+        self.llm_calls: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        _sessions[self.session_id] = self
+        if self._task is None:
+            self._task = asyncio.create_task(self._sample_loop())
+
+    async def aclose(self):
+        _sessions.pop(self.session_id, None)
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ------------------------------------------------------------------
+    # Event-loop lag + data-channel sampling
+    # ------------------------------------------------------------------
+
+    async def _sample_loop(self):
+        loop = asyncio.get_running_loop()
+        n = 0
+        while True:
+            expected = loop.time() + LAG_SAMPLE_INTERVAL
+            await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+            lag = max(0.0, loop.time() - expected)
+            self._lag.append(lag)
+            self._lag_max = max(self._lag_max, lag)
+            if LOOP_LAG is not None:
+                LOOP_LAG.observe(lag)
+
+            n += 1
+            if self.publisher is not None and n % QUEUE_SAMPLE_EVERY == 0:
+                self._sample_queue()
+
+    def _sample_queue(self):
+        stats = self.publisher.stats()
+        self._queue_samples.append({"t": round(time.time() - self.started_at, 2), **stats})
+        if DC_QUEUE_DEPTH is not None:
+            DC_QUEUE_DEPTH.set(stats["queue_depth"])
+            DC_DROPPED.inc(max(0, stats["dropped"] - self._last_dropped))
+        self._last_dropped = stats["dropped"]
+
+    # ------------------------------------------------------------------
+    # Voice turn spans (AgentSession "metrics_collected")
+    # ------------------------------------------------------------------
+
+    def on_metrics(self, m: Any):
+        """Feed one LiveKit metrics object (EOUMetrics / LLMMetrics / TTSMetrics / ...)."""
+        speech_id = getattr(m, "speech_id", None)
+        if not speech_id:
+            return
+
+        kind = type(m).__name__
+        turn = self._open_turns.setdefault(speech_id, {"speech_id": speech_id, "t": round(time.time() - self.started_at, 2)})
+        if kind == "EOUMetrics":
+            turn["stt_final"] = m.transcription_delay
+            turn["end_of_utterance"] = m.end_of_utterance_delay
+        elif kind == "LLMMetrics":
+            turn.setdefault("llm_ttft", m.ttft)  # First LLM call of the turn (tool calls may add more)
+            turn["prompt_tokens"] = getattr(m, "prompt_tokens", None)
+        elif kind == "TTSMetrics":
+            turn.setdefault("tts_ttfb", m.ttfb)
+        else:
+            return
+
+        if all(stage in turn for stage in ("end_of_utterance", "llm_ttft", "tts_ttfb")):
+            self._close_turn(self._open_turns.pop(speech_id))
+
+    def _close_turn(self, turn: Dict[str, Any]):
+        # User stops speaking -> agent audio starts
+        turn["total"] = turn["end_of_utterance"] + turn["llm_ttft"] + turn["tts_ttfb"]
+        self.turns.append(turn)
+
+        if TURN_STAGE is not None:
+            for stage in self.STAGES + ("total",):
+                if turn.get(stage) is not None:
+                    TURN_STAGE.labels(stage=stage).observe(turn[stage])
+
+        if self.audit_logger is not None:
+            self.audit_logger.log_event(
+                "Telemetry", "TURN_LATENCY", f"{turn['total'] * 1000:.0f}ms",
+                metadata={k: v for k, v in turn.items() if k != "speech_id"}
+            )
+
+    # ------------------------------------------------------------------
+    # Side LLM calls
+    # ------------------------------------------------------------------
+
+    def record_llm_call(self, role: str, duration: float, outcome: str):
+        self.llm_calls.append({
+            "role": role,
+            "t": round(time.time() - self.started_at, 2),
+            "duration": round(duration, 4),
+            "outcome": outcome,
+        })
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def summary(self) -> Dict[str, Any]:
+        stages = {
+            stage: _percentiles([t[stage] for t in self.turns if t.get(stage) is not None])
+            for stage in self.STAGES + ("total",)
+        }
+        roles: Dict[str, List[float]] = {}
+        for call in self.llm_calls:
+            roles.setdefault(call["role"], []).append(call["duration"])
+        return {
+            "turns": len(self.turns),
+            "turn_latency_ms": stages,
+            "event_loop_lag_ms": {**_percentiles(list(self._lag)), "max": round(self._lag_max * 1000, 2)},
+            "llm_call_ms": {role: _percentiles(d) for role, d in roles.items()},
+            "data_channel": self.publisher.stats() if self.publisher is not None else None,
+        }
+
+    def export_trace(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "started_at": self.started_at,
+            "summary": self.summary(),
+            "turns": self.turns,
+            "llm_calls": self.llm_calls,
+            "event_loop_lag_s": [round(v, 4) for v in self._lag],
+            "data_channel_samples": list(self._queue_samples),
+        }
+
+    def save_trace(self, output_dir: str = ".") -> Path:
+        """Write fsir_<session>_timing.json next to the FSIR report."""
+        path = Path(output_dir) / f"fsir_{self.session_id}_timing.json"
+        with open(path, "w") as f:
+            json.dump(self.export_trace(), f, separators=(",", ":"))
+        logger.info(f">>> [TELEMETRY] Timing trace saved: {path}")
+        return path
+
+
+# =======================================================================
+# Per-session registry + LLM call timer
+# =======================================================================
+
+_sessions: Dict[str, SessionTelemetry] = {}
+
+
+def get_session_telemetry(session_id: Optional[str]) -> Optional[SessionTelemetry]:
+    return _sessions.get(session_id) if session_id else None
+
+
+@contextlib.contextmanager
+def track_llm_call(role: str, session_id: Optional[str] = None):
+    """
+    Time a side LLM call (observer / crisis / mole ...) into Prometheus and
+    the session's timing trace.
+    """
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        if LLM_CALL is not None:
+            LLM_CALL.labels(role=role, outcome=outcome).observe(duration)
+        telemetry = get_session_telemetry(session_id)
+        if telemetry is not None:
+            telemetry.record_llm_call(role, duration, outcome)
@@ -0,0 +1,173 @@
+"""
+Text Analysis
+Shared, precompiled analysis of agent messages: code fences and question
+classification, computed once per message.
+
+StreamingFenceDetector does the code-fence part incrementally on LLM tokens
+so a code block can be pushed to the IDE as soon as its closing fence is
+generated, instead of after the whole turn. While a fence is open,
+take_delta() hands out its body as append-only, line-sized patches.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+FENCE = "```"
+
+# [FIX] Robust fence regex: allow whitespace/newlines after backticks
+CODE_FENCE_RE = re.compile(r"```(?:\w+)?\s*(.*?)```", re.DOTALL)
+# Body of a single fence (language tag + leading whitespace stripped)
+_FENCE_BODY_RE = re.compile(r"(?:\w+)?\s*(.*)", re.DOTALL)
+
+# Simple heuristics to detect questions (applied to lowercased, stripped text)
+QUESTION_RE = re.compile(
+    r"\?$"
+    r"|^(?:what|how|why|when|where|who|can you|could you|would you|tell me|explain|describe)"
+    r"|(?:your approach|your first|what would|how would)"
+)
+MIN_QUESTION_LENGTH = 20  # Ignore short phrases
+
+# Word tokens for lexicon matching (whole-word boundaries)
+WORD_RE = re.compile(r"\w+")
+
+
+@dataclass
+class MessageAnalysis:
+    code_blocks: List[str] = field(default_factory=list)
+    is_question: bool = False
+
+    @property
+    def first_code_block(self) -> Optional[str]:
+        return self.code_blocks[0] if self.code_blocks else None
+
+
+def extract_code_blocks(text: str) -> List[str]:
+    """All fenced code blocks in a message, stripped."""
+    if FENCE not in text:
+        return []
+    return [m.group(1).strip() for m in CODE_FENCE_RE.finditer(text)]
+
+
+def is_question(text: str) -> bool:
+    """True if an agent message looks like a question worth logging."""
+    return len(text) > MIN_QUESTION_LENGTH and QUESTION_RE.search(text.lower().strip()) is not None
+
+
+_encoding = None
+_encoding_failed = False
+
+
+def _get_encoding():
+    """Load the tokenizer lazily (it may need to download its BPE file on first use)."""
+    global _encoding, _encoding_failed
+    if _encoding is None and tiktoken is not None and not _encoding_failed:
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding_failed = True
+    return _encoding
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count of a prompt fragment (tiktoken if available, else ~4 chars/token)."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+def estimate_chat_ctx_tokens(chat_ctx) -> int:
+    """Approximate prompt size of a LiveKit ChatContext (text content only)."""
+    total = 0
+    for item in getattr(chat_ctx, "items", []):
+        text = getattr(item, "text_content", None)
+        if text:
+            total += estimate_tokens(text) + 4  # Per-message overhead
+    return total
+
+
+def analyze_message(text: str) -> MessageAnalysis:
+    """Run every per-message check once."""
+    return MessageAnalysis(
+        code_blocks=extract_code_blocks(text),
+        is_question=is_question(text)
+    )
+
+
+class StreamingFenceDetector:
+    """
+    Incremental code-fence extractor for streamed LLM tokens.
+
+    feed() returns the code blocks whose closing fence arrived in that chunk,
+    with the same semantics as CODE_FENCE_RE on the full message.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._buffer = ""
+        self.in_fence = False
+        self.fence_index = -1   # Index of the current / last opened fence
+        self._emitted = 0       # Body chars of the open fence already handed out as deltas
+
+    def feed(self, text: str) -> List[str]:
+        completed = []
+        self._buffer += text
+
+        while True:
+            idx = self._buffer.find(FENCE)
+            if idx == -1:
+                if not self.in_fence:
+                    # Keep a tail in case the opening fence is split across tokens
+                    self._buffer = self._buffer[-(len(FENCE) - 1):]
+                return completed
+
+            if not self.in_fence:
+                self.in_fence = True
+                self.fence_index += 1
+                self._emitted = 0
+                self._buffer = self._buffer[idx + len(FENCE):]
+            else:
+                body = self._buffer[:idx]
+                completed.append(_FENCE_BODY_RE.match(body).group(1).strip())
+                self.in_fence = False
+                self._buffer = self._buffer[idx + len(FENCE):]
+
+    def take_delta(self, max_pending: int = 256) -> str:
+        """
+        New body text of the open fence since the last call.
+
+        Only complete lines are released (or everything once more than
+        max_pending chars are waiting), and trailing backticks are held back
+        since they may be the start of the closing fence. Concatenated deltas
+        are always a prefix of the final block (modulo trailing whitespace).
+        """
+        if not self.in_fence:
+            return ""
+
+        # Empty until the language tag and the whitespace after it are complete
+        body = _FENCE_BODY_RE.match(self._buffer).group(1)
+        stable = body.rstrip("`")
+        pending = stable[self._emitted:]
+
+        if len(pending) <= max_pending:
+            cut = pending.rfind("\n")
+            if cut == -1:
+                return ""
+            pending = pending[:cut + 1]
+
+        self._emitted += len(pending)
+        return pending
+
+    @property
+    def partial(self) -> str:
+        """Raw text of the currently open fence (empty when outside a fence)."""
+        return self._buffer if self.in_fence else ""
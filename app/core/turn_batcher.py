@@ -0,0 +1,323 @@
+"""
+Turn Batcher
+Micro-batches interview turns for the ObserverAgent.
+
+Instead of one LLM call per utterance (including the interviewer's own turns),
+turns are buffered into windows and each window is graded in one structured call:
+- Only candidate turns are graded; interviewer turns ride along as context
+- A window is flushed when it holds `max_turns` graded turns or `max_wait`
+  seconds after its first graded turn, whichever comes first
+- At most `max_concurrency` batch evaluations run at once; closed windows wait
+  in a priority queue (crisis answers, then code submissions, then the rest)
+- The queue is bounded: when it is full, the lowest-priority queued windows are
+  coalesced into one, so a burst costs one extra call instead of many
+- drain() flushes within a deadline and reports the turns it could not evaluate
+- The model returns {"evaluations": [{"turn": n, ...}, ...]}, one entry per
+  numbered turn, which is split back into per-turn evaluations
+
+Env:
+    AEGIS_OBSERVER_BATCH_SIZE      graded turns per window (default 5)
+    AEGIS_OBSERVER_BATCH_WAIT      seconds before a partial window is flushed (default 20)
+    AEGIS_OBSERVER_CONCURRENCY     concurrent batch evaluations (default 2)
+    AEGIS_OBSERVER_MAX_QUEUED      closed windows waiting for a slot (default 4)
+"""
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import os
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger("aegis.core.turn_batcher")
+
+BATCH_SIZE = max(1, int(os.getenv("AEGIS_OBSERVER_BATCH_SIZE", "5")))
+BATCH_WAIT = float(os.getenv("AEGIS_OBSERVER_BATCH_WAIT", "20"))
+BATCH_CONCURRENCY = max(1, int(os.getenv("AEGIS_OBSERVER_CONCURRENCY", "2")))
+MAX_QUEUED_BATCHES = max(1, int(os.getenv("AEGIS_OBSERVER_MAX_QUEUED", "4")))
+CONTEXT_TURNS = 4  # Ungraded turns carried in front of a window
+
+GRADED_SPEAKERS = ("candidate",)
+
+# Lower runs first
+PRIORITY_CRISIS = 0
+PRIORITY_CODE = 1
+PRIORITY_NORMAL = 2
+
+SPEAKER_LABELS = {
+    "candidate": "Candidate",
+    "incident_lead": "Interviewer",
+}
+
+BATCH_INSTRUCTIONS = """Evaluate each numbered Candidate turn below. Unnumbered lines are context only.
+Return ONE JSON object: {"evaluations": [ ... ]} with exactly one entry per numbered turn,
+in order. Each entry uses the JSON FORMAT above plus "turn": <number>."""
+
+
+def _label(speaker: str) -> str:
+    return SPEAKER_LABELS.get(speaker, speaker.replace("_", " ").title())
+
+
+def build_batch_prompt(window: List[Dict[str, Any]], context: Iterable[Dict[str, Any]] = ()) -> str:
+    """Render a window as a transcript with graded turns numbered [1], [2], ..."""
+    lines = [BATCH_INSTRUCTIONS, ""]
+    for entry in context:
+        lines.append(f"{_label(entry['speaker'])}: {entry['text']}")
+    n = 0
+    for entry in window:
+        if entry["graded"]:
+            n += 1
+            lines.append(f"[{n}] {_label(entry['speaker'])}: {entry['text']}")
+        else:
+            lines.append(f"{_label(entry['speaker'])}: {entry['text']}")
+    return "\n".join(lines)
+
+
+def parse_batch_response(text: str, expected: int) -> List[Optional[Dict[str, Any]]]:
+    """
+    Split a batch response into per-turn evaluations.
+
+    Returns a list of length `expected`; turns the model skipped are None.
+    Accepts {"evaluations": [...]}, a bare list, or (for a window of one)
+    a single evaluation object.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * expected
+    clean = text.strip()
+    starts = [i for i in (clean.find("{"), clean.find("[")) if i != -1]
+    if not starts:
+        return results
+    start = min(starts)
+    end = max(clean.rfind("}"), clean.rfind("]"))
+    data = json.loads(clean[start:end + 1])
+
+    if isinstance(data, dict) and isinstance(data.get("evaluations"), list):
+        items = data["evaluations"]
+    elif isinstance(data, list):
+        items = data
+    elif isinstance(data, dict) and expected == 1:
+        items = [data]
+    else:
+        return results
+
+    for position, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        try:
+            index = int(item.get("turn", position + 1)) - 1
+        except (TypeError, ValueError):
+            index = position
+        if 0 <= index < expected and results[index] is None:
+            results[index] = item
+    return results
+
+
+class TurnBatcher:
+    """
+    Buffers turns and hands windows to `evaluate(window, context)`.
+
+    Args:
+        evaluate: Coroutine called with (window entries, context entries)
+        max_turns: Graded turns per window
+        max_wait: Seconds after the first graded turn before a partial window is flushed
+        max_concurrency: Concurrent evaluate() calls
+        max_queued: Closed windows allowed to wait; beyond that they are coalesced
+        graded_speakers: Speakers whose turns are scored
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[[List[Dict[str, Any]], List[Dict[str, Any]]], Awaitable[Any]],
+        max_turns: int = BATCH_SIZE,
+        max_wait: float = BATCH_WAIT,
+        max_concurrency: int = BATCH_CONCURRENCY,
+        max_queued: int = MAX_QUEUED_BATCHES,
+        graded_speakers: Iterable[str] = GRADED_SPEAKERS,
+        context_turns: int = CONTEXT_TURNS
+    ):
+        self.evaluate = evaluate
+        self.max_turns = max_turns
+        self.max_wait = max_wait
+        self.max_concurrency = max_concurrency
+        self.max_queued = max_queued
+        self.graded_speakers = frozenset(graded_speakers)
+
+        self._window: List[Dict[str, Any]] = []
+        self._graded_in_window = 0
+        self._window_priority = PRIORITY_NORMAL
+        self._context: Deque[Dict[str, Any]] = deque(maxlen=context_turns)
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        # (priority, seq, batch) heap of closed windows waiting for a slot
+        self._queue: List[Tuple[int, int, Dict[str, Any]]] = []
+        self._seq = itertools.count()
+        self._in_flight: Dict[asyncio.Task, Dict[str, Any]] = {}
+        self._draining = False  # Set at the drain deadline: nothing new may start
+
+        # Metrics
+        self.turns_seen = 0
+        self.turns_graded = 0
+        self.batches = 0
+        self.coalesced = 0
+        self.dropped_turns = 0
+
+    # ------------------------------------------------------------------
+    # Windows
+    # ------------------------------------------------------------------
+
+    def add(self, speaker: str, text: str, priority: int = PRIORITY_NORMAL):
+        """
+        Buffer one turn. Priority turns (crisis answers, code) close their
+        window immediately so they are not held back by the time window.
+        """
+        self.turns_seen += 1
+        graded = speaker in self.graded_speakers
+        entry = {"speaker": speaker, "text": text, "graded": graded}
+
+        if not graded:
+            # Interviewer turns only matter as context for the next graded turn
+            if self._window:
+                self._window.append(entry)
+            else:
+                self._context.append(entry)
+            return
+
+        self._window.append(entry)
+        self._graded_in_window += 1
+        self._window_priority = min(self._window_priority, priority)
+        self.turns_graded += 1
+
+        if self._graded_in_window >= self.max_turns or priority < PRIORITY_NORMAL:
+            self.flush()
+        elif self._timer is None and self.max_wait > 0:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self.flush)
+
+    def flush(self):
+        """Close the current window (if it holds graded turns) and queue its evaluation."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._graded_in_window:
+            return
+
+        # Trailing interviewer turns become context for the next window
+        last_graded = max(i for i, e in enumerate(self._window) if e["graded"])
+        window, trailing = self._window[:last_graded + 1], self._window[last_graded + 1:]
+        batch = {
+            "window": window,
+            "context": list(self._context),
+            "graded": self._graded_in_window,
+        }
+        priority = self._window_priority
+
+        self._window = []
+        self._graded_in_window = 0
+        self._window_priority = PRIORITY_NORMAL
+        self._context.clear()
+        self._context.extend(window)
+        self._context.extend(trailing)
+
+        heapq.heappush(self._queue, (priority, next(self._seq), batch))
+        while len(self._queue) > self.max_queued:
+            self._coalesce_lowest()
+        self._dispatch()
+
+    # ------------------------------------------------------------------
+    # Queue
+    # ------------------------------------------------------------------
+
+    def _coalesce_lowest(self):
+        """Merge the two lowest-priority queued windows into one (in turn order)."""
+        self._queue.sort()
+        (p1, s1, b1), (p2, s2, b2) = self._queue.pop(), self._queue.pop()
+        (first_seq, first), (_, second) = sorted(((s1, b1), (s2, b2)), key=lambda x: x[0])
+        merged = {
+            "window": first["window"] + second["window"],
+            "context": first["context"],
+            "graded": first["graded"] + second["graded"],
+        }
+        self._queue.append((min(p1, p2), first_seq, merged))
+        heapq.heapify(self._queue)
+        self.coalesced += 1
+
+    def _dispatch(self):
+        if self._draining:
+            return
+        while self._queue and len(self._in_flight) < self.max_concurrency:
+            _, _, batch = heapq.heappop(self._queue)
+            self.batches += 1
+            task = asyncio.create_task(self._run(batch))
+            self._in_flight[task] = batch
+            task.add_done_callback(self._on_done)
+
+    def _on_done(self, task: asyncio.Task):
+        self._in_flight.pop(task, None)
+        self._dispatch()
+
+    async def _run(self, batch: Dict[str, Any]):
+        try:
+            await self.evaluate(batch["window"], batch["context"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Observer batch evaluation failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Shutdown
+    # ------------------------------------------------------------------
+
+    async def drain(self, timeout: float = 10.0) -> Dict[str, Any]:
+        """
+        Flush the open window and evaluate everything queued within `timeout`.
+
+        Queued windows are first coalesced down to one per slot, so the tail
+        of the interview costs a single round of calls. Whatever is still
+        running at the deadline is cancelled and counted, never silently lost.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        self.flush()
+        while len(self._queue) > self.max_concurrency:
+            self._coalesce_lowest()
+        self._dispatch()
+
+        while self._in_flight or self._queue:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.wait(set(self._in_flight), timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+
+        dropped = sum(b["graded"] for b in self._in_flight.values()) + sum(b["graded"] for _, _, b in self._queue)
+        # [FIX] Stop dispatching before cancelling: a cancelled task's done callback
+        # would otherwise start a queued window after the deadline
+        self._draining = True
+        self._queue.clear()
+        for task in list(self._in_flight):
+            task.cancel()
+        if self._in_flight:
+            await asyncio.wait(set(self._in_flight), timeout=1.0)
+        self.dropped_turns += dropped
+        if dropped:
+            logger.warning(f">>> Observer drain deadline hit: {dropped} candidate turns not evaluated")
+        return {"dropped_turns": dropped, **self.stats()}
+
+    @property
+    def pending_tasks(self) -> Set[asyncio.Task]:
+        return set(self._in_flight)
+
+    @property
+    def pending(self) -> int:
+        """Batches in flight or queued, plus the open window (for worker load reporting)."""
+        return len(self._in_flight) + len(self._queue) + (1 if self._graded_in_window else 0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "turns_seen": self.turns_seen,
+            "turns_graded": self.turns_graded,
+            "batches": self.batches,
+            "coalesced": self.coalesced,
+            "queued": len(self._queue),
+            "in_flight": len(self._in_flight),
+            "dropped_turns": self.dropped_turns,
+            "llm_calls_saved": max(0, self.turns_seen - self.batches),
+        }
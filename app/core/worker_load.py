@@ -0,0 +1,141 @@
+"""
+Worker Load
+Tracks the interview sessions hosted by this worker process and reports real
+load to the LiveKit AgentServer, so dispatch avoids saturated workers.
+
+With AEGIS_SESSIONS_PER_PROCESS > 1 the worker runs jobs as threads inside
+one process: VAD, scenarios, the Knowledge Engine index and the LLM router
+are shared, while per-session state (candidate context, loggers, agents)
+stays with each job.
+
+Load = max(CPU utilisation, active sessions / capacity, pending LLM calls / limit)
+"""
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger("aegis.core.worker_load")
+
+SESSIONS_PER_PROCESS = max(1, int(os.getenv("AEGIS_SESSIONS_PER_PROCESS", "1")))
+MAX_PENDING_LLM_CALLS = max(1, int(os.getenv("AEGIS_MAX_PENDING_LLM_CALLS", str(8 * SESSIONS_PER_PROCESS))))
+LOAD_THRESHOLD = float(os.getenv("AEGIS_LOAD_THRESHOLD", "0.85"))
+
+
+@dataclass
+class _SessionEntry:
+    session_id: str
+    room_name: str
+    started_at: float = field(default_factory=time.monotonic)
+    pending_fn: Optional[Callable[[], int]] = None  # e.g. in-flight observer evaluations
+
+
+class SessionRegistry:
+    """Thread-safe registry of the sessions running in this process."""
+
+    def __init__(self, capacity: int = SESSIONS_PER_PROCESS):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, _SessionEntry] = {}
+        self._shared: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+
+    def register(self, session_id: str, room_name: str = "", pending_fn: Optional[Callable[[], int]] = None):
+        with self._lock:
+            self._sessions[session_id] = _SessionEntry(session_id, room_name, pending_fn=pending_fn)
+            active = len(self._sessions)
+        logger.info(f">>> [WORKER] Session {session_id} started ({active}/{self.capacity} active)")
+
+    def set_pending_fn(self, session_id: str, pending_fn: Callable[[], int]):
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry:
+                entry.pending_fn = pending_fn
+
+    def unregister(self, session_id: str):
+        """Idempotent; safe to call from both shutdown callbacks and the entrypoint."""
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            active = len(self._sessions)
+        if entry:
+            logger.info(
+                f">>> [WORKER] Session {session_id} ended after {time.monotonic() - entry.started_at:.0f}s "
+                f"({active}/{self.capacity} active)"
+            )
+
+    @property
+    def active_sessions(self) -> int:
+        return len(self._sessions)
+
+    def pending_session_calls(self) -> int:
+        with self._lock:
+            fns = [e.pending_fn for e in self._sessions.values() if e.pending_fn]
+        total = 0
+        for fn in fns:
+            try:
+                total += fn()
+            except Exception:
+                pass
+        return total
+
+    # ------------------------------------------------------------------
+    # Shared heavy objects
+    # ------------------------------------------------------------------
+
+    def shared(self, key: str, factory: Callable[[], Any]) -> Any:
+        """Process-wide lazily built object (VAD model, scenario loader, ...)."""
+        with self._lock:
+            if key not in self._shared:
+                logger.info(f">>> [WORKER] Loading shared resource: {key}")
+                self._shared[key] = factory()
+            return self._shared[key]
+
+    # ------------------------------------------------------------------
+    # Load
+    # ------------------------------------------------------------------
+
+    def pending_llm_calls(self) -> int:
+        from app.core.llm_router import llm_router
+
+        return llm_router.in_flight + self.pending_session_calls()
+
+    def snapshot(self) -> Dict[str, Any]:
+        cpu = cpu_utilisation()
+        pending = self.pending_llm_calls()
+        active = self.active_sessions
+        load = max(cpu, active / self.capacity, pending / MAX_PENDING_LLM_CALLS)
+        return {
+            "load": round(min(1.0, load), 3),
+            "cpu": round(cpu, 3),
+            "active_sessions": active,
+            "capacity": self.capacity,
+            "pending_llm_calls": pending,
+        }
+
+    def compute_load(self, *_args) -> float:
+        """AgentServer load_fnc (the server instance argument is not needed)."""
+        return self.snapshot()["load"]
+
+
+def cpu_utilisation() -> float:
+    """Whole-machine CPU usage in [0, 1] (non-blocking)."""
+    if psutil is not None:
+        return psutil.cpu_percent(interval=None) / 100.0
+    try:
+        return min(1.0, os.getloadavg()[0] / (os.cpu_count() or 1))
+    except (AttributeError, OSError):
+        return 0.0
+
+
+# Singleton Instance Export
+session_registry = SessionRegistry()
@@ -22,7 +22,7 @@ class SessionAuditLogger:
         self.events: List[AuditEvent] = []
         self._start_time = datetime.utcnow()
 
-    def log_event(self, actor: str, event_type: str, details: str, metadata: Dict[str, Any] = None):
+    def log_event(self, actor: str, event_type: str, details: str, metadata: Dict[str, Any] = None) -> AuditEvent:
         """
         Record an event in the session timeline.
         """
@@ -35,6 +35,7 @@ class SessionAuditLogger:
         )
         self.events.append(event)
         # We could also stream this to a file or DB here if needed
+        return event
         
     def export_logs(self) -> List[Dict[str, Any]]:
         """
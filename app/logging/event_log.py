@@ -0,0 +1,169 @@
+"""
+Event Log
+Structured, sampled logging for hot callbacks in the voice path.
+
+- setup_logging() moves every handler behind a QueueHandler, so a log call
+  from the event loop only enqueues a record; a background thread does the
+  stdout / file I/O
+- EventLogger checks the level before building anything and samples per
+  category (e.g. log 1 in 10 observer turns)
+- Transcript payloads (text=..., context=...) are replaced by their size
+  unless AEGIS_LOG_TRANSCRIPTS=1
+
+Env:
+    AEGIS_LOG_LEVEL          root level (default INFO)
+    AEGIS_LOG_FORMAT         "json" for JSON lines, otherwise plain text
+    AEGIS_LOG_TRANSCRIPTS    "1" to include transcript / context payloads
+    AEGIS_LOG_SAMPLE_<CAT>   sample rate per category, e.g. AEGIS_LOG_SAMPLE_OBSERVER=0.1
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from typing import Any, Dict, Optional
+
+# Fields that carry candidate / agent speech or resume data
+PAYLOAD_FIELDS = ("text", "transcript", "context", "content")
+
+# Default sample rates per category (1.0 = every event)
+DEFAULT_SAMPLE_RATES: Dict[str, float] = {
+    "transcript": 1.0,
+    "observer": 0.2,
+    "dqi": 1.0,
+    "interview": 1.0,
+}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+def transcripts_enabled() -> bool:
+    return os.getenv("AEGIS_LOG_TRANSCRIPTS", "0").lower() in ("1", "true", "yes")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; structured fields from EventLogger are merged in."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "aegis_fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def setup_logging(level: Optional[str] = None, json_format: Optional[bool] = None):
+    """
+    Route all logging through a non-blocking queue (idempotent, once per process).
+    Existing root handlers are kept and run on the listener thread.
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        root = logging.getLogger()
+        root.setLevel(level or os.getenv("AEGIS_LOG_LEVEL", "INFO"))
+        if json_format is None:
+            json_format = os.getenv("AEGIS_LOG_FORMAT", "").lower() == "json"
+
+        handlers = list(root.handlers) or [logging.StreamHandler()]
+        for handler in handlers:
+            root.removeHandler(handler)
+            if json_format:
+                handler.setFormatter(JsonFormatter())
+
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        for f in root.filters:
+            queue_handler.addFilter(f)
+        root.addHandler(queue_handler)
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_stop_listener)
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class EventLogger:
+    """
+    Sampled, level-gated structured logger for one category.
+
+    Usage:
+        transcript_log = get_event_logger("transcript")
+        transcript_log.info("user_speech", text=ev.transcript, final=True)
+    """
+
+    def __init__(self, category: str, sample_rate: Optional[float] = None):
+        self.category = category
+        self.logger = logging.getLogger(f"aegis.events.{category}")
+        env_rate = os.getenv(f"AEGIS_LOG_SAMPLE_{category.upper()}")
+        if env_rate is not None:
+            sample_rate = float(env_rate)
+        elif sample_rate is None:
+            sample_rate = DEFAULT_SAMPLE_RATES.get(category, 1.0)
+        # Deterministic 1-in-N sampling (no RNG in the hot path)
+        self._every = max(1, round(1 / sample_rate)) if sample_rate > 0 else 0
+        self._count = 0
+        self.suppressed = 0
+
+    def _sampled(self) -> bool:
+        if self._every == 0:
+            return False
+        self._count += 1
+        return (self._count - 1) % self._every == 0
+
+    def log(self, level: int, event: str, **fields: Any):
+        if not self.logger.isEnabledFor(level):
+            return
+        # Warnings and errors are never sampled away
+        if level < logging.WARNING and not self._sampled():
+            self.suppressed += 1
+            return
+
+        if not transcripts_enabled():
+            for key in PAYLOAD_FIELDS:
+                if key in fields:
+                    value = fields.pop(key)
+                    fields[f"{key}_chars"] = len(value) if isinstance(value, (str, list, dict)) else None
+
+        summary = " ".join(f"{k}={v}" for k, v in fields.items())
+        self.logger.log(
+            level, f"{event} {summary}".rstrip(),
+            extra={"aegis_fields": {"category": self.category, "event": event, **fields}}
+        )
+
+    def debug(self, event: str, **fields: Any):
+        self.log(logging.DEBUG, event, **fields)
+
+    def info(self, event: str, **fields: Any):
+        self.log(logging.INFO, event, **fields)
+
+    def warning(self, event: str, **fields: Any):
+        self.log(logging.WARNING, event, **fields)
+
+
+_event_loggers: Dict[str, EventLogger] = {}
+
+
+def get_event_logger(category: str) -> EventLogger:
+    """Shared EventLogger per category."""
+    if category not in _event_loggers:
+        _event_loggers[category] = EventLogger(category)
+    return _event_loggers[category]
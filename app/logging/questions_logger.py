@@ -4,10 +4,11 @@ Logs all questions, answers, and code submissions during an interview.
 """
 import json
 import logging
-import re
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
+from app.core.text_analysis import is_question as classify_question
+
 logger = logging.getLogger("aegis.logging.questions_logger")
 
 
@@ -131,29 +132,21 @@ class QuestionsLogger:
         """Log a dynamically generated question."""
         return self.log_question(question, question_type="dynamic", source="QuestionGenerator")
         
-    def detect_and_log_question(self, agent_speech: str) -> bool:
+    def detect_and_log_question(self, agent_speech: str, is_question: Optional[bool] = None) -> bool:
         """
         Automatically detect if agent speech is a question and log it.
         
         Args:
             agent_speech: The agent's speech text
+            is_question: Precomputed classification (from analyze_message), if available
             
         Returns:
             True if a question was detected and logged
         """
-        # Simple heuristics to detect questions
-        speech_lower = agent_speech.lower().strip()
-        
-        # Check for question patterns
-        question_patterns = [
-            r'\?$',  # Ends with ?
-            r'^(what|how|why|when|where|who|can you|could you|would you|tell me|explain|describe)',
-            r'(your approach|your first|what would|how would)',
-        ]
+        if is_question is None:
+            is_question = classify_question(agent_speech)
         
-        is_question = any(re.search(p, speech_lower) for p in question_patterns)
-        
-        if is_question and len(agent_speech) > 20:  # Ignore short phrases
+        if is_question:
             self.log_question(agent_speech, question_type="theory", source="IncidentLead")
             return True
             
@@ -176,12 +169,16 @@ class QuestionsLogger:
             "questions": self._questions
         }
         
-    def save_to_file(self, filename: Optional[str] = None) -> str:
+    def save_to_file(self, filename: Optional[str] = None, indent: Optional[int] = None) -> str:
         """
-        Save the questions log to a JSON file.
+        Save the questions log to a JSON file (compact unless indent is given).
+        
+        The agent archives the log with the session bundle instead
+        (see app/analysis/session_archive.py); this is for manual exports.
         
         Args:
             filename: Custom filename, or auto-generate
+            indent: Pretty-print indentation
             
         Returns:
             Path to saved file
@@ -192,7 +189,7 @@ class QuestionsLogger:
         self.finalize()
         
         with open(filename, "w") as f:
-            json.dump(self.export_json(), f, indent=2)
+            json.dump(self.export_json(), f, indent=indent, separators=None if indent else (",", ":"))
             
         logger.info(f">>> Questions log saved: {filename}")
         return filename
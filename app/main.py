@@ -22,6 +22,7 @@ from livekit.agents import (
     AgentServer,
     AgentSession,
     JobContext,
+    JobExecutorType,
     JobProcess,
     WorkerOptions,
     cli,
@@ -32,51 +33,68 @@ from livekit.agents import (
     inference,
     llm,
 )
-from livekit.plugins import deepgram, groq, silero
+from livekit.plugins import deepgram, silero
 import json
 from app.logging.audit_logger import SessionAuditLogger
-from app.analysis.pipeline import InterviewPipeline
-from app.analysis.pdf_generator import PDFReportGenerator  # [NEW] PDF Report
+from app.analysis.report_jobs import SESSIONS_DIR, save_session_bundle, enqueue_report_job, save_live_score
+from app.analysis.dqi_calculator import RunningDQI
 from backend.funnel.pipeline import knowledge_engine  # Explicit Import
 
 from app.agents.incident_lead import IncidentLead
 from app.agents.pressure import PressureAgent
 from app.agents.observer import ObserverAgent
+from app.core.turn_batcher import PRIORITY_CODE, PRIORITY_CRISIS, PRIORITY_NORMAL
 from app.agents.mole import MoleAgent
 from app.agents.governor import GovernorAgent # [NEW]
 from app.agents.crisis_popup import CrisisPopupAgent  # [NEW] Crisis Pop-up
 from app.agents.tools import ToggleNotepad
 from app.rag.scenarios import ScenarioLoader
-from app.core.end_detector import check_end_phrase, get_goodbye_message  # [NEW] End detection
+from app.core.end_detector import EndIntentDetector, get_goodbye_message  # [NEW] End detection
 from app.core.interview_timer import InterviewTimer  # [NEW] 40-min timer
 from app.logging.questions_logger import QuestionsLogger  # [NEW] Questions log
 from app.core.scenario_generator import ScenarioGenerator  # [NEW] Custom Generator
 
-# Backend Imports (for Dev Mode Resume Loading)
-from backend.resume_validator import validate_resume
-from backend.main import UPLOADS_DIR, extract_candidate_context, detect_candidate_field
-import os
+from app.core.data_channel import get_publisher, close_publisher
+from app.core.llm_router import llm_router
+from app.core.text_analysis import analyze_message, estimate_chat_ctx_tokens
+from app.core.code_submissions import CodeSubmissionStore
+from app.core.context_manager import ChatContextManager
+from app.core.worker_load import session_registry, SESSIONS_PER_PROCESS, LOAD_THRESHOLD
+from app.core.telemetry import SessionTelemetry, start_metrics_server
+from app.logging.event_log import setup_logging, get_event_logger
 
 load_dotenv(dotenv_path=".env.local")
 logger = logging.getLogger("aegis.main")
+transcript_log = get_event_logger("transcript")
+
+# [TUNING] Endpointing delay; also the minimum stability window for interim end phrases
+MIN_ENDPOINTING_DELAY = 0.8
 
 # Debug: Check keys
 if not os.getenv("GROQ_API_KEY"):
-    print("ERROR: GROQ_API_KEY not found in env!")
+    logger.error("GROQ_API_KEY not found in env!")
 if not os.getenv("DEEPGRAM_API_KEY"):
-    print("ERROR: DEEPGRAM_API_KEY not found in env!")
-
-server = AgentServer()
+    logger.error("DEEPGRAM_API_KEY not found in env!")
+
+# [SCALE] Several interviews per process (jobs as threads) when AEGIS_SESSIONS_PER_PROCESS > 1.
+# Load reported to LiveKit = max(CPU, active sessions / capacity, pending LLM calls / limit).
+server = AgentServer(
+    job_executor_type=JobExecutorType.THREAD if SESSIONS_PER_PROCESS > 1 else JobExecutorType.PROCESS,
+    load_fnc=session_registry.compute_load,
+    load_threshold=LOAD_THRESHOLD,
+)
 
 def prewarm(proc: JobProcess):
-    """Preload models."""
-    print("DEBUG: prewarm STARTing...")
-    proc.userdata["vad"] = silero.VAD.load()
-    print("DEBUG: VAD Loaded")
+    """Preload models (built once per process, shared by every session in it)."""
+    setup_logging()  # Non-blocking queue handler for everything below
+    logger.debug("prewarm starting")
+    proc.userdata["vad"] = session_registry.shared("vad", silero.VAD.load)
+    logger.debug("VAD loaded")
     # Pre-loading scenario loader
-    proc.userdata["scenarios"] = ScenarioLoader()
-    print("DEBUG: Scenarios Loaded")
-    print("DEBUG: prewarm FINISHED")
+    proc.userdata["scenarios"] = session_registry.shared("scenarios", ScenarioLoader)
+    logger.debug("Scenarios loaded")
+    start_metrics_server()  # Prometheus /metrics if AEGIS_METRICS_PORT is set
+    logger.debug("prewarm finished")
 
 server.setup_fnc = prewarm
 
@@ -86,17 +104,14 @@ async def my_agent(ctx: JobContext):
     Main entrypoint for the Aegis Forge Interview Loop.
     Supports dynamic scenario selection based on resume audit.
     """
-    print(f"DEBUG: my_agent STARTED for room {ctx.room.name}") # <--- DEBUG
+    logger.debug(f"my_agent started for room {ctx.room.name}")
+    # Own candidate state for this job (other sessions may share the process)
+    knowledge_engine.begin_session()
+    session_registry.register(ctx.job.id, room_name=ctx.room.name)
     logger.info(f"Connecting to room {ctx.room.name}")
     await ctx.connect()
-    print("DEBUG: my_agent CONNECTED") # <--- DEBUG
+    logger.debug("my_agent connected")
     
-    # DEFERRED IMPORTS: These are loaded here to avoid blocking process initialization
-    from backend.funnel.pipeline import knowledge_engine
-    from backend.resume_validator import validate_resume
-    from backend.main import UPLOADS_DIR, extract_candidate_context, detect_candidate_field
-    logger.info(">>> Backend modules loaded (deferred)")
-
     # Check for resume audit file (can be passed via metadata or default path)
     # Format: "audit:/path/to/candidate_full_audit.json"
     loader: ScenarioLoader = ctx.proc.userdata["scenarios"]
@@ -151,8 +166,7 @@ async def my_agent(ctx: JobContext):
         logger.info(f">>> Generatng Custom Scenario for: {custom_role}")
         
         # Need an LLM instance for the generator
-        gen_llm = groq.LLM(model="llama-3.1-8b-instant", api_key=os.getenv("GROQ_API_KEY"))
-        generator = ScenarioGenerator(gen_llm)
+        generator = ScenarioGenerator(llm_router.for_role("qgen"))
         
         # PRE-GENERATION ANNOUNCEMENT (Optional)
         # await ctx.room.local_participant.publish_data(json.dumps({"type": "STATUS", "msg": "Generating Scenario..."}).encode(), reliable=True)
@@ -172,18 +186,14 @@ async def my_agent(ctx: JobContext):
     logger.info(f"Starting interview: {scenario.title}")
 
     # Initialize Components
-    groq_key = os.getenv("GROQ_API_KEY")
-    groq_llm = groq.LLM(
-        model="llama-3.1-8b-instant", # [FALLBACK] Rate Limit on 70b
-        api_key=groq_key,
-    )
+    # Roles map to prioritized model lists (split rate limits, fail over on 429/timeout)
+    groq_llm = llm_router.for_role("lead")
+    observer_llm = llm_router.for_role("observer")
+    crisis_llm = llm_router.for_role("crisis")
+    qgen_llm = llm_router.for_role("qgen")
     
-    # [FIX] Use separate model for Observer to split Rate Limits
-    # Mixtral has separate quota? Or at least reduces 8b usage load
-    observer_llm = groq.LLM(
-        model="mixtral-8x7b-32768", 
-        api_key=groq_key,
-    )
+    # Single ordered outbound bus for every frontend message in this room
+    publisher = get_publisher(ctx.room)
     
     # Initialize Audit Logger
     audit_logger = SessionAuditLogger(
@@ -192,6 +202,11 @@ async def my_agent(ctx: JobContext):
     )
     audit_logger.log_event("System", "SESSION_START", "Interview session initialized")
     
+    # Latency instrumentation: loop lag, per-turn spans, side LLM calls, data-channel queue
+    telemetry = SessionTelemetry(audit_logger.session_id, audit_logger=audit_logger, publisher=publisher)
+    telemetry.start()
+    usage_collector = metrics.UsageCollector()
+    
     # Initialize Questions Logger [NEW]
     questions_logger = QuestionsLogger(
         session_id=ctx.job.id,
@@ -199,6 +214,9 @@ async def my_agent(ctx: JobContext):
         domain=scenario.domain
     )
     
+    # Latest code per file, for diff-based ALGO_SUBMIT context injection
+    code_store = CodeSubmissionStore()
+    
     # Create the AgentSession (Pipeline)
     session = AgentSession(
         # STT: Deepgram (Low Latency)
@@ -213,7 +231,7 @@ async def my_agent(ctx: JobContext):
         vad=ctx.proc.userdata["vad"],
         
         # [TUNING] Increased for noisy hackathon environment
-        min_endpointing_delay=0.8,  # Wait longer before considering speech ended
+        min_endpointing_delay=MIN_ENDPOINTING_DELAY,  # Wait longer before considering speech ended
     )
 
     # 1. Incident Lead (Hiring Manager)
@@ -221,7 +239,7 @@ async def my_agent(ctx: JobContext):
     # CRITICAL: Wrap in try/except to prevent timeout during assignment
     logger.info(">>> Initializing IncidentLead (this may take a moment)...")
     try:
-        lead_agent_logic = IncidentLead(scenario, groq_llm, audit_logger, room=ctx.room)
+        lead_agent_logic = IncidentLead(scenario, groq_llm, audit_logger, room=ctx.room, qgen_llm=qgen_llm)
         logger.info(">>> IncidentLead initialized successfully.")
     except Exception as e:
         logger.error(f">>> IncidentLead initialization failed: {e}")
@@ -233,16 +251,16 @@ async def my_agent(ctx: JobContext):
         )
         logger.warning(">>> Using fallback simple agent.")
     
-    # [IMPROVEMENT] Wait for Dynamic Questions to be generated (async)
-    # This prevents the "Generic Question" issue
-    if hasattr(lead_agent_logic, 'await_dynamic_questions'):
-        await lead_agent_logic.await_dynamic_questions()
+    # Keeps the lead's chat context within a token budget (background summarization)
+    # (a compaction may drop the code the diffs refer to, so the next code submission goes in full)
+    context_manager = ChatContextManager(lead_agent_logic, on_compact=code_store.reset_base)
     
     # 2. Pressure Agent (Stakeholder)
     pressure_agent = PressureAgent(ctx.room, lead_agent_logic, scenario.stakeholder_persona, groq_llm, audit_logger)
     
     # 3. Observer Agent (Grader)
-    observer_agent = ObserverAgent(scenario.observer_metrics, groq_llm, audit_logger)
+    observer_agent = ObserverAgent(scenario.observer_metrics, observer_llm, audit_logger)
+    session_registry.set_pending_fn(ctx.job.id, lambda: observer_agent.batcher.pending)
     
     # 4. Mole Agent (Integrity Tester)
     # Using a simplified mock persona for now or from scenario if available
@@ -250,10 +268,33 @@ async def my_agent(ctx: JobContext):
     mole_agent = MoleAgent(ctx.room, mole_persona, groq_llm, audit_logger)
 
     # 5. Governor Agent (Safety Valve) [NEW]
-    # Instantiate with default high-risk keywords
-    governor_agent = GovernorAgent()
+    # Default high-risk keywords + optional lexicon file (AEGIS_GOVERNOR_LEXICON)
+    def on_governor_intervention(reason: str):
+        logger.critical(f"GOVERNOR INTERVENTION: {reason}")
+        audit_logger.log_event("GovernorAgent", "SAFETY_INTERVENTION", reason)
+    
+    governor_agent = GovernorAgent(on_intervention=on_governor_intervention)
+    # Real observer confidence arrives as each evaluation completes
+    observer_agent.evaluation_listeners.append(governor_agent.observe_evaluation)
     logger.info("Governor Agent initialized.")
 
+    # [NEW] Live DQI: updated per evaluation, streamed to the room and the gateway
+    live_dqi = RunningDQI(audit_logger.session_id)
+
+    def on_live_score(record):
+        live_dqi.add(record)
+        live = live_dqi.live()
+        publisher.publish({
+            "type": "DQI_UPDATE",
+            "overall_score": live["overall_score"],
+            "evaluations": live["evaluations"],
+            "last_score": live["last_score"],
+            "radar": live["radar"],
+        })
+        save_live_score(audit_logger.session_id, live)
+
+    observer_agent.evaluation_listeners.append(on_live_score)
+
     # 6. Crisis Popup Agent [NEW]
     # Get candidate name for personalization
     candidate_name = None
@@ -270,7 +311,7 @@ async def my_agent(ctx: JobContext):
     crisis_popup_agent = CrisisPopupAgent(
         room=ctx.room,
         domain=scenario.domain,
-        llm_instance=groq_llm,
+        llm_instance=crisis_llm,
         audit_logger=audit_logger,
         lead_agent=lead_agent_logic,
         session=session,        # [FIX] Pass session for immediate speech
@@ -344,14 +385,11 @@ async def my_agent(ctx: JobContext):
             logger.error(f"Failed to say goodbye: {e}")
         
         # 3. Send END_INTERVIEW signal to frontend
-        try:
-            payload = json.dumps({
-                "type": "INTERVIEW_END",
-                "reason": reason
-            }).encode("utf-8")
-            await ctx.room.local_participant.publish_data(payload, reliable=True)
-        except Exception as e:
-            logger.error(f"Failed to send end signal: {e}")
+        publisher.publish({
+            "type": "INTERVIEW_END",
+            "reason": reason
+        })
+        await publisher.flush()
         
         # 4. Wait a moment for goodbye to finish
         await asyncio.sleep(3)
@@ -386,6 +424,23 @@ async def my_agent(ctx: JobContext):
 
     # [NEW] Human Handover Flag
     is_human_mode = False
+    
+    # End-of-interview intent (interim transcripts arm it; confirmed once, on EOU
+    # or after the endpointing delay so mid-sentence pauses don't end the interview)
+    def _confirm_end_intent():
+        logger.warning("!!! SHUTDOWN TRIGGERED by interim end phrase")
+        asyncio.create_task(graceful_shutdown("user_request"))
+    
+    end_intent = EndIntentDetector(confirm_window=MIN_ENDPOINTING_DELAY, on_confirm=_confirm_end_intent)
+
+    # --- Pipeline metrics (STT / EOU / LLM / TTS) -> per-turn spans ---
+    @session.on("metrics_collected")
+    def on_metrics_collected(ev):
+        metrics.log_metrics(ev.metrics)
+        usage_collector.collect(ev.metrics)
+        telemetry.on_metrics(ev.metrics)
+        if type(ev.metrics).__name__ == "EOUMetrics":
+            end_intent.on_end_of_utterance()
 
     # --- Wire Transcripts to Observer Agent ---
     @session.on("user_input_transcribed")
@@ -396,42 +451,44 @@ async def my_agent(ctx: JobContext):
             return
 
         # ev is UserInputTranscribedEvent with `transcript` and `is_final`
+        if not ev.is_final:
+            # Earlier end detection: arms on an end phrase, the detector confirms it
+            end_intent.feed(ev.transcript, is_final=False)
+            return
+        
         if ev.is_final:
-            print(f"DEBUG: User Speech Detected: {ev.transcript}")  # <--- Added Debug
+            transcript_log.info("user_speech", session=audit_logger.session_id, text=ev.transcript)
             audit_logger.log_event("Candidate", "TRANSCRIPT", ev.transcript)
-            observer_agent.log_turn("candidate", ev.transcript)
+            # Crisis answers jump the observer queue
+            observer_agent.log_turn(
+                "candidate", ev.transcript,
+                priority=PRIORITY_CRISIS if crisis_popup_agent.in_crisis() else PRIORITY_NORMAL
+            )
             
             # [FIX] Log User Answer
             questions_logger.log_answer(ev.transcript)
 
             # --- GOVERNOR SAFETY CHECK [NEW] ---
-            # We pass a default confidence of 1.0 for now as we don't have real-time confidence stream
-            is_safe = governor_agent.check_safety(ev.transcript, observer_confidence=1.0)
+            # Keyword scan of this transcript only; the low-confidence streak is
+            # reported once by on_governor_intervention (observe_evaluation)
+            is_safe = governor_agent.check_safety(ev.transcript)
             if not is_safe:
-                logger.critical(f"GOVERNOR INTERVENTION: Safety violation detected in '{ev.transcript}'")
-                audit_logger.log_event("GovernorAgent", "SAFETY_INTERVENTION", f"Risk detected: {ev.transcript}")
+                logger.critical(f"GOVERNOR INTERVENTION: High risk keyword in '{ev.transcript}'")
+                audit_logger.log_event("GovernorAgent", "SAFETY_INTERVENTION", f"Risk keyword detected: {ev.transcript}")
                 # Future: await session.connection.disconnect()
             # -----------------------------------
 
             # --- END PHRASE DETECTION [NEW] ---
-            if check_end_phrase(ev.transcript):
+            if end_intent.feed(ev.transcript, is_final=True):
                 logger.warning(f"!!! SHUTDOWN TRIGGERED by transcript: '{ev.transcript}'")
-                import asyncio
                 asyncio.create_task(graceful_shutdown("user_request"))
+            if end_intent.triggered:
                 return  # Skip further processing
             # -----------------------------------
             
             # BROADCAST TO FRONTEND
-            try:
-                import asyncio
-                # Removed topic="chat" for backward compatibility
-                task = asyncio.create_task(ctx.room.local_participant.publish_data(
-                    json.dumps({"type": "TRANSCRIPTION", "sender": "YOU", "text": ev.transcript}).encode("utf-8"),
-                    reliable=True
-                ))
-                task.add_done_callback(lambda t: logger.info(f"Broadcasted USER transcript: {len(ev.transcript)} chars"))
-            except Exception as e:
-                logger.error(f"Failed to broadcast USER transcript: {e}")
+            # Removed topic="chat" for backward compatibility
+            publisher.publish({"type": "TRANSCRIPTION", "sender": "YOU", "text": ev.transcript})
             
     @session.on("conversation_item_added")
     def on_agent_speech(ev):
@@ -447,49 +504,36 @@ async def my_agent(ctx: JobContext):
                 content = str(raw_content)
                 
             if content:
-                print(f"DEBUG: Agent Speech Detected: {content}")
+                transcript_log.info("agent_speech", session=audit_logger.session_id, text=content)
                 audit_logger.log_event("IncidentLead", "TRANSCRIPT", content)
-                observer_agent.log_turn("incident_lead", content)
+                observer_agent.log_turn("incident_lead", content)  # Context only, not graded
+                
+                # Single pass: code fences, question classification, end phrases
+                analysis = analyze_message(content)
                 
                 # [NEW] Check for Code Blocks and Auto-Push to IDE
-                import re
-                # [FIX] More robust regex: allow whitespace/newlines after backticks
-                code_match = re.search(r"```(?:\w+)?\s*(.*?)```", content, re.DOTALL)
-                if code_match:
-                    extracted_code = code_match.group(1).strip()
+                # (skipped if the LLM stream tap already pushed it when the fence closed)
+                extracted_code = analysis.first_code_block
+                already_streamed = (
+                    hasattr(lead_agent_logic, 'consume_streamed_code')
+                    and lead_agent_logic.consume_streamed_code(extracted_code)
+                )
+                if extracted_code and not already_streamed:
                     logger.info(f">>> DETECTED CODE BLOCK ({len(extracted_code)} chars). Push to IDE.")
-                    try:
-                        asyncio.create_task(ctx.room.local_participant.publish_data(
-                            json.dumps({
-                                "type": "CODE_SNAPSHOT",
-                                "code": extracted_code
-                            }).encode("utf-8"),
-                            reliable=True
-                        ))
-                    except Exception as e:
-                        logger.error(f"Failed to push code to IDE: {e}")
+                    publisher.publish({
+                        "type": "CODE_SNAPSHOT",
+                        "code": extracted_code
+                    })
 
                 # [NEW] Log questions to questions logger
-                questions_logger.detect_and_log_question(content)
+                questions_logger.detect_and_log_question(content, is_question=analysis.is_question)
                 
                 # BROADCAST TO FRONTEND
-                try:
-                    # Removed topic="chat" for backward compatibility
-                    task = asyncio.create_task(ctx.room.local_participant.publish_data(
-                        json.dumps({"type": "TRANSCRIPTION", "sender": "AGENT", "text": content}).encode("utf-8"),
-                        reliable=True
-                    ))
-                    # Add callback to log success/failure of task
-                    def _log_broadcast_result(t):
-                        try:
-                            t.result()
-                            logger.info(f"Broadcasted AGENT transcript: {len(content)} chars")
-                        except Exception as e:
-                            logger.error(f"Async Broadcast Failed: {e}")
-                    task.add_done_callback(_log_broadcast_result)
-                    
-                except Exception as e:
-                    logger.error(f"Failed to broadcast AGENT transcript: {e}")
+                # Removed topic="chat" for backward compatibility
+                publisher.publish({"type": "TRANSCRIPTION", "sender": "AGENT", "text": content})
+                
+                # Agent turn done: summarize older turns if the context is over budget
+                context_manager.maybe_compact()
 
     # --- Listen for Frontend Code Submissions & Handover ---
     @ctx.room.on("data_received")
@@ -519,37 +563,35 @@ async def my_agent(ctx: JobContext):
                     pass 
 
                 # 3. Broadcast to Room (Frontend handles UI switch)
-                try:
-                    payload = json.dumps({
-                        "type": "MODE_SWITCH", 
-                        "mode": "HUMAN"
-                    }).encode("utf-8")
-                    asyncio.create_task(ctx.room.local_participant.publish_data(payload, reliable=True))
-                except Exception as e:
-                    logger.error(f"Failed to broadcast MODE_SWITCH: {e}")
+                publisher.publish({
+                    "type": "MODE_SWITCH", 
+                    "mode": "HUMAN"
+                })
 
             elif msg_type == "ALGO_SUBMIT":
                 code = payload.get("code", "")
                 output = payload.get("output", "")
                 logger.info(f">>> RECEIVED CODE SUBMISSION ({len(code)} chars, output: {len(output)})")
                 
-                # Truncate if extreme
-                if len(code) > 15000: code = code[:15000] + "... (truncated)"
-                if len(output) > 2000: output = output[:2000] + "... (truncated)"
-
-                # 1. Log to Audit/Questions
-                audit_logger.log_event("Candidate", "CODE_SUBMIT", code)
-                questions_logger.log_code_submission(code)
+                # [IMPROVEMENT] Only the diff vs. the last full copy of this file
+                # (or a summary under context pressure) goes into the LLM context
+                submission = code_store.submit(
+                    code,
+                    output=output,
+                    language=payload.get("language") or "python",
+                    file_key=payload.get("file"),
+                    context_tokens=estimate_chat_ctx_tokens(session.chat_ctx)
+                )
+
+                # 1. Log to Audit/Questions (full code, for the report)
+                audit_logger.log_event("Candidate", "CODE_SUBMIT", submission.code, metadata=submission.to_dict())
+                questions_logger.log_code_submission(submission.code)
+                observer_agent.log_turn("candidate", submission.message, priority=PRIORITY_CODE)
                 
                 # 2. Add to LLM Context for immediate evaluation
-                eval_text = f"The candidate has executed/submitted the following code.\n\n### CODE:\n```python\n{code}\n```"
-                if output:
-                    eval_text += f"\n\n### EXECUTION OUTPUT:\n{output}"
-                eval_text += "\n\nPlease review it and acknowledge. If it's correct/fixing the issue, proceed. If not, provide feedback."
-
                 try:
-                    session.chat_ctx.add_message(role="user", content=eval_text)
-                    logger.info(">>> Injected code/output into LLM context.")
+                    session.chat_ctx.add_message(role="user", content=submission.message)
+                    logger.info(f">>> Injected code {submission.mode} into LLM context ({submission.injected_tokens} tokens).")
                 except Exception as ctx_err:
                     logger.error(f"Failed to update chat_ctx: {ctx_err}")
                 
@@ -581,6 +623,12 @@ async def my_agent(ctx: JobContext):
     # session.start() manages the voice pipeline
     await session.start(agent=lead_agent_logic, room=ctx.room)
     
+    # [IMPROVEMENT] Dynamic questions are swapped into the prompt when ready,
+    # so the opening line is not gated on the question-generation LLM call
+    question_swap_task = None
+    if hasattr(lead_agent_logic, 'await_dynamic_questions'):
+        question_swap_task = asyncio.create_task(lead_agent_logic.await_dynamic_questions())
+    
     # Start background agents
     await pressure_agent.start()
     await mole_agent.start()
@@ -595,85 +643,52 @@ async def my_agent(ctx: JobContext):
     # Cleanup logic
     async def cleanup():
         try:
+            session_registry.unregister(ctx.job.id)
             audit_logger.log_event("System", "SESSION_END", "Interview session ended")
+            logger.info(f"LLM router stats: {llm_router.stats()}")
+            await context_manager.aclose()
+            logger.info(f"Chat context stats: {context_manager.stats()}")
+            code_stats = code_store.stats()
+            logger.info(f"Code submissions: {code_stats['submissions']} ({code_stats['injected_tokens']} tokens injected, {code_stats['tokens_saved']} saved)")
             
             # [FIX] Wait for pending evaluations before generating report
             try:
-                await observer_agent.await_pending_evaluations()
+                drain = await observer_agent.await_pending_evaluations(deadline=10.0)
+                logger.info(f"Observer batching: {drain}")
             except Exception as e:
                 logger.error(f"Failed to await observer tasks: {e}")
             
-            dqi_data = observer_agent.generate_dqi_report()
-            audit_logs = audit_logger.export_logs()
-            
-            # Prepare Raw Data for Pipeline
-            raw_data = {
-                "session_id": audit_logger.session_id,
-                "timestamp": audit_logger._start_time.isoformat(),
-                "candidate_id": audit_logger.candidate_id,
-                "dqi_calculation": dqi_data,
-                "audit_log": audit_logs
-            }
-            
-            # Use Analysis Pipeline to generate Final Report
-            print(f"--- Generating FSIR Report for {audit_logger.session_id} ---")
-            pipeline = InterviewPipeline()
-            fsir_report = pipeline.generate_detailed_report(audit_logger.session_id, raw_data)
-            print("FSIR Report object created.")
+            # Closed only after the drain: late evaluations still publish DQI_UPDATE
+            await close_publisher(ctx.room, timeout=1.0)
+            await llm_router.aclose()  # This session's loop-bound LLM clients / adapters
             
-            # Serialize
-            json_output = fsir_report.model_dump_json(indent=2)
+            # [NEW] Questions log goes into the session archive with the bundle
+            questions_logger.finalize()
+            session_dir = SESSIONS_DIR / audit_logger.session_id
             
-            # Save to file
-            filename = f"fsir_{audit_logger.session_id}.json"
-            print(f"Saving to {filename}...")
-            with open(filename, "w") as f:
-                f.write(json_output)
-                
-            logger.info(f"FSIR Report generated: {filename}")
-            print(f"FSIR SUCCESS: {filename}")
-            
-                # [NEW] Generate PDF Report
-            try:
-                pdf_generator = PDFReportGenerator()
-                pdf_bytes = pdf_generator.generate_report_bytes(fsir_report.model_dump())
-                
-                # 1. Save with Session ID (Original)
-                pdf_filename = f"fsir_{audit_logger.session_id}.pdf"
-                with open(pdf_filename, "wb") as pdf_file:
-                    pdf_file.write(pdf_bytes)
-                logger.info(f"PDF Report generated: {pdf_filename}")
-                
-                # 2. Save with Candidate ID (For API Download)
-                if audit_logger.candidate_id:
-                    # Sanitize ID
-                    clean_id = str(audit_logger.candidate_id).replace("audit:", "").strip()
-                    api_filename = f"fsir_{clean_id}.pdf"
-                    
-                    # [FIX] Save to UPLOADS directory for Backend Access
-                    from pathlib import Path
-                    uploads_dir = Path("uploads")
-                    uploads_dir.mkdir(exist_ok=True)
-                    final_path = uploads_dir / api_filename
-                    
-                    import shutil
-                    shutil.copy(pdf_filename, final_path)
-                    logger.info(f"PDF Copied for API: {final_path}")
-
-                print(f"PDF SUCCESS: {pdf_filename}")
-            except Exception as pdf_err:
-                logger.error(f"Failed to generate PDF report: {pdf_err}")
-                print(f"PDF FAILURE: {pdf_err}")
+            # Timing trace next to the FSIR report
+            await telemetry.aclose()
+            logger.info(f"Usage: {usage_collector.get_summary()}")
+            logger.info(f"Latency summary: {telemetry.summary()}")
+            session_dir.mkdir(parents=True, exist_ok=True)
+            telemetry.save_trace(str(session_dir))
             
-            # [NEW] Save Questions Log
-            questions_filename = questions_logger.save_to_file()
-            print(f"Questions log saved: {questions_filename}")
+            # [SCALE] Only persist the raw session bundle here; FSIR + PDF are built
+            # by the report worker pool so this voice worker slot frees up immediately
+            bundle_path = save_session_bundle(
+                session_id=audit_logger.session_id,
+                candidate_id=audit_logger.candidate_id,
+                started_at=audit_logger._start_time,
+                audit_log=audit_logger.export_logs(),
+                evaluations=[e.to_dict() for e in observer_agent.evaluations],
+                dqi=live_dqi.snapshot().model_dump(),  # Report uses the running score as-is
+                questions=questions_logger.export_json()
+            )
+            enqueue_report_job(audit_logger.session_id, bundle_path)
+            logger.info(f">>> Report queued: {audit_logger.session_id}")
             
         except Exception as e:
-            logger.error(f"Failed to generate FSIR report: {e}")
-            print(f"FSIR FAILURE: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Failed to persist session for reporting: {e}")
 
     ctx.add_shutdown_callback(cleanup)
 
@@ -687,6 +702,9 @@ async def my_agent(ctx: JobContext):
     await pressure_agent.stop()
     await mole_agent.stop()
     await crisis_popup_agent.stop()  # [NEW] Stop crisis timer
+    if question_swap_task and not question_swap_task.done():
+        question_swap_task.cancel()
+    session_registry.unregister(ctx.job.id)
 
 if __name__ == "__main__":
     cli.run_app(server)
\ No newline at end of file
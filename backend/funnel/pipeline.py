@@ -1,5 +1,6 @@
 import logging
 import asyncio
+import contextvars
 import json
 import os
 from typing import Dict, Any, Optional
@@ -48,11 +49,20 @@ FIELD_MARKET_INTEL = {
     )
 }
 
+# Per-session candidate state. Interview jobs sharing one worker process each call
+# begin_session(), so their candidate context does not leak into each other;
+# the API gateway never does and keeps using the process-wide state.
+_session_state: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "aegis_candidate_state", default=None
+)
+
+
 class AegisKnowledgeEngine:
     """
     The Central Knowledge Repository.
     Integrates Resume Parsing + Web Scraping (The Researcher) + Context Retrieval.
     Implemented as a Singleton to be shared across API and Agents.
+    The RAG index and intel cache are shared; candidate_context / audit_path are per session.
     """
     _instance = None
 
@@ -60,7 +70,7 @@ class AegisKnowledgeEngine:
         if cls._instance is None:
             cls._instance = super(AegisKnowledgeEngine, cls).__new__(cls)
             cls._instance.context_store = {}
-            cls._instance.candidate_context = None
+            cls._instance._shared_state = {"candidate_context": None, "audit_path": None}
             cls._instance.dynamic_intel = {}  # CACHE FOR LLM RESULTS
             # Initialize Pathway RAG Engine for real-time vector indexing
             cls._instance.pathway_rag = PathwayRAGEngine()
@@ -69,6 +79,38 @@ class AegisKnowledgeEngine:
             logger.info(">>> [SYSTEM] Knowledge Engine + Researcher + Pathway RAG Active (God Mode).")
         return cls._instance
 
+    # ------------------------------------------------------------------
+    # Per-session candidate state
+    # ------------------------------------------------------------------
+
+    def begin_session(self):
+        """
+        Give the current interview job its own candidate state.
+        Call at the start of the job entrypoint; tasks it spawns inherit it.
+        """
+        _session_state.set({"candidate_context": None, "audit_path": None})
+
+    def _state(self) -> Dict[str, Any]:
+        state = _session_state.get()
+        return state if state is not None else self._shared_state
+
+    @property
+    def candidate_context(self) -> Optional[Dict[str, Any]]:
+        return self._state()["candidate_context"]
+
+    @candidate_context.setter
+    def candidate_context(self, value: Optional[Dict[str, Any]]):
+        self._state()["candidate_context"] = value
+
+    @property
+    def audit_path(self) -> Optional[str]:
+        """Audit JSON backing candidate_context."""
+        return self._state()["audit_path"]
+
+    @audit_path.setter
+    def audit_path(self, value: Optional[str]):
+        self._state()["audit_path"] = value
+
     def process_candidate_pdf(self, pdf_path: str) -> Dict[str, Any]:
         """
         [RESUME VALIDATOR CONNECTION]
@@ -113,6 +155,7 @@ class AegisKnowledgeEngine:
         
         # 4. Load into Context
         self.candidate_context = audit_data 
+        self.audit_path = output_filename
         
         # 5. Index into Pathway RAG (Real-Time Vector Store)
         self.pathway_rag.index_resume_audit(audit_data, candidate_id=name)
@@ -148,19 +191,15 @@ class AegisKnowledgeEngine:
         [THE RESEARCHER]
         Uses Groq (Llama3) to generate REAL-TIME market intelligence.
         """
-        import os
-        from openai import AsyncOpenAI
+        from app.core.llm_router import llm_router
         
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
+        if not os.getenv("GROQ_API_KEY"):
             logger.warning(">>> [RESEARCHER] No GROQ_API_KEY. Using static fallback.")
             return self._get_static_fallback(role)
 
         logger.info(f">>> [RESEARCHER] Generating dynamic intel for: '{role}'...")
         
         try:
-            client = AsyncOpenAI(api_key=api_key, base_url="https://api.groq.com/openai/v1")
-            
             # [DYNAMIC] Inject Candidate Skills if available
             skills_context = ""
             if self.candidate_context and "skills" in self.candidate_context:
@@ -175,14 +214,12 @@ class AegisKnowledgeEngine:
                 f"Format as a concise paragraph starting with 'CODING INTEL:'."
             )
             
-            completion = await client.chat.completions.create(
-                model="llama-3.1-8b-instant", # [FALLBACK] Rate Limit on 70b
-                messages=[{"role": "user", "content": prompt}],
+            intel = await llm_router.complete(
+                "intel",
+                [{"role": "user", "content": prompt}],
                 temperature=0.7,
                 max_tokens=150
             )
-            
-            intel = completion.choices[0].message.content.strip()
             logger.info(f">>> [RESEARCHER] Generated: {intel[:100]}...")
             return intel
             
@@ -300,6 +337,7 @@ class AegisKnowledgeEngine:
                 return False
             
             self.candidate_context = extract_candidate_context(audit_data)
+            self.audit_path = audit_path
             
                 # [FIX] Apply Manual Override if present (from set-candidate-role API)
             if 'manual_role_override' in audit_data:
@@ -386,6 +424,7 @@ class AegisKnowledgeEngine:
     def clear_candidate(self):
         """Clear loaded candidate context."""
         self.candidate_context = None
+        self.audit_path = None
         logger.info(">>> [RESUME] Candidate context cleared.")
 
 
@@ -394,16 +433,12 @@ class AegisKnowledgeEngine:
         [DYNAMIC MOLE]
         Generates a context-aware 'tip' (truth or lie) for the candidate.
         """
-        import os
-        from openai import AsyncOpenAI
+        from app.core.llm_router import llm_router
         
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
+        if not os.getenv("GROQ_API_KEY"):
             return "Psst, try restarting the server. (Default)"
 
         try:
-            client = AsyncOpenAI(api_key=api_key, base_url="https://api.groq.com/openai/v1")
-            
             # Get Field Context
             field = "General Engineering"
             if self.candidate_context:
@@ -418,15 +453,13 @@ class AegisKnowledgeEngine:
                 f"Examples: 'Psst, he hates microservices.' or 'Tip: Mention Rust to impress him.'"
             )
             
-            completion = await client.chat.completions.create(
-                model="llama-3.1-8b-instant",
-                messages=[{"role": "user", "content": prompt}],
+            return await llm_router.complete(
+                "mole",
+                [{"role": "user", "content": prompt}],
                 temperature=0.8,
                 max_tokens=50
             )
             
-            return completion.choices[0].message.content.strip()
-            
         except Exception as e:
             logger.error(f">>> [MOLE] Generation failed: {e}")
             return "Psst, confidence is key!"
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, BackgroundTasks, HTTPException, UploadFile, File
+from fastapi import FastAPI, BackgroundTasks, HTTPException, UploadFile, File, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
@@ -7,6 +7,7 @@ import logging
 import os
 import shutil
 import io # <--- Added
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # IMPORTS (The Trinity)
@@ -15,7 +16,10 @@ from backend.core.graph import build_graph
 from backend.funnel.pipeline import knowledge_engine
 from backend.resume_validator import validate_resume, save_audit
 from backend.livekit_dispatch import dispatcher
-from app.resume.loader import detect_candidate_field, extract_candidate_context
+from app.core.shared import UPLOADS_DIR, detect_candidate_field, extract_candidate_context
+from app.agents.question_generator import precompute_dynamic_questions
+from app.analysis.report_cache import iter_file, parse_range, report_cache
+from app.analysis.report_jobs import ReportWorkerPool, get_report_status, load_live_score, queue_stats
 
 # SETUP
 app = FastAPI(title="Aegis-Forge Plugin Gateway (God Mode)")
@@ -30,8 +34,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Uploads directory
-UPLOADS_DIR = Path("uploads")
+# Uploads directory (shared with the agent worker via app.core.shared)
 UPLOADS_DIR.mkdir(exist_ok=True)
 
 # --- CONTRACTS (STRICT VALIDATION) ---
@@ -63,6 +66,35 @@ class FocusTopicsRequest(BaseModel):
 # IN-MEMORY SESSION STORE
 active_sessions = {}
 candidate_audits = {}  # Store audits by candidate_id
+completed_reports = {}  # session_id -> report job result (filled by the report worker pool)
+
+# --- REPORT WORKER POOL ---
+# FSIR/PDF generation runs here, not in the voice worker (see app/analysis/report_jobs.py)
+REPORT_WORKERS = int(os.getenv("AEGIS_REPORT_WORKERS", "2"))
+
+def _on_report_complete(result: Dict[str, Any]):
+    completed_reports[result["session_id"]] = result
+    if result.get("status") == "done":
+        report_cache.index_fsir(result.get("candidate_id"), result.get("fsir_path"))
+    logger.info(f">>> [REPORT] {result['session_id']} -> {result.get('status')}")
+
+report_pool = ReportWorkerPool(max_workers=REPORT_WORKERS, on_complete=_on_report_complete)
+
+# On-demand renders for /download-report (own small pool, so downloads never wait behind the job queue)
+LAZY_RENDER_WORKERS = int(os.getenv("AEGIS_LAZY_RENDER_WORKERS", "1"))
+
+@app.on_event("startup")
+async def start_report_pool():
+    if REPORT_WORKERS > 0:
+        await report_pool.start()
+    report_cache.executor = ProcessPoolExecutor(max_workers=LAZY_RENDER_WORKERS)
+
+@app.on_event("shutdown")
+async def stop_report_pool():
+    if REPORT_WORKERS > 0:
+        await report_pool.stop()
+    if report_cache.executor:
+        report_cache.executor.shutdown(wait=False)
 
 # --- ENDPOINTS ---
 
@@ -77,7 +109,7 @@ async def health_check():
 # ============================================
 
 @app.post("/upload-resume")
-async def upload_resume(file: UploadFile = File(...)):
+async def upload_resume(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     """
     Upload and validate a resume PDF.
     
@@ -138,6 +170,9 @@ async def upload_resume(file: UploadFile = File(...)):
     audit["dynamic_market_intel"] = market_intel
     save_audit(audit, str(audit_path))
     
+    # Precompute interview questions so the agent worker can load them instantly
+    background_tasks.add_task(precompute_dynamic_questions, str(audit_path), context)
+    
     logger.info(f">>> Resume validated. Candidate: {candidate_id}, Field: {field}")
     
     return {
@@ -268,7 +303,7 @@ class RoleUpdateRequest(BaseModel):
     role: str  # e.g., "AI/ML", "DevOps"
 
 @app.post("/api/set-candidate-role")
-async def set_candidate_role(request: RoleUpdateRequest):
+async def set_candidate_role(request: RoleUpdateRequest, background_tasks: BackgroundTasks):
     """
     [FRONTEND FEATURE] Allow user to manually select/override the Job Role.
     This updates the Knowledge Engine context + Scenario.
@@ -313,6 +348,11 @@ async def set_candidate_role(request: RoleUpdateRequest):
     knowledge_engine.candidate_context['role'] = role # Force update
     knowledge_engine.candidate_context['scenario_id'] = scenario_id # Force scenario
     
+    # The audit changed, so the cached question set is stale - regenerate for the new role
+    background_tasks.add_task(
+        precompute_dynamic_questions, str(audit_path), dict(knowledge_engine.candidate_context)
+    )
+    
     logger.info(f">>> [ROLE OVERRIDE] Candidate {candidate_id} switched to {role} ({scenario_id})")
     
     return {
@@ -338,10 +378,13 @@ async def get_candidate(candidate_id: str):
 
 
 @app.get("/download-report/{candidate_id}")
-async def download_report(candidate_id: str):
+async def download_report(candidate_id: str, request: Request):
     """
-    Download the PRE-GENERATED PDF report for a candidate.
-    (Generated by the Agent Process at the end of the interview)
+    Download the PDF report for a candidate.
+
+    Serves the PDF written by the report worker; if it is missing but the
+    FSIR JSON survived, renders it on demand (cached by FSIR content hash).
+    Supports If-None-Match (ETag) and single byte ranges.
     """
     # 1. Try to find the file
     filename = f"fsir_{candidate_id}.pdf"
@@ -355,23 +398,47 @@ async def download_report(candidate_id: str):
         final_path = file_path
     elif uploads_path.exists():
         final_path = uploads_path
-        
-    if not final_path:
-        logger.warning(f"Report not found for {candidate_id}. It might not be generated yet.")
-        # [FALLBACK] For Dev/Testing, check if there are ANY pdfs to serve? No, 404 is stricter.
-        # But user mentioned "we get a pdf", implies it exists.
-        
-        # Check if we can fallback to session-based naming if we knew the session?
-        # For now, return 404 but with helpful message
-        
-        # [DEV HACK] If dev mode, return dummy if real one missing?
-        # No, better to be honest.
-        raise HTTPException(status_code=404, detail="Report not ready. Please wait for interview to finish.")
-    
-    return FileResponse(
-        path=final_path,
+
+    if final_path:
+        etag = await report_cache.content_hash(final_path)
+    else:
+        # [NEW] Lazy render from the stored FSIR JSON (agent died before its report job ran)
+        fsir_path = await report_cache.find_fsir(candidate_id)
+        if not fsir_path:
+            logger.warning(f"Report not found for {candidate_id}. It might not be generated yet.")
+            raise HTTPException(status_code=404, detail="Report not ready. Please wait for interview to finish.")
+        try:
+            final_path, etag = await report_cache.get_pdf(fsir_path)
+        except Exception as e:
+            logger.error(f"On-demand render failed for {candidate_id}: {e}")
+            raise HTTPException(status_code=500, detail="Report rendering failed.")
+
+    etag = f'"{etag[:32]}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="Aegis_Report_{candidate_id}.pdf"',
+    }
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+
+    size = final_path.stat().st_size
+    try:
+        byte_range = parse_range(request.headers.get("range"), size)
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    if byte_range is not None and request.headers.get("if-range", etag) != etag:
+        byte_range = None  # Client's partial copy is stale: send the whole file
+
+    start, end = byte_range or (0, size - 1)
+    headers["Content-Length"] = str(end - start + 1)
+    if byte_range is not None:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        iter_file(final_path, start, end),
+        status_code=206 if byte_range is not None else 200,
         media_type="application/pdf",
-        filename=f"Aegis_Report_{candidate_id}.pdf"
+        headers=headers
     )
 
 
@@ -430,6 +497,28 @@ async def list_sessions():
         "sessions": list(active_sessions.keys())
     }
 
+@app.get("/aegis/report/{session_id}/status")
+async def report_status(session_id: str):
+    """State of the end-of-interview report job (pending / processing / done / failed)."""
+    if session_id in completed_reports:
+        return completed_reports[session_id]
+    return get_report_status(session_id)
+
+@app.get("/aegis/reports/queue")
+async def report_queue():
+    """Report queue depth per state and the sessions currently rendering."""
+    if REPORT_WORKERS > 0:
+        return report_pool.stats()
+    return {**queue_stats(), "workers": 0, "rendering": []}
+
+@app.get("/aegis/session/{session_id}/live-score")
+async def live_score(session_id: str):
+    """Running DQI of an interview in progress (updated by the agent per observer evaluation)."""
+    score = load_live_score(session_id)
+    if score is None:
+        raise HTTPException(status_code=404, detail="No live score for this session yet")
+    return score
+
 @app.get("/aegis/session/{session_id}")
 async def get_session(session_id: str):
     """Get details of a specific session."""
@@ -375,7 +375,7 @@ def validate_resume(pdf_path: str) -> Dict[str, Any]:
 
 
 def save_audit(audit: Dict[str, Any], output_path: str) -> str:
-    """Save audit to JSON file."""
+    """Save audit to JSON file (compact; re-saved on every enrichment step)."""
     with open(output_path, "w") as f:
-        json.dump(audit, f, indent=4)
+        json.dump(audit, f, separators=(",", ":"))
     return output_path
@@ -27,6 +27,7 @@ import {
     useDataChannel
 } from "@livekit/components-react";
 import { Track } from "livekit-client";
+import { decodeMessages } from "@/lib/dataChannel";
 
 
 
@@ -254,27 +255,42 @@ const MonacoIDE = ({ onCodeSubmit }: { onCodeSubmit: (code: string, language: st
     const [isRunning, setIsRunning] = useState(false);
     const [executionTime, setExecutionTime] = useState<string>('');
     const [showLangDropdown, setShowLangDropdown] = useState(false);
+    // Streamed code: current stream id + next expected delta seq
+    const codeStream = useRef<{ id: string | null; nextSeq: number }>({ id: null, nextSeq: 0 });
 
     // Listen for Auto-Code Events from Agent
     useDataChannel((msg) => {
         try {
-            const text = new TextDecoder().decode(msg.payload);
-            const data = JSON.parse(text);
-
-            // Check for Event Type
-            if (data.type === "CODE_SNAPSHOT") {
-                console.log("🚀 Received Auto-Code from Agent:", data.code);
-
-                // Update Editor Content
-                setCode(data.code);
-
-                // If language is provided, try to switch
-                if (data.language) {
-                    const langMatch = SUPPORTED_LANGUAGES.find(l =>
-                        l.id.toLowerCase() === data.language.toLowerCase() ||
-                        l.name.toLowerCase() === data.language.toLowerCase()
-                    );
-                    if (langMatch) setSelectedLang(langMatch);
+            for (const data of decodeMessages(msg.payload)) {
+                // Check for Event Type
+                if (data.type === "CODE_SNAPSHOT") {
+                    console.log("🚀 Received Auto-Code from Agent:", data.code);
+
+                    // Update Editor Content (full snapshot is authoritative)
+                    codeStream.current = { id: null, nextSeq: 0 };
+                    setCode(data.code);
+
+                    // If language is provided, try to switch
+                    if (data.language) {
+                        const langMatch = SUPPORTED_LANGUAGES.find(l =>
+                            l.id.toLowerCase() === data.language.toLowerCase() ||
+                            l.name.toLowerCase() === data.language.toLowerCase()
+                        );
+                        if (langMatch) setSelectedLang(langMatch);
+                    }
+                }
+
+                // [NEW] Append-only patches while the agent is still generating the code block
+                if (data.type === "CODE_SNAPSHOT_DELTA") {
+                    const stream = codeStream.current;
+                    if (data.seq === 0) {
+                        codeStream.current = { id: data.stream_id, nextSeq: 1 };
+                        setCode(data.delta);
+                    } else if (data.stream_id === stream.id && data.seq === stream.nextSeq) {
+                        stream.nextSeq += 1;
+                        setCode((prev: string) => prev + data.delta);
+                    }
+                    // Gaps are ignored; the final CODE_SNAPSHOT resyncs the editor
                 }
             }
         } catch (e) {
@@ -866,61 +882,60 @@ const RoomContent = ({
 
         const handleData = (payload: Uint8Array, participant?: any, kind?: any, topic?: string) => {
             try {
-                const text = new TextDecoder().decode(payload);
-                console.log("[RAW DATA]", text); // Debug Log
-                const data = JSON.parse(text);
-
-                // [FIX] SYNC WITH REFERENCE LOGIC
-                // Check for both legacy "TRANSCRIPT" and new "TRANSCRIPTION" types
-                if (data.type === "TRANSCRIPT" || data.type === "TRANSCRIPTION") {
-                    console.log("[TRANSCRIPT RX]", data.sender, data.text);
-                    setMessages(prev => [...prev, {
-                        id: Date.now().toString(),
-                        timestamp: getTimestamp(),
-                        sender: data.sender || "SYSTEM",
-                        text: data.text
-                    }]);
-                }
+                for (const data of decodeMessages(payload)) {
+                    console.log("[RAW DATA]", data); // Debug Log
+
+                    // [FIX] SYNC WITH REFERENCE LOGIC
+                    // Check for both legacy "TRANSCRIPT" and new "TRANSCRIPTION" types
+                    if (data.type === "TRANSCRIPT" || data.type === "TRANSCRIPTION") {
+                        console.log("[TRANSCRIPT RX]", data.sender, data.text);
+                        setMessages(prev => [...prev, {
+                            id: Date.now().toString(),
+                            timestamp: getTimestamp(),
+                            sender: data.sender || "SYSTEM",
+                            text: data.text
+                        }]);
+                    }
 
-                // Listen for INTERVIEW_END signal from backend
-                if (data.type === "INTERVIEW_END") {
-                    console.log("[AEGIS] Interview ended signal received:", data.reason);
-                    setMessages(prev => [...prev, {
-                        id: Date.now().toString(),
-                        timestamp: getTimestamp(),
-                        sender: "SYSTEM",
-                        text: `📋 Interview completed: ${data.reason || "Session ended"}. FSIR Report is being generated...`
-                    }]);
-                    // Delay to allow backend to generate report
-                    setTimeout(() => {
-                        onInterviewEnd();
-                    }, 2000);
-                }
-                // HISTORY SYNC (P2P)
-                if (data.type === "REQUEST_HISTORY") {
-                    // If I have messages (more than just system init), share them
-                    if (messages.length > 1) {
-                        console.log("[AEGIS] Received History Request. Sending sync...", messages.length);
-                        const syncPayload = JSON.stringify({
-                            type: "HISTORY_SYNC",
-                            history: messages
-                        });
-                        const encoder = new TextEncoder();
-                        // Send to the specific requester? publishData goes to all. Ideally use `destinationIdentities` but broadcast is fine for now.
-                        room.localParticipant.publishData(encoder.encode(syncPayload), { reliable: true });
+                    // Listen for INTERVIEW_END signal from backend
+                    if (data.type === "INTERVIEW_END") {
+                        console.log("[AEGIS] Interview ended signal received:", data.reason);
+                        setMessages(prev => [...prev, {
+                            id: Date.now().toString(),
+                            timestamp: getTimestamp(),
+                            sender: "SYSTEM",
+                            text: `📋 Interview completed: ${data.reason || "Session ended"}. FSIR Report is being generated...`
+                        }]);
+                        // Delay to allow backend to generate report
+                        setTimeout(() => {
+                            onInterviewEnd();
+                        }, 2000);
+                    }
+                    // HISTORY SYNC (P2P)
+                    if (data.type === "REQUEST_HISTORY") {
+                        // If I have messages (more than just system init), share them
+                        if (messages.length > 1) {
+                            console.log("[AEGIS] Received History Request. Sending sync...", messages.length);
+                            const syncPayload = JSON.stringify({
+                                type: "HISTORY_SYNC",
+                                history: messages
+                            });
+                            const encoder = new TextEncoder();
+                            // Send to the specific requester? publishData goes to all. Ideally use `destinationIdentities` but broadcast is fine for now.
+                            room.localParticipant.publishData(encoder.encode(syncPayload), { reliable: true });
+                        }
                     }
-                }
 
-                if (data.type === "HISTORY_SYNC") {
-                    if (!hasSyncedHistory && data.history && Array.isArray(data.history)) {
-                        console.log("[AEGIS] Received History Sync:", data.history.length, "messages");
-                        // Merge unique messages or just replace? Replace is safer for a full sync.
-                        // But keep our local system init if needed. Let's trust the sync.
-                        setMessages(data.history);
-                        setHasSyncedHistory(true);
+                    if (data.type === "HISTORY_SYNC") {
+                        if (!hasSyncedHistory && data.history && Array.isArray(data.history)) {
+                            console.log("[AEGIS] Received History Sync:", data.history.length, "messages");
+                            // Merge unique messages or just replace? Replace is safer for a full sync.
+                            // But keep our local system init if needed. Let's trust the sync.
+                            setMessages(data.history);
+                            setHasSyncedHistory(true);
+                        }
                     }
                 }
-
             } catch (e) {
                 console.warn("Packet Decode Failed:", e);
             }
@@ -18,6 +18,7 @@ import {
     Loader2, Hash, User
 } from "lucide-react";
 import clsx from "clsx";
+import { decodeMessages } from "@/lib/dataChannel";
 
 // ============================================
 // MONITOR CONTENT (Inside Room)
@@ -47,19 +48,18 @@ const MonitorContent = ({ candidateId }: { candidateId: string }) => {
 
         const handleData = (payload: Uint8Array, participant: any) => {
             try {
-                const text = new TextDecoder().decode(payload);
-                const data = JSON.parse(text);
-
-                if (data.type === "TRANSCRIPT") {
-                    setMessages(prev => [...prev, { sender: data.sender || "UNKNOWN", text: data.text }]);
-                }
+                for (const data of decodeMessages(payload)) {
+                    if (data.type === "TRANSCRIPT") {
+                        setMessages(prev => [...prev, { sender: data.sender || "UNKNOWN", text: data.text }]);
+                    }
 
-                // HISTORY SYNC (P2P)
-                if (data.type === "HISTORY_SYNC") {
-                    if (!hasSyncedHistory && data.history && Array.isArray(data.history)) {
-                        console.log("[AEGIS MONITOR] Received History Sync:", data.history.length);
-                        setMessages(data.history); // Sync full history
-                        setHasSyncedHistory(true);
+                    // HISTORY SYNC (P2P)
+                    if (data.type === "HISTORY_SYNC") {
+                        if (!hasSyncedHistory && data.history && Array.isArray(data.history)) {
+                            console.log("[AEGIS MONITOR] Received History Sync:", data.history.length);
+                            setMessages(data.history); // Sync full history
+                            setHasSyncedHistory(true);
+                        }
                     }
                 }
             } catch (e) {
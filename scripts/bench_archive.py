@@ -0,0 +1,89 @@
+"""
+Benchmark: per-interview persistence, pretty JSON files vs the session archive.
+
+Old: bundle.json + questions_<id>.json (indent=2) + fsir_<id>.json (indent=2)
+New: gzipped compact members in sessions/<id>/ (app/analysis/session_archive.py)
+
+Usage:
+    python scripts/bench_archive.py [--events 2000] [--turns 200] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.analysis.session_archive import MEMBER_BUNDLE, MEMBER_FSIR, MEMBER_QUESTIONS, SessionArchive
+from scripts.bench_pdf import sample_fsir
+
+
+def sample_session(events: int, turns: int, seed: int = 5):
+    rng = random.Random(seed)
+    audit_log = [
+        {
+            "timestamp": 1_700_000_000 + i * 1.5,
+            "actor": rng.choice(["Observer", "IncidentLead", "PressureAgent", "System"]),
+            "event_type": rng.choice(["TURN", "EVALUATION_COMPLETE", "PRESSURE_APPLIED"]),
+            "details": "Candidate discussed rollback strategy and paging the on-call owner.",
+            "metadata": {"score": rng.randint(1, 10), "turn": i},
+        }
+        for i in range(events)
+    ]
+    evaluations = [{"score": rng.randint(1, 10), "reason": "Clear mitigation plan.", "turn": i} for i in range(turns)]
+    bundle = {"session_id": "bench", "candidate_id": "audit:bench", "audit_log": audit_log, "evaluations": evaluations}
+    questions = {"session_id": "bench", "questions": [{"text": f"Question {i}?", "type": "theory"} for i in range(turns // 4)]}
+    return bundle, questions, sample_fsir(turns)
+
+
+def write_pretty(out: Path, bundle, questions, fsir):
+    with open(out / "bundle.json", "w") as f:
+        json.dump(bundle, f, indent=2)
+    with open(out / "questions_bench.json", "w") as f:
+        json.dump(questions, f, indent=2)
+    with open(out / "fsir_bench.json", "w") as f:
+        json.dump(fsir, f, indent=2)
+
+
+def write_archive(out: Path, bundle, questions, fsir):
+    archive = SessionArchive(out)
+    archive.write(MEMBER_BUNDLE, bundle)
+    archive.write(MEMBER_QUESTIONS, questions)
+    archive.write(MEMBER_FSIR, fsir)
+
+
+def measure(fn, repeat: int, *data):
+    best, size = float("inf"), 0
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            t = time.perf_counter()
+            fn(Path(tmp), *data)
+            best = min(best, time.perf_counter() - t)
+            size = sum(p.stat().st_size for p in Path(tmp).iterdir())
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = sample_session(args.events, args.turns)
+    pretty_s, pretty_b = measure(write_pretty, args.repeat, *data)
+    archive_s, archive_b = measure(write_archive, args.repeat, *data)
+
+    print(f"Session persistence, {args.events} audit events, {args.turns} evaluations (best of {args.repeat})")
+    print(f"  pretty JSON files    {pretty_s * 1000:8.2f} ms  {pretty_b / 1024:9.1f} KiB")
+    print(f"  session archive      {archive_s * 1000:8.2f} ms  {archive_b / 1024:9.1f} KiB"
+          f"  ({pretty_s / archive_s:.1f}x faster, {pretty_b / archive_b:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
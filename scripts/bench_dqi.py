@@ -0,0 +1,74 @@
+"""
+Benchmark: loop vs columnar (NumPy) DQI on a large evaluation list.
+
+Usage:
+    python scripts/bench_dqi.py [--turns 10000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.analysis.dqi_calculator import DQICalculator, RunningDQI
+from app.analysis.dqi_columnar import EvaluationColumns, summarize
+from app.analysis.evaluations import RATING_POINTS, ObserverEvaluation
+
+
+def make_records(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    ratings = list(RATING_POINTS)
+    start = time.time() - n * 20
+    return [
+        ObserverEvaluation(
+            score=round(rng.uniform(0, 10), 1),
+            reason="synthetic",
+            ratings={dim: rng.choice(ratings) for dim in RunningDQI.RADAR_DIMENSIONS if rng.random() < 0.7},
+            timestamp=start + i * 20,
+        )
+        for i in range(n)
+    ]
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    records = make_records(args.turns)
+    calc = DQICalculator()
+
+    loop_dqi = calc.calculate_score("bench", records)
+    cols_dqi = calc.calculate_score_columnar("bench", records)
+    assert loop_dqi.overall_score == cols_dqi.overall_score
+    assert loop_dqi.radar_chart == cols_dqi.radar_chart
+
+    cols = EvaluationColumns.from_records(records)
+    results = {
+        "loop: calculate_score": best_of(lambda: calc.calculate_score("bench", records), args.repeat),
+        "columnar: calculate_score_columnar": best_of(lambda: calc.calculate_score_columnar("bench", records), args.repeat),
+        "columnar: load columns": best_of(lambda: EvaluationColumns.from_records(records), args.repeat),
+        "columnar: aggregates only": best_of(lambda: summarize(cols), args.repeat),
+    }
+
+    print(f"DQI over {args.turns} evaluations (best of {args.repeat})")
+    baseline = results["loop: calculate_score"]
+    for name, seconds in results.items():
+        print(f"  {name:<38} {seconds * 1000:9.2f} ms  ({baseline / seconds:6.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+from app.core.code_submissions import (
+    MODE_DIFF,
+    MODE_FULL,
+    MODE_SUMMARY,
+    MODE_UNCHANGED,
+    CodeSubmissionStore,
+)
+
+BASE = "\n".join(f"def step_{i}(x):\n    return x + {i}\n" for i in range(20))
+
+
+def test_resubmission_injects_diff_only():
+    store = CodeSubmissionStore()
+
+    first = store.submit(BASE, language="python")
+    second = store.submit(BASE.replace("return x + 7", "return x - 7"), output="ok", language="python")
+
+    assert first.mode == MODE_FULL
+    assert second.mode == MODE_DIFF
+    assert second.version == 2
+    assert (second.lines_added, second.lines_removed) == (1, 1)
+    assert "-    return x + 7" in second.message and "+    return x - 7" in second.message
+    assert "step_15" not in second.message
+    assert second.injected_tokens < first.injected_tokens
+
+
+def test_unchanged_and_pressure_modes():
+    store = CodeSubmissionStore(context_pressure_tokens=100)
+
+    store.submit(BASE, language="python")
+    rerun = store.submit(BASE, output="42", language="python")
+    pressured = store.submit(BASE + "\nprint(step_1(1))\n", language="python", context_tokens=500)
+
+    assert rerun.mode == MODE_UNCHANGED
+    assert pressured.mode == MODE_SUMMARY
+    assert "print(step_1(1))" in pressured.message
+    assert store.stats()["submissions"] == 3
+
+
+def test_files_are_tracked_separately():
+    store = CodeSubmissionStore()
+
+    store.submit("print(1)", language="python")
+    js = store.submit("console.log(1)", language="javascript")
+
+    assert js.mode == MODE_FULL
+    assert store.latest("python").code == "print(1)"
+
+
+def test_diffs_are_against_the_last_full_copy():
+    store = CodeSubmissionStore(context_pressure_tokens=100)
+
+    store.submit(BASE, language="python")
+    store.submit(BASE.replace("return x + 3", "return x * 3"), language="python", context_tokens=500)  # Summary only
+    third = store.submit(BASE.replace("return x + 7", "return x - 7"), language="python")
+
+    assert third.mode == MODE_DIFF
+    assert "Changes since version 1" in third.message
+    assert "--- v1" in third.message and "x * 3" not in third.message
+
+
+def test_reset_base_resends_in_full():
+    store = CodeSubmissionStore()
+
+    store.submit(BASE, language="python")
+    store.reset_base()  # Context compacted: the LLM may no longer have v1
+    after = store.submit(BASE.replace("return x + 7", "return x - 7"), language="python")
+    diffed = store.submit(BASE.replace("return x + 7", "return x - 8"), language="python")
+
+    assert after.mode == MODE_FULL
+    assert diffed.mode == MODE_DIFF and "Changes since version 2" in diffed.message
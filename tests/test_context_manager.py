@@ -0,0 +1,53 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.core import context_manager as cm
+from app.core.context_manager import ChatContextManager
+
+
+def _msg(i, role, text):
+    return SimpleNamespace(id=f"item_{i}", type="message", role=role, text_content=text)
+
+
+def _agent(items):
+    return SimpleNamespace(chat_ctx=SimpleNamespace(items=items))
+
+
+def test_system_messages_and_recent_turns_are_never_selected():
+    items = [_msg(0, "system", "You are the interviewer. " * 50)]
+    items += [_msg(i, "user" if i % 2 else "assistant", f"turn {i} " * 40) for i in range(1, 20)]
+    items.insert(8, _msg(99, "system", "[CRISIS INJECTION] Prod is down"))
+    items.insert(9, SimpleNamespace(id="call_1", type="function_call", role=None, text_content=None))
+    manager = ChatContextManager(_agent(items), budget_tokens=100, keep_recent=6)
+
+    selected = manager._select_items(items)
+
+    ids = {item.id for item in selected}
+    assert "item_0" not in ids and "item_99" not in ids and "call_1" not in ids
+    assert not ids & {item.id for item in items[-6:]}
+    assert len(selected) == len(items) - 6 - 3
+
+
+def test_no_compaction_under_budget():
+    manager = ChatContextManager(_agent([_msg(1, "user", "hello")]), budget_tokens=1000)
+
+    assert manager.current_tokens() < 1000
+    assert manager.maybe_compact() is False
+
+
+def test_on_compact_runs_after_a_swap(monkeypatch):
+    items = [_msg(i, "user" if i % 2 else "assistant", f"turn {i} " * 40) for i in range(12)]
+    compacted = []
+    manager = ChatContextManager(_agent(items), budget_tokens=100, keep_recent=2, on_compact=lambda: compacted.append(1))
+
+    async def complete(*args, **kwargs):
+        return "- candidate fixed the cache bug"
+
+    async def swap(summarized, summary):
+        return True
+
+    monkeypatch.setattr(cm.llm_router, "complete", complete)
+    monkeypatch.setattr(manager, "_swap", swap)
+    asyncio.run(manager._compact(manager.current_tokens()))
+
+    assert compacted == [1]
@@ -0,0 +1,88 @@
+import json
+
+from app.core.data_channel import DataChannelPublisher
+
+
+class _FakeParticipant:
+    def __init__(self, fail_times: int = 0):
+        self.frames = []
+        self._fail_times = fail_times
+
+    async def publish_data(self, payload, reliable=True):
+        if self._fail_times:
+            self._fail_times -= 1
+            raise RuntimeError("transient publish failure")
+        self.frames.append(json.loads(payload))
+
+
+class _FakeRoom:
+    def __init__(self, fail_times: int = 0):
+        self.local_participant = _FakeParticipant(fail_times)
+
+
+async def test_messages_are_sent_in_order():
+    room = _FakeRoom()
+    bus = DataChannelPublisher(room, linger_ms=0)
+
+    for i in range(5):
+        bus.publish({"type": "TRANSCRIPTION", "text": str(i)})
+    await bus.aclose()
+
+    assert [f["text"] for f in room.local_participant.frames] == ["0", "1", "2", "3", "4"]
+    assert bus.stats()["published"] == 5
+
+
+async def test_superseded_code_snapshots_are_coalesced():
+    room = _FakeRoom()
+    bus = DataChannelPublisher(room, linger_ms=5)
+
+    bus.publish({"type": "CODE_SNAPSHOT", "code": "v1"})
+    bus.publish({"type": "TRANSCRIPTION", "text": "hello"})
+    bus.publish({"type": "CODE_SNAPSHOT", "code": "v2"})
+    await bus.aclose()
+
+    frames = room.local_participant.frames
+    assert [f.get("code") for f in frames if f["type"] == "CODE_SNAPSHOT"] == ["v2"]
+    assert bus.coalesced == 1
+
+
+async def test_full_buffer_evicts_droppable_messages_first():
+    room = _FakeRoom()
+    bus = DataChannelPublisher(room, max_queue=2, linger_ms=5)
+
+    assert bus.publish({"type": "MOLE_POPUP", "text": "psst"})
+    assert bus.publish({"type": "TRANSCRIPTION", "text": "a"})
+    assert bus.publish({"type": "INTERVIEW_END", "reason": "timeout"})
+    assert not bus.publish({"type": "PRESSURE_ALERT", "text": "hurry"})
+    await bus.aclose()
+
+    assert [f["type"] for f in room.local_participant.frames] == ["TRANSCRIPTION", "INTERVIEW_END"]
+    assert bus.dropped == 2
+
+
+async def test_batched_frames_and_retry():
+    room = _FakeRoom(fail_times=1)
+    bus = DataChannelPublisher(room, linger_ms=5, batch_frames=True, retry_backoff=0)
+
+    bus.publish({"type": "TRANSCRIPTION", "text": "a"})
+    bus.publish({"type": "TRANSCRIPTION", "text": "b"})
+    await bus.aclose()
+
+    frames = room.local_participant.frames
+    assert len(frames) == 1
+    assert frames[0]["type"] == "BATCH"
+    assert [m["text"] for m in frames[0]["messages"]] == ["a", "b"]
+
+
+async def test_code_snapshot_not_coalesced_past_deltas():
+    room = _FakeRoom()
+    bus = DataChannelPublisher(room, linger_ms=5)
+
+    bus.publish({"type": "CODE_SNAPSHOT", "code": "old"})
+    bus.publish({"type": "CODE_SNAPSHOT_DELTA", "stream_id": "1.0", "seq": 0, "delta": "a = 1\n"})
+    bus.publish({"type": "CODE_SNAPSHOT", "code": "a = 1", "stream_id": "1.0", "final": True})
+    await bus.aclose()
+
+    assert [f["type"] for f in room.local_participant.frames] == [
+        "CODE_SNAPSHOT", "CODE_SNAPSHOT_DELTA", "CODE_SNAPSHOT"
+    ]
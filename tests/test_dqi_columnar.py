@@ -0,0 +1,36 @@
+import importlib.util
+
+import pytest
+
+from app.analysis.dqi_calculator import DQICalculator
+from app.analysis.dqi_columnar import EvaluationColumns, summarize
+from app.analysis.evaluations import ObserverEvaluation
+
+pytestmark = pytest.mark.skipif(importlib.util.find_spec("numpy") is None, reason="numpy not installed")
+
+
+def _records():
+    return [
+        ObserverEvaluation(score=8.5, ratings={"communication": "Strong Hire", "testing": "No Hire"}, timestamp=100.0),
+        ObserverEvaluation(score=3.0, ratings={"communication": "Hire"}, timestamp=130.0),
+        ObserverEvaluation(score=7.5, ratings={"communication": "Weird Rating"}),
+    ]
+
+
+def test_columnar_matches_loop():
+    calc = DQICalculator()
+    loop = calc.calculate_score("s", _records())
+    cols = calc.calculate_score_columnar("s", _records())
+
+    assert cols.overall_score == loop.overall_score
+    assert cols.radar_chart == loop.radar_chart
+    assert [m.score for m in cols.metrics] == [m.score for m in loop.metrics]
+
+
+def test_summary_aggregates():
+    summary = summarize(EvaluationColumns.from_records(_records()), start_time=90.0)
+
+    assert summary["radar"]["communication"] == 8
+    assert summary["radar"]["technical"] is None
+    assert summary["correct_decisions"] == 2
+    assert summary["sentiment_arc"] == {"t": [10, 40], "score": [8, 3]}
@@ -0,0 +1,80 @@
+from app.core.end_detector import EndIntentDetector, check_end_phrase
+
+
+def test_end_phrases_match_exactly_and_fuzzily():
+    assert check_end_phrase("Can we end the interview?")
+    assert check_end_phrase("Let's end it.")
+    assert check_end_phrase("okay, I'm done")
+    assert not check_end_phrase("I think we should stop the loop here and return early")
+    assert not check_end_phrase("the end")
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_stable_interim_confirms_once():
+    clock = _Clock()
+    detector = EndIntentDetector(confirm_window=0.5, clock=clock)
+
+    assert not detector.feed("let's wrap", is_final=False)
+    assert not detector.armed
+    detector.feed("let's wrap up", is_final=False)
+    assert detector.armed
+
+    clock.now = 0.3
+    assert not detector.confirm_if_stable()
+    clock.now = 0.6
+    assert detector.confirm_if_stable()
+    assert not detector.feed("let's wrap up", is_final=True)
+    assert detector.triggered
+
+
+def test_continued_speech_disarms():
+    clock = _Clock()
+    detector = EndIntentDetector(confirm_window=0.5, clock=clock)
+
+    detector.feed("let's wrap up", is_final=False)
+    detector.feed("let's wrap up this function and then add a cache layer", is_final=False)
+    clock.now = 1.0
+
+    assert not detector.confirm_if_stable()
+    assert not detector.feed("let's wrap up this function and then add a cache layer", is_final=True)
+    assert not detector.triggered
+
+
+class _Timer:
+    def __init__(self, delay, fn):
+        self.delay, self.fn, self.cancelled = delay, fn, False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def test_one_timer_per_arm_cancelled_on_disarm():
+    clock = _Clock()
+    timers = []
+    confirmed = []
+    detector = EndIntentDetector(
+        confirm_window=0.8,
+        on_confirm=lambda: confirmed.append(True),
+        clock=clock,
+        scheduler=lambda delay, fn: timers.append(_Timer(delay, fn)) or timers[-1]
+    )
+
+    for _ in range(5):
+        detector.feed("let's wrap up", is_final=False)
+    assert len(timers) == 1 and timers[0].delay == 0.8
+
+    detector.feed("let's wrap up the loop by returning early", is_final=False)
+    assert timers[0].cancelled and not detector.armed
+
+    detector.feed("that's enough", is_final=False)
+    clock.now = 0.6  # Mid-sentence pause shorter than the endpointing delay
+    assert not detector.confirm_if_stable()
+    assert detector.on_end_of_utterance()
+    assert confirmed == [True] and timers[1].cancelled
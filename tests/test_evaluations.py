@@ -0,0 +1,49 @@
+from app.analysis.dqi_calculator import DQICalculator, RunningDQI
+from app.analysis.evaluations import ObserverEvaluation
+
+
+def test_parse_legacy_string_and_round_trip():
+    raw = """Here is the log:
+    ```json
+    {"score": 80, "candidate_action_summary": "Checked the logs first",
+     "faang_evaluation": {"Communication": "Strong Hire", "testing": "No Hire"}}
+    ```"""
+    record = ObserverEvaluation.parse(raw)
+
+    assert record.score == 80.0
+    assert record.ratings == {"communication": "Strong Hire", "testing": "No Hire"}
+    assert record.radar_points() == {"communication": 10, "testing": 3}
+    assert ObserverEvaluation.parse(record.to_dict()).to_dict() == record.to_dict()
+    assert ObserverEvaluation.parse("not json at all") is None
+
+
+def test_dqi_consumes_records_in_one_pass():
+    records = [
+        ObserverEvaluation(score=6.0, ratings={"communication": "Hire"}),
+        ObserverEvaluation(score=8.0, ratings={"communication": "Strong Hire"}),
+    ]
+    dqi = DQICalculator().calculate_score("s1", records + ['{"score": 10}'])
+
+    assert dqi.overall_score == 8.0
+    assert len(dqi.metrics) == 3
+    assert dqi.radar_chart.communication == 8
+    assert dqi.radar_chart.testing == 8  # No rating: falls back to the overall score
+
+
+def test_running_dqi_snapshot_matches_batch_calculation():
+    records = [
+        ObserverEvaluation(score=4.0, ratings={"technical": "No Hire"}, timestamp=1.0),
+        ObserverEvaluation(score=9.0, ratings={"technical": "Strong Hire"}, timestamp=2.0),
+    ]
+    running = RunningDQI("s1")
+    running.add(records[0])
+    assert running.live()["overall_score"] == 4.0
+    running.add(records[1])
+
+    live = running.live()
+    assert live["overall_score"] == 6.5 and live["last_score"] == 9.0
+    assert live["radar"]["technical"] == 6 and live["radar"]["testing"] is None
+    assert live["timeline"] == [[1.0, 4.0], [2.0, 9.0]]
+
+    batch = DQICalculator().calculate_score("s1", records)
+    assert running.snapshot().model_dump() == batch.model_dump()
@@ -0,0 +1,36 @@
+import logging
+
+from app.logging.event_log import EventLogger
+
+
+def _capture(event_logger, monkeypatch):
+    records = []
+    monkeypatch.setattr(event_logger.logger, "handle", records.append)
+    event_logger.logger.setLevel(logging.DEBUG)
+    return records
+
+
+def test_sampling_keeps_one_in_n_but_never_drops_warnings(monkeypatch):
+    log = EventLogger("observer_test", sample_rate=0.25)
+    records = _capture(log, monkeypatch)
+
+    for _ in range(8):
+        log.debug("turn_logged", speaker="candidate")
+    log.warning("evaluation_failed")
+
+    assert [r.aegis_fields["event"] for r in records] == ["turn_logged", "turn_logged", "evaluation_failed"]
+    assert log.suppressed == 6
+
+
+def test_transcripts_redacted_unless_enabled(monkeypatch):
+    log = EventLogger("transcript_test")
+    records = _capture(log, monkeypatch)
+
+    monkeypatch.delenv("AEGIS_LOG_TRANSCRIPTS", raising=False)
+    log.info("user_speech", text="my password is hunter2")
+    monkeypatch.setenv("AEGIS_LOG_TRANSCRIPTS", "1")
+    log.info("user_speech", text="hello")
+
+    assert "hunter2" not in records[0].getMessage()
+    assert records[0].aegis_fields["text_chars"] == 22
+    assert records[1].aegis_fields["text"] == "hello"
@@ -0,0 +1,57 @@
+import json
+
+from app.agents.governor import DEFAULT_HIGH_RISK_KEYWORDS, GovernorAgent, KeywordScanner
+
+
+def test_scanner_matches_whole_words_and_phrases():
+    scanner = KeywordScanner(["kill", "drop table", "rm -rf"])
+
+    assert scanner.first_match("I'll kill the process") == ("kill", "high_risk")
+    assert scanner.first_match("That's a great skill to have") is None
+    assert [m[0] for m in scanner.scan("Then DROP TABLE users; rm -rf /")] == ["drop table", "rm rf"]
+
+
+def test_scanner_matches_inflections():
+    governor = GovernorAgent(high_risk_keywords=list(DEFAULT_HIGH_RISK_KEYWORDS) + ["stab"])
+
+    for text in ("I will bring bombs", "killing it", "he killed", "the killers", "illegally", "stabbing", "two suicides"):
+        assert not governor.check_safety(text), text
+    for text in ("great skill", "skilled engineer", "bombastic claims", "kilobytes"):
+        assert governor.check_safety(text), text
+    assert KeywordScanner(["drop table"]).first_match("dropped tables") == ("drop table", "high_risk")
+
+
+def test_large_lexicon_from_file(tmp_path):
+    lexicon = tmp_path / "lexicon.json"
+    lexicon.write_text(json.dumps({"violence": [f"term{i}" for i in range(5000)]}))
+    governor = GovernorAgent(lexicon_path=str(lexicon))
+
+    assert governor.scanner.size == 5000 + 4
+    assert not governor.check_safety("this mentions term4999 somewhere")
+    assert governor.check_safety("a perfectly normal answer about caching")
+
+
+def test_low_confidence_streak_from_async_evaluations():
+    reasons = []
+    governor = GovernorAgent(on_intervention=reasons.append)
+
+    assert governor.observe_evaluation({"confidence": 0.9})
+    assert governor.observe_evaluation({"confidence": 0.1})
+    assert governor.observe_evaluation({"confidence": 0.3})
+    assert not governor.observe_evaluation({"confidence": 0.2})
+    assert not governor.observe_evaluation({"confidence": 0.2})
+
+    assert len(reasons) == 1
+    assert governor.check_safety("fine answer")  # The streak is reported once, not blamed on later turns
+
+
+def test_low_scores_without_confidence_never_trip():
+    reasons = []
+    governor = GovernorAgent(on_intervention=reasons.append)
+
+    for score in (5, 12, 30, 0, 8):
+        assert governor.observe_evaluation({"score": score, "reason": "weak answer"})
+
+    assert reasons == []
+    assert governor.consecutive_failures == 0
+    assert governor.check_safety("fine answer")
@@ -0,0 +1,37 @@
+import asyncio
+import threading
+
+from app.core.llm_router import LLMRouter, ModelHealth
+
+
+def test_one_shot_calls_from_every_session_share_the_router_loop():
+    router = LLMRouter()
+
+    async def session():
+        async def where():
+            return asyncio.get_running_loop()
+
+        return asyncio.get_running_loop(), await router._on_router_loop(where())
+
+    sessions = [asyncio.run(session()) for _ in range(3)]
+
+    assert len({shared for _, shared in sessions}) == 1
+    assert all(own is not shared for own, shared in sessions)
+
+
+def test_model_health_is_thread_safe():
+    health = ModelHealth(model="m", rpm_budget=100000)
+
+    def hammer():
+        for _ in range(2000):
+            health.record_request(0.1)
+            health.remaining()
+
+    threads = [threading.Thread(target=hammer) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert health.requests == 16000
+    assert health.remaining() == 100000 - 16000
@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+from app.agents import question_generator as qg
+
+
+def _write_audit(tmp_path, data):
+    audit_path = tmp_path / "abc123_audit.json"
+    audit_path.write_text(json.dumps(data))
+    return str(audit_path)
+
+
+def test_cache_roundtrip(tmp_path):
+    audit_path = _write_audit(tmp_path, {"contact_details": {"name": "Ada"}})
+    questions = ["Explain this race condition in detail please.", "Optimize this O(N^2) loop."]
+
+    cache_path = qg.save_cached_questions(audit_path, questions, qg.compute_audit_hash(audit_path))
+
+    assert cache_path == tmp_path / "abc123_audit_questions.json"
+    assert qg.load_cached_questions(audit_path) == questions
+
+
+def test_cache_invalidated_when_audit_changes(tmp_path):
+    audit_path = _write_audit(tmp_path, {"contact_details": {"name": "Ada"}})
+    qg.save_cached_questions(audit_path, ["Write a function that merges two sorted arrays."], qg.compute_audit_hash(audit_path))
+
+    _write_audit(tmp_path, {"contact_details": {"name": "Ada"}, "manual_role_override": "DevOps"})
+
+    assert qg.load_cached_questions(audit_path) is None
+
+
+def test_cache_invalidated_on_version_bump(tmp_path, monkeypatch):
+    audit_path = _write_audit(tmp_path, {})
+    qg.save_cached_questions(audit_path, ["Write a function that merges two sorted arrays."], qg.compute_audit_hash(audit_path))
+
+    monkeypatch.setattr(qg, "QUESTION_GENERATOR_VERSION", "next")
+
+    assert qg.load_cached_questions(audit_path) is None
+
+
+def test_fallback_questions_are_not_cached(tmp_path):
+    audit_path = _write_audit(tmp_path, {})
+
+    assert qg.save_cached_questions(audit_path, qg._get_fallback_questions(), qg.compute_audit_hash(audit_path)) is None
+    assert qg.load_cached_questions(audit_path) is None
+
+
+def test_role_override_during_generation_is_not_cached(tmp_path, monkeypatch):
+    audit_path = _write_audit(tmp_path, {"contact_details": {"name": "Ada"}})
+    old_role = ["Old-role question about Kubernetes rollouts."]
+
+    async def slow_generation(context):
+        # /api/set-candidate-role rewrites the audit while the upload-time job is still generating
+        _write_audit(tmp_path, {"contact_details": {"name": "Ada"}, "manual_role_override": "AI/ML"})
+        return old_role
+
+    monkeypatch.setattr(qg, "generate_dynamic_questions_via_api", slow_generation)
+
+    assert asyncio.run(qg.precompute_dynamic_questions(audit_path, {})) == old_role
+    assert not qg.get_questions_cache_path(audit_path).exists()
+    assert qg.load_cached_questions(audit_path) is None
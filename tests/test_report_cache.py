@@ -0,0 +1,85 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.analysis import report_cache as rc
+
+
+def test_concurrent_downloads_share_one_render(tmp_path, monkeypatch):
+    fsir_path = tmp_path / "fsir_s1.json"
+    fsir_path.write_text(json.dumps({"candidate_id": "audit:ada"}))
+
+    def fake_render(fsir, pdf):
+        time.sleep(0.05)
+        (tmp_path / "cache").mkdir(exist_ok=True)
+        with open(pdf, "wb") as f:
+            f.write(b"%PDF-fake")
+        return pdf
+
+    monkeypatch.setattr(rc, "render_fsir_pdf", fake_render)
+    cache = rc.ReportCache(cache_dir=tmp_path / "cache")
+
+    async def run():
+        results = await asyncio.gather(*(cache.get_pdf(fsir_path) for _ in range(5)))
+        await cache.get_pdf(fsir_path)  # Cached now
+        return results
+
+    results = asyncio.run(run())
+    assert cache.renders == 1
+    assert len({path for path, _ in results}) == 1
+    assert results[0][0].read_bytes() == b"%PDF-fake"
+    assert {etag for _, etag in results} == {rc.file_sha256(results[0][0])}  # ETag = served PDF bytes
+
+
+def test_find_fsir_scans_once_then_uses_the_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(rc, "REPORTS_DIR", tmp_path)
+    monkeypatch.setattr(rc, "SESSIONS_DIR", tmp_path / "sessions")
+    monkeypatch.setattr(rc, "REPORT_JOBS_DIR", tmp_path / "jobs")
+    (tmp_path / "fsir_s2.json").write_text(json.dumps({"candidate_id": "audit:grace"}))
+
+    scans = []
+    scan = rc.scan_fsir_index
+    monkeypatch.setattr(rc, "scan_fsir_index", lambda: scans.append(1) or scan())
+    cache = rc.ReportCache(cache_dir=tmp_path / "cache")
+
+    async def run():
+        found = await cache.find_fsir("grace")
+        missing = [await cache.find_fsir(f"nobody-{i}") for i in range(5)]
+        cache.index_fsir("audit:ada", str(tmp_path / "fsir_s2.json"))
+        return found, missing, await cache.find_fsir("ada")
+
+    found, missing, indexed = asyncio.run(run())
+    assert found == tmp_path / "fsir_s2.json"
+    assert missing == [None] * 5
+    assert indexed == tmp_path / "fsir_s2.json"
+    assert len(scans) == 1
+
+
+def test_find_fsir_with_real_job_metadata(tmp_path, monkeypatch):
+    monkeypatch.setattr(rc, "REPORTS_DIR", tmp_path)
+    monkeypatch.setattr(rc, "SESSIONS_DIR", tmp_path / "sessions")
+    monkeypatch.setattr(rc, "REPORT_JOBS_DIR", tmp_path / "jobs")
+    fsir_path = tmp_path / "sessions" / "room-1" / "fsir.json.gz"
+    done = tmp_path / "jobs" / "done" / "room-1.json"
+    done.parent.mkdir(parents=True)
+    done.write_text(json.dumps({
+        "candidate_id": "audit:uploads/1a2b3c4d_audit.json",  # ctx.job.metadata as the agent records it
+        "fsir_path": str(fsir_path),
+    }))
+    fsir_path.parent.mkdir(parents=True)
+    fsir_path.write_bytes(b"")
+
+    assert rc.clean_candidate_id("audit:uploads/1a2b3c4d_audit.json") == "1a2b3c4d"
+    assert rc.clean_candidate_id("1a2b3c4d") == "1a2b3c4d"
+    assert asyncio.run(rc.ReportCache(cache_dir=tmp_path / "cache").find_fsir("1a2b3c4d")) == fsir_path
+
+
+def test_parse_range():
+    assert rc.parse_range(None, 100) is None
+    assert rc.parse_range("bytes=0-9", 100) == (0, 9)
+    assert rc.parse_range("bytes=90-", 100) == (90, 99)
+    assert rc.parse_range("bytes=-10", 100) == (90, 99)
+    with pytest.raises(ValueError):
+        rc.parse_range("bytes=200-", 100)
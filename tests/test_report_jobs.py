@@ -0,0 +1,109 @@
+import json
+import os
+import time
+from datetime import datetime
+
+from app.analysis import report_jobs as rj
+
+
+def test_bundle_is_persisted_and_job_enqueued(tmp_path, monkeypatch):
+    monkeypatch.setattr(rj, "SESSIONS_DIR", tmp_path / "sessions")
+    monkeypatch.setattr(rj, "REPORT_JOBS_DIR", tmp_path / "jobs")
+
+    bundle_path = rj.save_session_bundle(
+        session_id="job-1",
+        candidate_id="audit:ada",
+        started_at=datetime(2025, 1, 1),
+        audit_log=[{"actor": "System", "event_type": "SESSION_START", "timestamp": 0.0}],
+        evaluations=[{"score": 8.0}]
+    )
+    rj.enqueue_report_job("job-1", bundle_path)
+
+    bundle = rj.load_session_bundle(bundle_path)
+    assert bundle["evaluations"] == [{"score": 8.0}]
+    assert bundle["candidate_id"] == "audit:ada"
+    assert rj.get_report_status("job-1")["status"] == rj.JOB_PENDING
+
+    job = json.loads((tmp_path / "jobs" / "pending" / "job-1.json").read_text())
+    assert job["bundle_path"] == str(bundle_path)
+
+
+def test_finished_job_status_includes_result(tmp_path, monkeypatch):
+    monkeypatch.setattr(rj, "REPORT_JOBS_DIR", tmp_path / "jobs")
+
+    rj._write_json_atomic(rj._job_path(rj.JOB_DONE, "job-2"), {"session_id": "job-2", "status": "done", "pdf_path": "fsir_job-2.pdf"})
+
+    assert rj.get_report_status("job-2")["pdf_path"] == "fsir_job-2.pdf"
+    assert rj.get_report_status("missing")["status"] == "unknown"
+
+
+def test_unchanged_bundle_reuses_previous_render(tmp_path, monkeypatch):
+    monkeypatch.setattr(rj, "SESSIONS_DIR", tmp_path / "sessions")
+    monkeypatch.setattr(rj, "REPORT_JOBS_DIR", tmp_path / "jobs")
+    monkeypatch.setattr(rj, "REPORTS_DIR", tmp_path)
+    monkeypatch.setattr(rj, "UPLOADS_DIR", tmp_path / "uploads")
+
+    bundle_path = rj.save_session_bundle(
+        session_id="job-3",
+        candidate_id="audit:ada",
+        started_at=datetime(2025, 1, 1),
+        audit_log=[],
+        evaluations=[{"score": 7.0}]
+    )
+    result = rj.generate_report(str(bundle_path))
+    rj._write_json_atomic(rj._job_path(rj.JOB_DONE, "job-3"), result)
+
+    assert rj._previous_render("job-3", str(bundle_path))["pdf_path"] == result["pdf_path"]
+    assert rj.queue_stats()[rj.JOB_DONE] == 1
+
+    rj.save_session_bundle(
+        session_id="job-3",
+        candidate_id="audit:ada",
+        started_at=datetime(2025, 1, 1),
+        audit_log=[],
+        evaluations=[{"score": 3.0}]
+    )
+    assert rj._previous_render("job-3", str(bundle_path)) is None
+
+
+def test_reenqueue_clears_old_result_and_reports_pending(tmp_path, monkeypatch):
+    monkeypatch.setattr(rj, "REPORT_JOBS_DIR", tmp_path / "jobs")
+    old = {"session_id": "job-4", "status": "done", "bundle_sha": "abc", "pdf_path": "old.pdf"}
+    rj._write_json_atomic(rj._job_path(rj.JOB_DONE, "job-4"), old)
+    rj._write_json_atomic(rj._job_path(rj.JOB_FAILED, "job-4"), {"session_id": "job-4", "status": "failed"})
+
+    rj.enqueue_report_job("job-4", tmp_path / "bundle.json.gz")
+
+    assert rj.get_report_status("job-4")["status"] == rj.JOB_PENDING
+    assert not rj._job_path(rj.JOB_DONE, "job-4").exists()
+    assert not rj._job_path(rj.JOB_FAILED, "job-4").exists()
+    job = json.loads(rj._job_path(rj.JOB_PENDING, "job-4").read_text())
+    assert job["previous"] == old  # Still lets an unchanged bundle skip the render
+
+
+def test_only_stale_claims_are_requeued(tmp_path, monkeypatch):
+    monkeypatch.setattr(rj, "REPORT_JOBS_DIR", tmp_path / "jobs")
+    (tmp_path / "jobs" / rj.JOB_PENDING).mkdir(parents=True)
+    for session_id in ("live", "dead"):
+        rj._write_json_atomic(rj._job_path(rj.JOB_PROCESSING, session_id), {"session_id": session_id})
+    stale = time.time() - rj.CLAIM_STALE_SECONDS - 1
+    os.utime(rj._job_path(rj.JOB_PROCESSING, "dead"), (stale, stale))
+
+    rj.ReportWorkerPool()._requeue_stale_claims()
+
+    assert rj._job_path(rj.JOB_PROCESSING, "live").exists()  # Another pool is rendering it
+    assert rj._job_path(rj.JOB_PENDING, "dead").exists()
+    assert not rj._job_path(rj.JOB_PROCESSING, "dead").exists()
+
+
+def test_session_being_rendered_is_not_claimed_twice(tmp_path, monkeypatch):
+    monkeypatch.setattr(rj, "REPORT_JOBS_DIR", tmp_path / "jobs")
+    rj._write_json_atomic(rj._job_path(rj.JOB_PROCESSING, "job-5"), {"session_id": "job-5"})
+    rj.enqueue_report_job("job-5", tmp_path / "bundle.json.gz")
+    pool = rj.ReportWorkerPool()
+    pool._running["job-5"] = None  # Render in flight
+
+    pool._claim_jobs()
+
+    assert rj.get_report_status("job-5")["status"] == rj.JOB_PENDING
+    assert pool._running == {"job-5": None}
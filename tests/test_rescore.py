@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from app.analysis import rescore
+
+
+def _write_bundle(root, session_id, scores):
+    path = root / session_id / "bundle.json"
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps({
+        "session_id": session_id,
+        "candidate_id": "ada",
+        "audit_log": [{"actor": "System", "event_type": "INTERVIEW_START", "timestamp": 10.0, "metadata": {}}],
+        "evaluations": [{"score": s, "timestamp": 10.0 + i} for i, s in enumerate(scores)],
+        "dqi": {"overall_score": 1.0},
+    }))
+    return path
+
+
+def test_discovery_prefers_bundles_and_skips_output(tmp_path):
+    _write_bundle(tmp_path / "sessions", "s1", [8])
+    (tmp_path / "fsir_s1.json").write_text("{}")
+    (tmp_path / "fsir_old.json").write_text("{}")
+    (tmp_path / "fsir_old_timing.json").write_text("{}")
+    (tmp_path / "out").mkdir()
+    (tmp_path / "out" / "fsir_s9.json").write_text("{}")
+
+    sources = rescore.discover_sessions([tmp_path], exclude=tmp_path / "out")
+
+    assert [(s["session_id"], s["kind"]) for s in sources] == [("old", "fsir"), ("s1", "bundle")]
+
+
+def test_legacy_fsir_timeline_replay():
+    fsir = {
+        "crisis_timeline": [
+            {"action": "Observer", "evaluation": "Score: 6"},
+            {"action": "CrisisPopupAgent", "evaluation": "Event Logged"},
+            {"action": "Observer", "evaluation": "Score: 9"},
+        ],
+        "faang_evaluation": {"testing": "Hire"},
+    }
+    assert rescore._evaluations_from_fsir(fsir) == [{"score": 6.0}, {"score": 9.0, "faang_evaluation": {"testing": "Hire"}}]
+
+
+def test_rescore_replays_bundle_and_resumes(tmp_path):
+    bundle = _write_bundle(tmp_path / "sessions", "s1", [6, 8])
+    source = rescore.discover_sessions([bundle])[0]
+
+    result = rescore.rescore_session(source, str(tmp_path))
+
+    assert result["old_score"] == 1.0 and result["new_score"] == 7.0
+    assert json.loads((tmp_path / "fsir_s1.json").read_text())["candidate_id"] == "ada"
+
+    entry = {**result, "source_mtime": source["mtime"], "scoring_version": "v1"}
+    assert rescore.is_current(entry, source, "v1")
+    assert not rescore.is_current(entry, source, "v2")
@@ -0,0 +1,41 @@
+import json
+from datetime import datetime
+
+from app.analysis import report_jobs as rj
+from app.analysis.session_archive import MEMBER_BUNDLE, MEMBER_QUESTIONS, SessionArchive
+
+
+def test_bundle_and_questions_are_archived_compressed(tmp_path, monkeypatch):
+    monkeypatch.setattr(rj, "SESSIONS_DIR", tmp_path / "sessions")
+
+    def save():
+        return rj.save_session_bundle(
+            session_id="arc-1",
+            candidate_id="audit:ada",
+            started_at=datetime(2025, 1, 1),
+            audit_log=[{"actor": "System", "event_type": "SESSION_START", "timestamp": 0.0}] * 50,
+            evaluations=[{"score": 8.0, "reason": "solid"}] * 20,
+            questions={"session_id": "arc-1", "questions": [{"text": "Why?"}]}
+        )
+
+    path = save()
+    first = path.read_bytes()
+    assert path.name == "bundle.json.gz"
+    assert save().read_bytes() == first  # Deterministic: the report worker keys on the bundle hash
+
+    archive = rj.session_archive("arc-1")
+    assert archive.members() == [MEMBER_BUNDLE, MEMBER_QUESTIONS]
+    bundle = rj.load_session_bundle(path)
+    assert bundle["questions_log"] == str(archive.path(MEMBER_QUESTIONS))
+    assert len(bundle["evaluations"]) == 20
+    assert archive.size_bytes() < len(json.dumps(bundle, indent=2))
+
+
+def test_pretty_export(tmp_path):
+    archive = SessionArchive(tmp_path / "s")
+    archive.write(MEMBER_QUESTIONS, {"questions": [1, 2]})
+
+    [path] = archive.export_pretty()
+    assert path == tmp_path / "s" / "export" / "questions.json"
+    assert "\n  " in path.read_text()
+    assert json.loads(path.read_text()) == {"questions": [1, 2]}
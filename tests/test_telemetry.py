@@ -0,0 +1,61 @@
+import json
+from dataclasses import dataclass
+
+from app.core import telemetry as telemetry_module
+from app.core.telemetry import SessionTelemetry, track_llm_call
+
+
+@dataclass
+class EOUMetrics:
+    speech_id: str
+    transcription_delay: float
+    end_of_utterance_delay: float
+
+
+@dataclass
+class LLMMetrics:
+    speech_id: str
+    ttft: float
+    prompt_tokens: int = 0
+
+
+@dataclass
+class TTSMetrics:
+    speech_id: str
+    ttfb: float
+
+
+class _Audit:
+    def __init__(self):
+        self.events = []
+
+    def log_event(self, actor, event_type, details, metadata=None):
+        self.events.append((event_type, metadata))
+
+
+def test_turn_span_closes_when_all_stages_arrive():
+    audit = _Audit()
+    telemetry = SessionTelemetry("job-1", audit_logger=audit)
+
+    telemetry.on_metrics(EOUMetrics("sp_1", 0.2, 0.3))
+    telemetry.on_metrics(LLMMetrics("sp_1", 0.25))
+    assert telemetry.turns == []
+    telemetry.on_metrics(TTSMetrics("sp_1", 0.15))
+
+    assert len(telemetry.turns) == 1
+    assert abs(telemetry.turns[0]["total"] - 0.7) < 1e-9
+    assert audit.events[0][0] == "TURN_LATENCY"
+    assert telemetry.summary()["turn_latency_ms"]["total"]["p50"] == 700.0
+
+
+def test_llm_calls_are_recorded_in_trace(tmp_path, monkeypatch):
+    telemetry = SessionTelemetry("job-2")
+    monkeypatch.setitem(telemetry_module._sessions, "job-2", telemetry)
+
+    with track_llm_call("observer", "job-2"):
+        pass
+
+    trace = json.loads(telemetry.save_trace(str(tmp_path)).read_text())
+    assert trace["llm_calls"][0]["role"] == "observer"
+    assert trace["llm_calls"][0]["outcome"] == "ok"
+    assert (tmp_path / "fsir_job-2_timing.json").exists()
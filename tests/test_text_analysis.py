@@ -0,0 +1,46 @@
+from app.core.text_analysis import StreamingFenceDetector, analyze_message, extract_code_blocks
+
+
+def test_fence_detected_when_split_across_tokens():
+    detector = StreamingFenceDetector()
+    tokens = ["Here is the bug: `", "``py", "thon\ndef f(x):\n    return x", "\n`", "``", " what is wrong?"]
+
+    completed = []
+    for token in tokens:
+        completed.extend(detector.feed(token))
+
+    assert completed == ["def f(x):\n    return x"]
+    assert not detector.in_fence
+
+
+def test_streaming_matches_full_message_regex():
+    message = "Fix this:\n```\na = 1\n```\nand this ```js\nlet b = 2;\n```"
+    detector = StreamingFenceDetector()
+
+    streamed = []
+    for i in range(0, len(message), 3):
+        streamed.extend(detector.feed(message[i:i + 3]))
+
+    assert streamed == extract_code_blocks(message) == ["a = 1", "let b = 2;"]
+
+
+def test_analyze_message_classifies_questions():
+    assert analyze_message("How would you debug a memory leak in production?").is_question
+    assert not analyze_message("Okay.").is_question
+    assert not analyze_message("Let's move on to the next section now.").is_question
+
+
+def test_deltas_are_append_only_prefix_of_final_block():
+    message = "Look:\n```python\ndef f(x):\n    return x * 2\n\nprint(f(3))\n```\nDone?"
+    detector = StreamingFenceDetector()
+
+    deltas, completed = [], []
+    for i in range(0, len(message), 4):
+        completed.extend(detector.feed(message[i:i + 4]))
+        deltas.append(detector.take_delta())
+
+    streamed = "".join(deltas)
+    assert completed == ["def f(x):\n    return x * 2\n\nprint(f(3))"]
+    assert streamed.startswith("def f(x):\n")
+    assert completed[0].startswith(streamed.rstrip())
+    assert "`" not in streamed
@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+
+from app.core.turn_batcher import PRIORITY_CRISIS, TurnBatcher, build_batch_prompt, parse_batch_response
+
+
+def test_parse_batch_response_by_turn_number():
+    text = 'Sure:\n{"evaluations": [{"turn": 2, "score": 40}, {"turn": 1, "score": 80}]}'
+    assert parse_batch_response(text, 3) == [{"turn": 1, "score": 80}, {"turn": 2, "score": 40}, None]
+    assert parse_batch_response('{"score": 55}', 1) == [{"score": 55}]
+    assert parse_batch_response("no json here", 2) == [None, None]
+
+
+def test_prompt_numbers_only_candidate_turns():
+    window = [
+        {"speaker": "candidate", "text": "I'd check the logs", "graded": True},
+        {"speaker": "incident_lead", "text": "Which logs?", "graded": False},
+        {"speaker": "candidate", "text": "The nginx error log", "graded": True},
+    ]
+    prompt = build_batch_prompt(window, [{"speaker": "incident_lead", "text": "What now?", "graded": False}])
+    assert "Interviewer: What now?" in prompt
+    assert "[1] Candidate: I'd check the logs" in prompt
+    assert "[2] Candidate: The nginx error log" in prompt
+    assert "[3]" not in prompt
+
+
+def test_batches_by_count_and_time_with_bounded_concurrency():
+    async def run():
+        calls = []
+        active = 0
+        peak = 0
+
+        async def evaluate(window, context):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            calls.append([e["text"] for e in window if e["graded"]])
+            active -= 1
+
+        batcher = TurnBatcher(evaluate, max_turns=2, max_wait=0.05, max_concurrency=1)
+        for i in range(5):
+            batcher.add("incident_lead", f"q{i}")
+            batcher.add("candidate", f"a{i}")
+        await asyncio.sleep(0.1)  # Time window flushes the trailing single turn
+        await batcher.drain()
+        return calls, peak, batcher.stats()
+
+    calls, peak, stats = asyncio.run(run())
+    assert calls == [["a0", "a1"], ["a2", "a3"], ["a4"]]
+    assert peak == 1
+    assert stats["batches"] == 3 and stats["turns_seen"] == 10
+
+
+@pytest.mark.parametrize("speaker", ["incident_lead", "system"])
+def test_non_candidate_turns_never_trigger_a_batch(speaker):
+    async def run():
+        calls = []
+
+        async def evaluate(window, context):
+            calls.append(window)
+
+        batcher = TurnBatcher(evaluate, max_turns=1)
+        batcher.add(speaker, "hello")
+        await batcher.drain()
+        return calls
+
+    assert asyncio.run(run()) == []
+
+
+def test_priority_queue_and_coalescing_when_saturated():
+    async def run():
+        started = []
+        release = asyncio.Event()
+
+        async def evaluate(window, context):
+            started.append([e["text"] for e in window if e["graded"]])
+            await release.wait()
+
+        batcher = TurnBatcher(evaluate, max_turns=1, max_concurrency=1, max_queued=2)
+        batcher.add("candidate", "busy")  # Occupies the only slot
+        await asyncio.sleep(0)
+        for text in ("n1", "n2", "n3"):
+            batcher.add("candidate", text)
+        batcher.add("candidate", "crisis answer", priority=PRIORITY_CRISIS)
+        stats = batcher.stats()
+
+        release.set()
+        while batcher.pending:
+            await asyncio.sleep(0.01)
+        return started, stats
+
+    started, stats = asyncio.run(run())
+    assert stats["queued"] == 2 and stats["coalesced"] == 2
+    assert started[0] == ["busy"]
+    assert started[1] == ["crisis answer"]
+    assert started[2] == ["n1", "n2", "n3"]
+
+
+def test_drain_reports_turns_missed_at_deadline():
+    async def run():
+        async def evaluate(window, context):
+            await asyncio.sleep(10)
+
+        batcher = TurnBatcher(evaluate, max_turns=5, max_concurrency=1)
+        batcher.add("candidate", "a")
+        batcher.add("candidate", "b")
+        return await batcher.drain(timeout=0.05)
+
+    result = asyncio.run(run())
+    assert result["dropped_turns"] == 2
+    assert result["in_flight"] == 0 and result["queued"] == 0
+
+
+def test_drain_deadline_does_not_start_queued_windows():
+    async def run():
+        started = []
+
+        async def evaluate(window, context):
+            started.append([e["text"] for e in window if e["graded"]])
+            await asyncio.sleep(10)
+
+        batcher = TurnBatcher(evaluate, max_turns=1, max_concurrency=1)
+        for i in range(3):
+            batcher.add("candidate", f"a{i}")
+        await asyncio.sleep(0)
+        result = await batcher.drain(timeout=0.05)
+        await asyncio.sleep(0.01)
+        return started, result, batcher.pending
+
+    started, result, pending = asyncio.run(run())
+    assert started == [["a0"]]
+    assert result["dropped_turns"] == 3
+    assert pending == 0
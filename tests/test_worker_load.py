@@ -0,0 +1,29 @@
+from app.core.worker_load import SessionRegistry
+
+
+def test_load_reflects_sessions_and_pending_calls(monkeypatch):
+    monkeypatch.setattr("app.core.worker_load.cpu_utilisation", lambda: 0.1)
+    registry = SessionRegistry(capacity=4)
+
+    registry.register("job-a", pending_fn=lambda: 3)
+    registry.register("job-b")
+    snapshot = registry.snapshot()
+
+    assert snapshot["active_sessions"] == 2
+    assert snapshot["pending_llm_calls"] >= 3
+    assert registry.compute_load(object()) == snapshot["load"] >= 0.5
+
+    registry.unregister("job-a")
+    registry.unregister("job-a")
+    assert registry.active_sessions == 1
+
+
+def test_shared_resources_are_built_once():
+    registry = SessionRegistry()
+    calls = []
+
+    first = registry.shared("vad", lambda: calls.append(1) or object())
+    second = registry.shared("vad", lambda: calls.append(1) or object())
+
+    assert first is second
+    assert calls == [1]
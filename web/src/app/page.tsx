@@ -31,6 +31,7 @@ import Mole from "@/components/Mole";
 import Notepad from "@/components/Notepad";
 import CrisisAlert from "@/components/CrisisAlert";
 import { useFaceLogic } from "@/hooks/useFaceLogic";
+import { decodeMessages } from "@/lib/dataChannel";
 
 // ============================================
 // TYPES
@@ -478,18 +479,17 @@ const RoomContent = ({ onEndCall }: { onEndCall: () => void }) => {
 
         const handleData = (payload: Uint8Array, participant?: any, kind?: any, topic?: string) => {
             try {
-                const text = new TextDecoder().decode(payload);
-                const data = JSON.parse(text);
-
-                // SIMPLIFIED: Check for both legacy "TRANSCRIPT" and new "TRANSCRIPTION" types
-                if (data.type === "TRANSCRIPT" || data.type === "TRANSCRIPTION") {
-                    console.log("[TRANSCRIPT RX]", data.sender, data.text);
-                    setMessages(prev => [...prev, {
-                        id: Date.now().toString(),
-                        timestamp: getTimestamp(),
-                        sender: data.sender || "SYSTEM",
-                        text: data.text
-                    }]);
+                for (const data of decodeMessages(payload)) {
+                    // SIMPLIFIED: Check for both legacy "TRANSCRIPT" and new "TRANSCRIPTION" types
+                    if (data.type === "TRANSCRIPT" || data.type === "TRANSCRIPTION") {
+                        console.log("[TRANSCRIPT RX]", data.sender, data.text);
+                        setMessages(prev => [...prev, {
+                            id: Date.now().toString(),
+                            timestamp: getTimestamp(),
+                            sender: data.sender || "SYSTEM",
+                            text: data.text
+                        }]);
+                    }
                 }
             } catch (e) {
                 console.warn("Packet Decode Failed:", e);
@@ -1,5 +1,6 @@
 import { useDataChannel } from "@livekit/components-react";
 import { useState, useEffect } from "react";
+import { decodeMessages } from "@/lib/dataChannel";
 
 export default function CrisisAlert() {
     const [alertMessage, setAlertMessage] = useState<string | null>(null);
@@ -7,11 +8,11 @@ export default function CrisisAlert() {
     // Listen for "CRISIS_ALERT" messages
     useDataChannel((msg) => {
         try {
-            const text = new TextDecoder().decode(msg.payload);
-            const data = JSON.parse(text);
-            if (data.type === "CRISIS_ALERT") {
-                console.log("CRISIS ALERT RECEIVED:", data.message);
-                triggerAlert(data.message || "SYSTEM CRITICAL");
+            for (const data of decodeMessages(msg.payload)) {
+                if (data.type === "CRISIS_ALERT") {
+                    console.log("CRISIS ALERT RECEIVED:", data.message);
+                    triggerAlert(data.message || "SYSTEM CRITICAL");
+                }
             }
         } catch (e) {
             // Ignore
@@ -1,5 +1,6 @@
 import { useDataChannel, useRoomContext } from "@livekit/components-react"; // Import useRoomContext
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
+import { decodeMessages } from "@/lib/dataChannel";
 
 export default function Notepad() {
     const [isVisible, setIsVisible] = useState(false);
@@ -9,20 +10,37 @@ export default function Notepad() {
     // Get Room Context to send data
     const room = useRoomContext();
 
+    // Streamed code: current stream id + next expected delta seq
+    const codeStream = useRef<{ id: string | null; nextSeq: number }>({ id: null, nextSeq: 0 });
+
     // Listen for "TOGGLE_NOTEPAD" messages from the Agent
     useDataChannel((msg) => {
         try {
-            const text = new TextDecoder().decode(msg.payload);
-            const data = JSON.parse(text);
-            if (data.type === "TOGGLE_NOTEPAD") {
-                console.log("Notepad Toggle Triggered:", data.visible);
-                setIsVisible(data.visible);
-            }
-            // [NEW] Handle Code Injection from Agent
-            if (data.type === "CODE_SNAPSHOT") {
-                console.log("Code Snapshot Received:", data.code.length, "chars");
-                setCode(data.code);
-                setIsVisible(true); // Auto-open on code receipt
+            for (const data of decodeMessages(msg.payload)) {
+                if (data.type === "TOGGLE_NOTEPAD") {
+                    console.log("Notepad Toggle Triggered:", data.visible);
+                    setIsVisible(data.visible);
+                }
+                // [NEW] Handle Code Injection from Agent
+                if (data.type === "CODE_SNAPSHOT") {
+                    console.log("Code Snapshot Received:", data.code.length, "chars");
+                    codeStream.current = { id: null, nextSeq: 0 }; // Full snapshot is authoritative
+                    setCode(data.code);
+                    setIsVisible(true); // Auto-open on code receipt
+                }
+                // [NEW] Append-only patches while the agent is still generating the code block
+                if (data.type === "CODE_SNAPSHOT_DELTA") {
+                    const stream = codeStream.current;
+                    if (data.seq === 0) {
+                        codeStream.current = { id: data.stream_id, nextSeq: 1 };
+                        setCode(data.delta);
+                        setIsVisible(true);
+                    } else if (data.stream_id === stream.id && data.seq === stream.nextSeq) {
+                        stream.nextSeq += 1;
+                        setCode(prev => prev + data.delta);
+                    }
+                    // Gaps are ignored; the final CODE_SNAPSHOT resyncs the editor
+                }
             }
         } catch (e) {
             // Ignore non-JSON messages
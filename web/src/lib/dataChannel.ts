@@ -0,0 +1,10 @@
+// Agent data-channel frames (app/core/data_channel.py).
+// A frame is one JSON message, or a BATCH envelope
+// {"type": "BATCH", "messages": [...]} carrying several in send order.
+export function decodeMessages(payload: Uint8Array): any[] {
+    const data = JSON.parse(new TextDecoder().decode(payload));
+    if (data && data.type === "BATCH" && Array.isArray(data.messages)) {
+        return data.messages;
+    }
+    return [data];
+}